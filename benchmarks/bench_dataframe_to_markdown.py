@@ -0,0 +1,71 @@
+"""
+Benchmark of dataframe_to_markdown against the former tabulate grid renderer.
+
+Run with: python benchmarks/bench_dataframe_to_markdown.py
+"""
+
+import random
+import string
+import timeit
+
+import pandas as pd
+from tabulate import tabulate
+
+from recall_space_agents.utils.dataframe_to_markdown import dataframe_to_markdown
+
+
+def tabulate_grid_to_markdown(data: pd.DataFrame):
+    """The former implementation of dataframe_to_markdown."""
+    try:
+        markdown_table = tabulate(
+            data, headers="keys", tablefmt="grid", showindex=False, maxcolwidths=60
+        )
+    except Exception:
+        markdown_table = tabulate(
+            data,
+            headers="keys",
+            tablefmt="grid",
+            showindex=False,
+        )
+    return f"\n {markdown_table} \n"
+
+
+def make_dataframe(rows: int, columns: int, seed: int = 0):
+    """Build a table mixing numbers, short strings and long free text."""
+    generator = random.Random(seed)
+    data = {}
+    for column in range(columns):
+        if column % 3 == 0:
+            data[f"amount_{column}"] = [generator.random() * 1000 for _ in range(rows)]
+        elif column % 3 == 1:
+            data[f"code_{column}"] = [
+                "".join(generator.choices(string.ascii_uppercase, k=8))
+                for _ in range(rows)
+            ]
+        else:
+            data[f"notes_{column}"] = [
+                " ".join(
+                    "".join(generator.choices(string.ascii_lowercase, k=7))
+                    for _ in range(20)
+                )
+                for _ in range(rows)
+            ]
+    return pd.DataFrame(data)
+
+
+if __name__ == "__main__":
+    for rows, columns in ((100, 6), (1000, 12), (5000, 24)):
+        data = make_dataframe(rows, columns)
+        cases = {
+            "tabulate grid": lambda: tabulate_grid_to_markdown(data),
+            "pipe markdown": lambda: dataframe_to_markdown(data),
+            "pipe markdown, 20k chars": lambda: dataframe_to_markdown(
+                data, max_chars=20_000
+            ),
+            "csv": lambda: dataframe_to_markdown(data, table_format="csv"),
+        }
+        print(f"{rows} rows x {columns} columns")
+        for name, render in cases.items():
+            repeat = 3
+            seconds = min(timeit.repeat(render, number=1, repeat=repeat))
+            print(f"  {name:<26} {seconds * 1000:9.1f} ms  {len(render()):>10} chars")
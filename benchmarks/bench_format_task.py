@@ -0,0 +1,139 @@
+"""
+Benchmark of MSTodoToolKit task formatting against the former per-task
+markdown renderer.
+
+Run with: python benchmarks/bench_format_task.py
+"""
+
+import random
+import string
+import timeit
+from textwrap import dedent
+from zoneinfo import ZoneInfo
+
+from azure.identity import ClientSecretCredential
+from dateutil.parser import isoparse
+from msgraph.generated.models.date_time_time_zone import DateTimeTimeZone
+from msgraph.generated.models.item_body import ItemBody
+from msgraph.generated.models.linked_resource import LinkedResource
+from msgraph.generated.models.task_status import TaskStatus
+from msgraph.generated.models.todo_task import TodoTask
+
+from recall_space_agents.toolkits.ms_todo.ms_todo import MSTodoToolKit
+
+
+def former_format_task(task: TodoTask) -> str:
+    """The former implementation of MSTodoToolKit._format_task."""
+    cet_tz = ZoneInfo('Europe/Paris')
+
+    title = task.title if task.title else 'No Title'
+    body_content = f"{task.body.content}" if task.body and task.body.content else 'No Content'
+
+    if task.due_date_time and task.due_date_time.date_time:
+        try:
+            due_date_naive = isoparse(task.due_date_time.date_time)
+            due_date = due_date_naive.replace(
+                tzinfo=ZoneInfo(task.due_date_time.time_zone or 'UTC')
+            )
+            due_date_formatted = due_date.astimezone(cet_tz).strftime('%Y-%m-%d %H:%M:%S %Z')
+        except ValueError:
+            due_date_formatted = 'Invalid Due Date'
+    else:
+        due_date_formatted = 'No Due Date'
+
+    if task.completed_date_time and task.completed_date_time.date_time:
+        try:
+            completed_date_naive = isoparse(task.completed_date_time.date_time)
+            completed_date = completed_date_naive.replace(
+                tzinfo=ZoneInfo(task.completed_date_time.time_zone or 'UTC')
+            )
+            completed_date_formatted = completed_date.astimezone(cet_tz).strftime(
+                '%Y-%m-%d %H:%M:%S %Z'
+            )
+        except ValueError:
+            completed_date_formatted = 'Invalid Completed Date'
+    else:
+        completed_date_formatted = 'Not Completed'
+
+    status = task.status.value if task.status else 'No Status'
+    if task.attachments:
+        attachments = ', '.join([attachment.name for attachment in task.attachments])
+    else:
+        attachments = 'No Attachments'
+    if task.linked_resources:
+        linked_resources = ', '.join([resource.web_url for resource in task.linked_resources])
+    else:
+        linked_resources = 'No Linked Resources'
+
+    return dedent(f"""
+        # Title: {title}
+        Due Date: {due_date_formatted}
+        Completed Date: {completed_date_formatted}
+        Status: {status}
+        Body: 
+        ```
+        {body_content}
+        ```
+        Attachments: {attachments}
+        Linked Resources: {linked_resources}
+        {'-'*40}
+        """)
+
+
+def make_tasks(count: int, seed: int = 0):
+    """Build tasks due at midday over a quarter, a third of them completed."""
+    generator = random.Random(seed)
+    tasks = []
+    for position in range(count):
+        day = generator.randrange(90)
+        completed = position % 3 == 0
+        tasks.append(
+            TodoTask(
+                id=f"task-{position}",
+                title=" ".join(
+                    "".join(generator.choices(string.ascii_lowercase, k=6))
+                    for _ in range(4)
+                ),
+                body=ItemBody(
+                    content=" ".join(
+                        "".join(generator.choices(string.ascii_lowercase, k=7))
+                        for _ in range(generator.randrange(0, 30))
+                    )
+                ),
+                due_date_time=DateTimeTimeZone(
+                    date_time=f"2024-{1 + day // 30:02d}-{1 + day % 30:02d}T12:00:00.0000000",
+                    time_zone="UTC",
+                ),
+                completed_date_time=DateTimeTimeZone(
+                    date_time=f"2024-{1 + day // 30:02d}-{1 + day % 30:02d}"
+                    f"T{generator.randrange(24):02d}:{generator.randrange(60):02d}:00.0000000",
+                    time_zone="UTC",
+                )
+                if completed
+                else None,
+                status=TaskStatus.Completed if completed else TaskStatus.NotStarted,
+                linked_resources=[
+                    LinkedResource(web_url=f"https://example.com/items/{position}")
+                ]
+                if position % 4 == 0
+                else None,
+            )
+        )
+    return tasks
+
+
+if __name__ == "__main__":
+    toolkit = MSTodoToolKit(ClientSecretCredential("tenant", "client", "secret"))
+    for count in (100, 1000, 10_000):
+        tasks = make_tasks(count)
+        cases = {
+            "former markdown": lambda: "".join(former_format_task(task) for task in tasks),
+            "markdown": lambda: toolkit._format_tasks(tasks),
+            "table": lambda: toolkit._format_tasks(tasks, "table"),
+            "json": lambda: toolkit._format_tasks(tasks, "json"),
+        }
+        print(f"{count} tasks")
+        for name, render in cases.items():
+            repeat = 3
+            seconds = min(timeit.repeat(render, number=1, repeat=repeat))
+            print(f"  {name:<26} {seconds * 1000:9.1f} ms  {len(render()):>10} chars")
@@ -0,0 +1,219 @@
+"""
+Helpers to attach local files to outgoing emails.
+
+Graph accepts file attachments below 3 MB inline in the message, as long
+as the whole request, with the attachments base64 encoded, stays below
+4 MB. Other files, up to 150 MB, go through an attachment upload session:
+the file is streamed from disk in chunks, so memory stays bounded by the
+chunk size, and an interrupted upload resumes from the ranges the server
+still expects.
+"""
+
+import asyncio
+import mimetypes
+import os
+from typing import List, Optional, Tuple
+
+from msgraph.generated.models.attachment_item import AttachmentItem
+from msgraph.generated.models.attachment_type import AttachmentType
+from msgraph.generated.models.file_attachment import FileAttachment
+
+# Largest file sent inline in the message body.
+INLINE_ATTACHMENT_MAX_BYTES = 3 * 1024 * 1024
+# Largest request Graph accepts; inline attachments are base64 encoded in it.
+GRAPH_REQUEST_MAX_BYTES = 4 * 1024 * 1024
+# Room left in a request for its JSON structure, recipients and headers.
+GRAPH_REQUEST_OVERHEAD_BYTES = 64 * 1024
+# Largest file Graph accepts through an upload session.
+UPLOAD_SESSION_MAX_BYTES = 150 * 1024 * 1024
+# Upload chunks must be a multiple of 320 KiB.
+UPLOAD_CHUNK_ALIGNMENT = 320 * 1024
+UPLOAD_CHUNK_SIZE = 10 * UPLOAD_CHUNK_ALIGNMENT
+
+
+def get_attachment_size(file_path: str) -> int:
+    """
+    Check that a file can be attached and return its size.
+
+    Args:
+        file_path (str): Path of the local file.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    if not os.path.isfile(file_path):
+        raise ValueError(f"Attachment '{file_path}' is not a file.")
+    size = os.path.getsize(file_path)
+    if size > UPLOAD_SESSION_MAX_BYTES:
+        raise ValueError(
+            f"Attachment '{file_path}' is {size} bytes, above the "
+            f"{UPLOAD_SESSION_MAX_BYTES} bytes accepted by Graph."
+        )
+    return size
+
+
+def split_inline_attachments(
+    attachment_sizes: List[Tuple[str, int]], reserved_bytes: int = 0
+) -> Tuple[List[str], List[Tuple[str, int]]]:
+    """
+    Choose which files are attached inline and which through upload sessions.
+
+    Files are inlined smallest first while the base64 encoded total, plus
+    `reserved_bytes` for the rest of the message, keeps the request below
+    Graph's 4 MB limit. Files above `INLINE_ATTACHMENT_MAX_BYTES` are never
+    inlined.
+
+    Args:
+        attachment_sizes (List[Tuple[str, int]]): Path and size of each file.
+        reserved_bytes (int): Bytes of the message besides its attachments,
+        e.g. the body.
+
+    Returns:
+        tuple: The paths of the inline files and the (path, size) of the
+        others, both in the given order.
+    """
+    budget = GRAPH_REQUEST_MAX_BYTES - GRAPH_REQUEST_OVERHEAD_BYTES - reserved_bytes
+    inline_paths = set()
+    for file_path, size in sorted(attachment_sizes, key=lambda each: each[1]):
+        encoded_size = 4 * ((size + 2) // 3)
+        if size > INLINE_ATTACHMENT_MAX_BYTES or encoded_size > budget:
+            break
+        inline_paths.add(file_path)
+        budget -= encoded_size
+    return (
+        [file_path for file_path, _ in attachment_sizes if file_path in inline_paths],
+        [(file_path, size) for file_path, size in attachment_sizes if file_path not in inline_paths],
+    )
+
+
+def guess_content_type(file_path: str) -> str:
+    """
+    Guess the MIME type of a file from its name.
+    """
+    return mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+
+
+def build_inline_attachment(file_path: str) -> FileAttachment:
+    """
+    Read a small file into an inline file attachment.
+
+    Args:
+        file_path (str): Path of the local file.
+
+    Returns:
+        FileAttachment: The attachment, its content encoded by the SDK.
+    """
+    with open(file_path, "rb") as file:
+        content = file.read()
+    return FileAttachment(
+        name=os.path.basename(file_path),
+        content_type=guess_content_type(file_path),
+        size=len(content),
+        content_bytes=content,
+    )
+
+
+def build_upload_session_item(file_path: str, size: int) -> AttachmentItem:
+    """
+    Describe a large file for the creation of its upload session.
+    """
+    return AttachmentItem(
+        attachment_type=AttachmentType.File,
+        name=os.path.basename(file_path),
+        size=size,
+        content_type=guess_content_type(file_path),
+    )
+
+
+def next_expected_offset(next_expected_ranges: Optional[List[str]]) -> Optional[int]:
+    """
+    Read the first byte the server still expects from `nextExpectedRanges`.
+
+    Args:
+        next_expected_ranges (List[str], optional): Ranges such as ['327680-'].
+
+    Returns:
+        int or None: The offset to resume from, None when nothing is expected.
+    """
+    if not next_expected_ranges:
+        return None
+    return min(int(each.split("-")[0]) for each in next_expected_ranges)
+
+
+async def aupload_file_in_chunks(
+    session,
+    upload_url: str,
+    file_path: str,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_retries: int = 5,
+):
+    """
+    Stream a file to an attachment upload session.
+
+    Each chunk is read from disk right before it is sent. When a chunk
+    fails, the session is asked which ranges it still expects and the upload
+    resumes from there.
+
+    Args:
+        session (aiohttp.ClientSession): The HTTP session to use.
+        upload_url (str): The pre-authenticated URL of the upload session;
+        no Authorization header is sent to it.
+        file_path (str): Path of the local file.
+        chunk_size (int): Bytes per request, a multiple of 320 KiB.
+        max_retries (int): Consecutive failed attempts tolerated.
+    """
+    if chunk_size % UPLOAD_CHUNK_ALIGNMENT:
+        raise ValueError(f"chunk_size must be a multiple of {UPLOAD_CHUNK_ALIGNMENT}.")
+
+    total_size = os.path.getsize(file_path)
+    offset = 0
+    failures = 0
+    with open(file_path, "rb") as file:
+        while offset < total_size:
+            file.seek(offset)
+            chunk = file.read(chunk_size)
+            end = offset + len(chunk) - 1
+            headers = {
+                "Content-Length": str(len(chunk)),
+                "Content-Range": f"bytes {offset}-{end}/{total_size}",
+            }
+            try:
+                async with session.put(upload_url, headers=headers, data=chunk) as response:
+                    if response.status in (200, 201, 202):
+                        failures = 0
+                        if response.status == 201:
+                            return
+                        body = await response.json(content_type=None)
+                        resume_offset = next_expected_offset(
+                            (body or {}).get("nextExpectedRanges")
+                        )
+                        offset = end + 1 if resume_offset is None else resume_offset
+                        continue
+                    error = f"{response.status}, {await response.text()}"
+            except Exception as exception:  # Connection dropped mid-chunk
+                error = str(exception)
+
+            failures += 1
+            if failures > max_retries:
+                raise Exception(
+                    f"Failed to upload attachment '{os.path.basename(file_path)}': {error}"
+                )
+            await asyncio.sleep(2 ** (failures - 1))
+            offset = await _aget_resume_offset(session, upload_url, offset)
+
+
+async def _aget_resume_offset(session, upload_url: str, current_offset: int) -> int:
+    """
+    Ask an upload session where to resume, keeping the current offset when
+    the status cannot be read.
+    """
+    try:
+        async with session.get(upload_url) as response:
+            if response.status == 200:
+                body = await response.json(content_type=None)
+                resume_offset = next_expected_offset((body or {}).get("nextExpectedRanges"))
+                if resume_offset is not None:
+                    return resume_offset
+    except Exception:
+        pass
+    return current_offset
@@ -0,0 +1,216 @@
+"""
+Local SQLite store of message metadata and plain-text bodies.
+
+The store is filled by the delta sync of `MSEmailToolKit` and answers the
+common inbox questions (unread, from a sender, within a date range) locally
+in milliseconds. It also keeps the delta link of every synced folder, so a
+sync resumes where the previous one stopped, across restarts when the
+database is a file.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def to_utc_iso(value) -> Optional[str]:
+    """
+    Normalize a datetime or ISO date string to a sortable UTC string.
+
+    Naive values are taken as UTC.
+
+    Args:
+        value (datetime or str): The date, e.g. '2024-05-01' or a datetime.
+
+    Returns:
+        str or None: The date formatted as 'YYYY-MM-DDTHH:MM:SSZ'.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class MailStore:
+    """
+    SQLite store of messages and delta links, one row per message.
+
+    Args:
+        database_path (str): Path of the SQLite database, or ':memory:'.
+    """
+
+    def __init__(self, database_path: str = ":memory:"):
+        self.database_path = database_path
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    id TEXT PRIMARY KEY,
+                    folder_id TEXT NOT NULL,
+                    change_key TEXT,
+                    conversation_id TEXT,
+                    subject TEXT,
+                    sender_address TEXT,
+                    sender_name TEXT,
+                    received_date_time TEXT,
+                    is_read INTEGER,
+                    body_preview TEXT,
+                    body_text TEXT
+                );
+                CREATE INDEX IF NOT EXISTS messages_folder_received
+                    ON messages (folder_id, received_date_time);
+                CREATE INDEX IF NOT EXISTS messages_sender
+                    ON messages (sender_address);
+                CREATE TABLE IF NOT EXISTS delta_links (
+                    folder_id TEXT PRIMARY KEY,
+                    delta_link TEXT NOT NULL,
+                    synced_at REAL NOT NULL
+                );
+                """
+            )
+
+    def upsert_messages(self, folder_id: str, messages: Iterable[Dict[str, Any]]):
+        """
+        Insert or replace messages of a folder.
+
+        Args:
+            folder_id (str): The folder the messages were synced from.
+            messages (Iterable[Dict[str, Any]]): Messages with the keys id,
+            change_key, conversation_id, subject, sender_address, sender_name,
+            received_date_time, is_read, body_preview and body_text.
+        """
+        rows = [
+            (
+                each["id"],
+                folder_id,
+                each.get("change_key"),
+                each.get("conversation_id"),
+                each.get("subject"),
+                each.get("sender_address"),
+                each.get("sender_name"),
+                to_utc_iso(each.get("received_date_time")),
+                None if each.get("is_read") is None else int(each["is_read"]),
+                each.get("body_preview"),
+                each.get("body_text"),
+            )
+            for each in messages
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete_messages(self, message_ids: Iterable[str]):
+        """
+        Delete messages by ID.
+
+        Args:
+            message_ids (Iterable[str]): The IDs of the removed messages.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM messages WHERE id = ?", [(each,) for each in message_ids]
+            )
+
+    def delete_folder(self, folder_id: str):
+        """
+        Delete the messages and the delta link of a folder, e.g. before a
+        full resync.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM messages WHERE folder_id = ?", (folder_id,))
+            self._connection.execute("DELETE FROM delta_links WHERE folder_id = ?", (folder_id,))
+
+    def get_delta_link(self, folder_id: str) -> Optional[str]:
+        """
+        Get the delta link saved by the last sync of a folder.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT delta_link FROM delta_links WHERE folder_id = ?", (folder_id,)
+            ).fetchone()
+        return row["delta_link"] if row else None
+
+    def set_delta_link(self, folder_id: str, delta_link: str):
+        """
+        Save the delta link of a folder after a completed sync.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO delta_links VALUES (?, ?, ?)",
+                (folder_id, delta_link, time.time()),
+            )
+
+    def is_synced(self, folder_id: str) -> bool:
+        """
+        Whether the folder has completed at least one sync.
+        """
+        return self.get_delta_link(folder_id) is not None
+
+    def query(
+        self,
+        folder_id: Optional[str] = None,
+        unread: Optional[bool] = None,
+        from_sender: Optional[str] = None,
+        received_after=None,
+        received_before=None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query stored messages, most recent first.
+
+        Args:
+            folder_id (str, optional): Restrict to a synced folder.
+            unread (bool, optional): True for unread messages, False for read ones.
+            from_sender (str, optional): Case-insensitive part of the sender's
+            address or name.
+            received_after (datetime or str, optional): Inclusive lower bound.
+            received_before (datetime or str, optional): Exclusive upper bound.
+            limit (int): Maximum number of messages.
+
+        Returns:
+            List[Dict[str, Any]]: The matching messages.
+        """
+        conditions = []
+        parameters = []
+        if folder_id is not None:
+            conditions.append("folder_id = ?")
+            parameters.append(folder_id)
+        if unread is not None:
+            conditions.append("is_read = ?")
+            parameters.append(0 if unread else 1)
+        if from_sender:
+            conditions.append(
+                "(lower(sender_address) LIKE ? OR lower(sender_name) LIKE ?)"
+            )
+            pattern = f"%{from_sender.lower()}%"
+            parameters.extend([pattern, pattern])
+        if received_after:
+            conditions.append("received_date_time >= ?")
+            parameters.append(to_utc_iso(received_after))
+        if received_before:
+            conditions.append("received_date_time < ?")
+            parameters.append(to_utc_iso(received_before))
+
+        statement = "SELECT * FROM messages"
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        statement += " ORDER BY received_date_time DESC LIMIT ?"
+        parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(statement, parameters).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -6,31 +6,125 @@ Classes:
     MSEmailToolKit: A toolkit class for managing emails using Microsoft Graph API.
 """
 
-import base64
+import asyncio
+import hashlib
+import heapq
+import html
+import logging
 import pytz
-import io
-from PyPDF2 import PdfReader
+from collections import OrderedDict
+from datetime import datetime
+from string import Template
 from agent_builder.builders.tool_builder import ToolBuilder
-from bs4 import BeautifulSoup
 from msgraph import GraphServiceClient
 from msgraph.generated.models.body_type import BodyType
 from msgraph.generated.models.email_address import EmailAddress
 from msgraph.generated.models.item_body import ItemBody
 from msgraph.generated.models.message import Message
 from msgraph.generated.models.recipient import Recipient
+from msgraph.generated.users.item.mail_folders.mail_folders_request_builder import (
+    MailFoldersRequestBuilder,
+)
+from msgraph.generated.users.item.mail_folders.item.messages.delta.delta_request_builder import (
+    DeltaRequestBuilder,
+)
+from msgraph.generated.users.item.mail_folders.item.messages.messages_request_builder import (
+    MessagesRequestBuilder as MailFolderMessagesRequestBuilder,
+)
+from msgraph.generated.users.item.messages.item.message_item_request_builder import (
+    MessageItemRequestBuilder,
+)
+from msgraph.generated.users.item.messages.item.attachments.create_upload_session.create_upload_session_post_request_body import (
+    CreateUploadSessionPostRequestBody,
+)
 from msgraph.generated.users.item.messages.messages_request_builder import (
     MessagesRequestBuilder,
 )
 from msgraph.generated.users.item.send_mail.send_mail_post_request_body import (
     SendMailPostRequestBody,
 )
+from kiota_abstractions.api_error import APIError
 from kiota_abstractions.base_request_configuration import RequestConfiguration
+from kiota_http.middleware.options import RetryHandlerOption
 
+from recall_space_agents.toolkits.ms_email.attachment_upload import (
+    aupload_file_in_chunks,
+    build_inline_attachment,
+    build_upload_session_item,
+    get_attachment_size,
+    split_inline_attachments,
+)
+from recall_space_agents.toolkits.ms_email.mail_store import MailStore, to_utc_iso
+from recall_space_agents.toolkits.ms_email.recipient_directory import (
+    RecipientDirectory,
+)
 from recall_space_agents.toolkits.ms_email.schema_mappings import schema_mappings
+from recall_space_agents.utils.document_to_text import (
+    extract_text_from_document,
+    is_supported_document,
+)
+from recall_space_agents.utils.email_body_normalizer import (
+    group_emails_by_conversation,
+    normalize_email_body,
+)
+from recall_space_agents.utils.html_to_text import html_to_text
+from recall_space_agents.utils.rate_limiter import AsyncRateLimiter, retry_after_seconds
 from msgraph.generated.users.item.people.people_request_builder import (
     PeopleRequestBuilder,
 )
 
+logger = logging.getLogger(__name__)
+
+# Upper bound of attachment downloads running at the same time.
+MAX_CONCURRENT_ATTACHMENT_DOWNLOADS = 4
+# Number of converted email bodies kept, keyed by message ID and changeKey.
+BODY_TEXT_CACHE_SIZE = 2048
+# Minimum number of bodies to convert before the work goes to the executor.
+BODY_TEXT_EXECUTOR_THRESHOLD = 16
+# Number of extracted attachment texts kept, keyed by content hash and budget.
+ATTACHMENT_TEXT_CACHE_SIZE = 256
+# Default number of characters of text kept per attachment.
+ATTACHMENT_TEXT_CHAR_BUDGET = 4000
+# Seconds after which the recipient directory is refreshed in the background.
+RECIPIENT_DIRECTORY_TTL_SECONDS = 3600
+# Maximum number of people prefetched into the recipient directory.
+RECIPIENT_DIRECTORY_MAX_PEOPLE = 1000
+# Minimum score for a recipient to be picked without asking.
+RECIPIENT_ACCEPT_SCORE = 0.6
+# Candidates scoring within this margin of the best one make a name ambiguous.
+RECIPIENT_AMBIGUITY_MARGIN = 0.1
+# Pace of sending from the mailbox: Exchange Online accepts about 30
+# messages per minute and 4 concurrent requests per mailbox.
+SEND_RATE_PER_SECOND = 0.5
+SEND_MAX_CONCURRENCY = 4
+# sendMail is not idempotent: a 503 or 504 can come back after Graph
+# accepted the message, so only throttled sends are retried.
+RETRYABLE_SEND_STATUS_CODES = (429,)
+# Well-known mail folder names, usable in place of folder IDs.
+WELL_KNOWN_MAIL_FOLDERS = {
+    "inbox",
+    "archive",
+    "drafts",
+    "sentitems",
+    "deleteditems",
+    "junkemail",
+    "outbox",
+    "clutter",
+    "conversationhistory",
+}
+# Fields selected for lightweight email records.
+EMAIL_RECORD_FIELDS = [
+    "id",
+    "subject",
+    "from",
+    "receivedDateTime",
+    "bodyPreview",
+    "isRead",
+    "conversationId",
+]
+# Fields kept in the local mail store by the delta sync.
+MAIL_SYNC_FIELDS = EMAIL_RECORD_FIELDS + ["body", "changeKey"]
+
 
 class MSEmailToolKit:
     """
@@ -43,12 +137,26 @@ class MSEmailToolKit:
         tools to agents.
     """
 
-    def __init__(self, credentials):
+    def __init__(
+        self,
+        credentials,
+        html_parse_executor=None,
+        mail_store_path=":memory:",
+        attachment_text_executor=None,
+    ):
         """
         Initialize the MSEmailToolKit with Microsoft Graph API client.
 
         Args:
             credentials: The credentials required to authenticate with the Microsoft Graph API.
+            html_parse_executor (concurrent.futures.Executor, optional): Thread or
+            process pool used to convert large batches of HTML bodies to text.
+            When omitted, bodies are converted on the event loop.
+            mail_store_path (str): SQLite database of the local mail store filled
+            by `arefresh_mail_folders`. Use a file path to keep it across restarts.
+            attachment_text_executor (concurrent.futures.Executor, optional): Pool
+            extracting text from attachments, ideally a ProcessPoolExecutor.
+            When omitted, the event loop's default executor is used.
         """
         self.required_scopes_as_user = [
             "Mail.Read",
@@ -62,6 +170,20 @@ class MSEmailToolKit:
             credentials=credentials, scopes=self.required_scopes_as_user
         )
         self.schema_mappings = schema_mappings
+        self.html_parse_executor = html_parse_executor
+        # Plain text of email bodies, keyed by (message ID, changeKey).
+        self._body_text_cache = OrderedDict()
+        self.mail_store_path = mail_store_path
+        self._mail_store = None
+        self._mail_sync_task = None
+        self.attachment_text_executor = attachment_text_executor
+        # Extracted attachment text, keyed by (content SHA-256, char budget).
+        self._attachment_text_cache = OrderedDict()
+        self.recipient_directory = RecipientDirectory()
+        self._send_rate_limiter = AsyncRateLimiter(
+            SEND_RATE_PER_SECOND, max_concurrency=SEND_MAX_CONCURRENCY
+        )
+        self._recipient_refresh_task = None
 
     async def aget_emails(
         self,
@@ -69,14 +191,51 @@ class MSEmailToolKit:
         skip=0,
         filter="parentFolderId eq 'inbox'",
         return_attachments=False,
+        extract_attachment_text=False,
+        attachment_char_budget=ATTACHMENT_TEXT_CHAR_BUDGET,
+        include_attachment_bytes=False,
+        preview_only=False,
+        strip_quoted=False,
+        group_by_conversation=False,
     ):
         """
         Asynchronously retrieve a list of emails based on specified filters.
-        When `return_attachments` is True, return only attachment details (bytes, name, size).
-        Otherwise, return the email metadata without processing attachments.
+        When `return_attachments` is True, attachment details (name, size) are
+        added to each email. When `preview_only` is True, only the body preview
+        is fetched; use `aget_email_body` to read a full body by ID.
+
+        Args:
+            limit (int): Number of emails to retrieve.
+            skip (int): Number of emails to skip.
+            filter (str): OData filter of the messages.
+            return_attachments (bool): Whether to add attachment details.
+            extract_attachment_text (bool): Whether to add the text of PDF, DOCX
+            and XLSX attachments; implies `return_attachments`.
+            attachment_char_budget (int): Maximum number of characters of text
+            per attachment.
+            include_attachment_bytes (bool): Whether to add the raw attachment
+            content as `file_bytes`; implies `return_attachments`.
+            preview_only (bool): Whether to return the body preview instead of
+            the full body.
+            strip_quoted (bool): Whether to remove quoted replies, forward
+            headers and signatures, keeping only the new content of each email.
+            group_by_conversation (bool): Whether to return conversations of
+            deduplicated turns instead of a flat list of emails.
+
+        Returns:
+            list: The emails, or the conversations when grouped.
         """
+        return_attachments = (
+            return_attachments or extract_attachment_text or include_attachment_bytes
+        )
+        if preview_only:
+            select = ["id", "subject", "from", "receivedDateTime", "bodyPreview"]
+        else:
+            select = ["id", "subject", "from", "receivedDateTime", "body", "changeKey"]
+        if group_by_conversation:
+            select.append("conversationId")
         query_params = MessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
-            select=["subject", "from", "receivedDateTime", "body"],
+            select=select,
             top=limit,
             skip=skip,
             filter=filter,
@@ -97,19 +256,36 @@ class MSEmailToolKit:
 
         full_emails = list(messages.value)
         berlin_timezone = pytz.timezone("Europe/Berlin")
+        if preview_only:
+            body_texts = [None] * len(full_emails)
+        else:
+            body_texts = await self._aconvert_bodies_to_text(full_emails)
 
         filtered_emails = []
+        # Attachments whose content was not expanded, downloaded afterwards
+        attachments_to_download = []
+        # Attachment info dicts paired with their content, to extract text from
+        attachments_with_content = []
 
-        for each in full_emails:
+        for each, body_text in zip(full_emails, body_texts):
             # If `return_attachments` is True, process and return only attachment details
             email_data = {
+                "id": each.id,
                 "from": f"{each.from_.email_address.address} - {each.from_.email_address.name}",
                 "subject": each.subject or "",
-                "body": BeautifulSoup(each.body.content, "html.parser").get_text(),
                 "received_date_time": each.received_date_time.astimezone(
                     berlin_timezone
                 ).strftime("%Y-%m-%d %H:%M:%S %Z%z"),
             }
+            if preview_only:
+                email_data["body_preview"] = each.body_preview or ""
+            else:
+                email_data["body"] = body_text
+            if strip_quoted:
+                text_key = "body_preview" if preview_only else "body"
+                email_data[text_key] = normalize_email_body(email_data[text_key])
+            if group_by_conversation:
+                email_data["conversation_id"] = each.conversation_id
             if return_attachments:
                 attachments = []
                 if hasattr(each, "attachments") and each.attachments:
@@ -118,57 +294,447 @@ class MSEmailToolKit:
                             "name": attachment.name,
                             "size": attachment.size,
                         }
-
-                        # Download the attachment content
-                        attachment_content = await self.download_attachment(
-                            attachment.id, each.id
+                        attachments.append(attachment_info)
+                        # Item and reference attachments carry no content.
+                        if not hasattr(attachment, "content_bytes"):
+                            continue
+                        needs_content = include_attachment_bytes or (
+                            extract_attachment_text
+                            and is_supported_document(attachment.name)
                         )
+                        if not needs_content:
+                            continue
+
+                        # Expanded file attachments already carry their content.
+                        attachment_content = attachment.content_bytes
+                        if attachment_content is None:
+                            attachments_to_download.append(
+                                (attachment_info, attachment.id, each.id)
+                            )
                         attachment_info["file_bytes"] = attachment_content
-                        attachments.append(attachment_info)
+                        attachments_with_content.append(attachment_info)
 
                 email_data["attachments"] = attachments
 
             filtered_emails.append(email_data)
 
+        if attachments_to_download:
+            await self._adownload_attachments(attachments_to_download)
+
+        if extract_attachment_text:
+            await self._aextract_attachment_texts(
+                attachments_with_content, attachment_char_budget
+            )
+        if not include_attachment_bytes:
+            for attachment_info in attachments_with_content:
+                attachment_info.pop("file_bytes", None)
+
+        if group_by_conversation:
+            return group_emails_by_conversation(filtered_emails)
         return filtered_emails
 
+    async def aget_email_body(self, message_id: str) -> dict:
+        """
+        Asynchronously retrieve the full body of an email as plain text.
+
+        Args:
+            message_id (str): The ID of the email, as returned by `aget_emails`.
+
+        Returns:
+            dict: The ID, subject and plain text body of the email.
+        """
+        query_params = MessageItemRequestBuilder.MessageItemRequestBuilderGetQueryParameters(
+            select=["id", "subject", "body", "changeKey"],
+        )
+        message = await self.ms_graph_client.me.messages.by_message_id(message_id).get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        body_text = (await self._aconvert_bodies_to_text([message]))[0]
+        return {
+            "id": message.id,
+            "subject": message.subject or "",
+            "body": body_text,
+        }
+
+    async def aiter_emails(
+        self,
+        filter="parentFolderId eq 'inbox'",
+        page_size=50,
+        max_items=None,
+        stop_when=None,
+        folder_id=None,
+        orderby=None,
+    ):
+        """
+        Asynchronously iterate over emails, page by page.
+
+        Pages are requested by following `@odata.nextLink` instead of using
+        `skip`, so deep paging stays fast, and records are yielded as soon as
+        their page arrives. Iteration stops early once `max_items` records
+        have been yielded or `stop_when` returns True.
+
+        Args:
+            filter (str): OData filter of the messages.
+            page_size (int): Number of messages requested per page.
+            max_items (int, optional): Maximum number of records to yield.
+            stop_when (Callable[[dict], bool], optional): Predicate evaluated on
+            each record; iteration stops after the first record it accepts.
+            folder_id (str, optional): Mail folder ID or well-known name (e.g.
+            'inbox', 'archive') to iterate instead of the whole mailbox.
+            orderby (list, optional): OData ordering, e.g. ['receivedDateTime desc'].
+
+        Yields:
+            dict: Lightweight email records with id, sender, subject, received
+            date, body preview, read state and conversation ID.
+        """
+        yielded = 0
+        async for message in self._aiter_messages(
+            filter=filter, page_size=page_size, folder_id=folder_id, orderby=orderby
+        ):
+            record = self._to_email_record(message)
+            yield record
+            yielded += 1
+            if max_items is not None and yielded >= max_items:
+                return
+            if stop_when is not None and stop_when(record):
+                return
+
+    async def asearch_mail_folders(
+        self,
+        folder_names=("inbox", "archive"),
+        filter=None,
+        limit=20,
+        max_concurrency=4,
+    ):
+        """
+        Asynchronously run the same query across several mail folders.
+
+        Folders are queried concurrently, at most `max_concurrency` at a time,
+        each sorted by received time. The results are merged newest first,
+        copies of the same email are dropped and the merge stops at `limit`.
+
+        Args:
+            folder_names (Iterable[str]): Well-known folder names (e.g. 'inbox',
+            'archive', 'sentitems') or display names of custom folders.
+            filter (str, optional): OData filter of the messages.
+            limit (int): Maximum number of emails in total.
+            max_concurrency (int): Maximum number of folders queried at once.
+
+        Returns:
+            dict: The merged email records, each with its folder, and the
+            folder names that could not be resolved.
+        """
+        folder_ids, unresolved_folders = await self._aresolve_mail_folder_ids(
+            folder_names
+        )
+        # Graph rejects $orderby on a property that does not lead the $filter.
+        ordered_filter = "receivedDateTime ge 1900-01-01T00:00:00Z"
+        if filter:
+            ordered_filter = f"{ordered_filter} and ({filter})"
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search_folder(folder_name, folder_id):
+            entries = []
+            async with semaphore:
+                async for message in self._aiter_messages(
+                    filter=ordered_filter,
+                    page_size=min(limit, 50),
+                    folder_id=folder_id,
+                    orderby=["receivedDateTime desc"],
+                ):
+                    entries.append((message.received_date_time, folder_name, message))
+                    if len(entries) >= limit:
+                        break
+            return entries
+
+        folder_results = await asyncio.gather(
+            *[
+                search_folder(folder_name, folder_id)
+                for folder_name, folder_id in folder_ids.items()
+            ]
+        )
+
+        emails = []
+        seen = set()
+        for received_date_time, folder_name, message in heapq.merge(
+            *folder_results, key=lambda each: each[0], reverse=True
+        ):
+            # Copies of an email in several folders get distinct IDs but keep
+            # their conversation and received time.
+            fingerprint = (message.conversation_id, received_date_time)
+            if message.id in seen or fingerprint in seen:
+                continue
+            seen.update((message.id, fingerprint))
+            emails.append({**self._to_email_record(message), "folder": folder_name})
+            if len(emails) >= limit:
+                break
+        return {"emails": emails, "unresolved_folders": unresolved_folders}
+
+    async def aquery_local_emails(
+        self,
+        folder_id: str = "inbox",
+        unread: bool = None,
+        from_sender: str = "",
+        received_after: str = "",
+        received_before: str = "",
+        limit: int = 20,
+    ):
+        """
+        Asynchronously query emails from the local mail store.
+
+        Folders kept in sync by `arefresh_mail_folders` or `start_mail_sync` are
+        answered from the local SQLite store without calling Graph. Other
+        folders fall back to a live query. Both return the same records as
+        `aiter_emails`; use `aget_email_body` for the full body of an email.
+
+        Args:
+            folder_id (str): Mail folder ID or well-known name, e.g. 'inbox'.
+            unread (bool, optional): True for unread emails, False for read ones.
+            from_sender (str): Part of the sender's address or name.
+            received_after (str): Inclusive lower bound, e.g. '2024-05-01'.
+            received_before (str): Exclusive upper bound, e.g. '2024-06-01'.
+            limit (int): Maximum number of emails.
+
+        Returns:
+            list: The matching emails, most recent first.
+        """
+        mail_store = self._get_mail_store()
+        if mail_store.is_synced(folder_id):
+            stored_messages = mail_store.query(
+                folder_id=folder_id,
+                unread=unread,
+                from_sender=from_sender,
+                received_after=received_after,
+                received_before=received_before,
+                limit=limit,
+            )
+            return [self._stored_message_to_email_record(each) for each in stored_messages]
+
+        # Live fallback for folders that are not synced
+        conditions = []
+        if unread is not None:
+            conditions.append(f"isRead eq {'false' if unread else 'true'}")
+        if from_sender:
+            escaped_sender = from_sender.replace("'", "''")
+            if "@" in from_sender:
+                conditions.append(f"from/emailAddress/address eq '{escaped_sender}'")
+            else:
+                conditions.append(f"contains(from/emailAddress/name, '{escaped_sender}')")
+        if received_after:
+            conditions.append(f"receivedDateTime ge {to_utc_iso(received_after)}")
+        if received_before:
+            conditions.append(f"receivedDateTime lt {to_utc_iso(received_before)}")
+        return [
+            record
+            async for record in self.aiter_emails(
+                filter=" and ".join(conditions) or None,
+                page_size=min(limit, 50),
+                max_items=limit,
+                folder_id=folder_id,
+            )
+        ]
+
+    async def arefresh_mail_folders(self, folder_ids=("inbox",)):
+        """
+        Asynchronously run one delta sync round for mail folders.
+
+        The first round of a folder downloads all its messages; later rounds
+        only fetch what changed since the saved delta link.
+
+        Args:
+            folder_ids (Iterable[str]): Mail folder IDs or well-known names.
+        """
+        for folder_id in folder_ids:
+            try:
+                await self._arefresh_mail_folder(folder_id)
+            except APIError as error:
+                # An expired delta link is answered with 410 Gone: resync fully.
+                # Messages deleted meanwhile are never reported as removed, so
+                # the stored rows of the folder are dropped first.
+                if error.response_status_code != 410:
+                    raise
+                self._get_mail_store().delete_folder(folder_id)
+                await self._arefresh_mail_folder(folder_id)
+
+    def start_mail_sync(self, folder_ids=("inbox",), interval_seconds=60):
+        """
+        Start a background task syncing mail folders at a fixed interval.
+
+        Must be called from a running event loop. Calling it while a sync
+        task is running has no effect.
+
+        Args:
+            folder_ids (Iterable[str]): Mail folder IDs or well-known names.
+            interval_seconds (float): Delay between two sync rounds.
+
+        Returns:
+            asyncio.Task: The background sync task.
+        """
+        if self._mail_sync_task is None or self._mail_sync_task.done():
+            self._mail_sync_task = asyncio.create_task(
+                self._arun_mail_sync(tuple(folder_ids), interval_seconds)
+            )
+        return self._mail_sync_task
+
+    async def astop_mail_sync(self):
+        """
+        Stop the background mail sync task, if any.
+        """
+        if self._mail_sync_task is None:
+            return
+        self._mail_sync_task.cancel()
+        try:
+            await self._mail_sync_task
+        except asyncio.CancelledError:
+            pass
+        self._mail_sync_task = None
+
     async def asend_email(
-        self, subject: str, body_html: str, to_recipient: str
+        self,
+        subject: str,
+        body_html: str,
+        to_recipient: str,
+        attachment_paths: list = None,
     ) -> dict:
         """
         Asynchronously send an email with the specified subject, body, and recipients.
 
+        Small files are attached inline as long as the request stays below
+        Graph's 4 MB limit once they are base64 encoded. The other files are
+        streamed from disk through attachment upload sessions on a draft,
+        which is sent once all uploads completed and deleted if an upload or
+        the send fails.
+
+        `attachment_paths` is only available from Python: it is left out of
+        the tool schema, so an agent cannot mail arbitrary local files.
+
         Args:
             subject (str): Subject of the email.
             body_html (str): HTML content of the email body.
             to_recipient (str): List of recipient email addresses.
+            attachment_paths (list, optional): Paths of local files to attach.
 
         Returns:
             dict: A dictionary with the status of the email sent operation.
         """
-        to_recipients_list_object = []
-        # for each_recipient in to_recipients:
-        recipient = Recipient()
-        recipient.email_address = EmailAddress(address=to_recipient)
-        to_recipients_list_object.append(recipient)
-
-        email_message = Message(
-            subject=subject,
-            body=ItemBody(content=body_html, content_type=BodyType("html")),
-            to_recipients=to_recipients_list_object,
+        email_message = self._build_message(subject, body_html, [to_recipient])
+        inline_paths, large_attachments = split_inline_attachments(
+            [(file_path, get_attachment_size(file_path)) for file_path in attachment_paths or []],
+            reserved_bytes=len(subject.encode("utf-8")) + len(body_html.encode("utf-8")),
         )
-        request_body = SendMailPostRequestBody(save_to_sent_items=True)
-        request_body.message = email_message
-        await self.ms_graph_client.me.send_mail.post(request_body)
+        if inline_paths:
+            email_message.attachments = [
+                build_inline_attachment(file_path) for file_path in inline_paths
+            ]
+
+        if not large_attachments:
+            await self._asend_message(email_message)
+            return {"status": "Email sent successfully."}
+
+        import aiohttp
+
+        draft = await self.ms_graph_client.me.messages.post(email_message)
+        draft_builder = self.ms_graph_client.me.messages.by_message_id(draft.id)
+        try:
+            async with aiohttp.ClientSession() as session:
+                for file_path, size in large_attachments:
+                    upload_session = await draft_builder.attachments.create_upload_session.post(
+                        CreateUploadSessionPostRequestBody(
+                            attachment_item=build_upload_session_item(file_path, size)
+                        )
+                    )
+                    await aupload_file_in_chunks(
+                        session, upload_session.upload_url, file_path
+                    )
+            await self._asend_throttled(
+                lambda request_configuration: draft_builder.send.post(
+                    request_configuration=request_configuration
+                )
+            )
+        except BaseException:
+            # Do not leave a half-built draft in the mailbox
+            try:
+                await draft_builder.delete()
+            except Exception:
+                logger.exception("Deleting draft %s after a failed send failed.", draft.id)
+            raise
         return {"status": "Email sent successfully."}
 
+    async def asend_emails(
+        self,
+        subject_template: str,
+        body_html_template: str,
+        recipients: list,
+        max_retries: int = 3,
+    ) -> dict:
+        """
+        Asynchronously send one personalized email per recipient (mail merge).
+
+        Templates use `string.Template` placeholders such as `$name` or
+        `${invoice_number}`, filled from each recipient's fields; values are
+        HTML-escaped in the body. Emails are sent concurrently under the
+        mailbox rate limiter, and throttled sends are retried after the
+        `Retry-After` delay.
+
+        Args:
+            subject_template (str): Template of the subject.
+            body_html_template (str): Template of the HTML body.
+            recipients (list): One dict per email, with the `to_recipient`
+            address and the template fields.
+            max_retries (int): Retries of a throttled send.
+
+        Returns:
+            dict: The number of emails sent and failed, and the status of
+            each recipient, in order.
+        """
+        subject_template = Template(subject_template)
+        body_html_template = Template(body_html_template)
+
+        async def send(fields):
+            to_recipient = (fields.get("to_recipient") or "").strip()
+            report = {"to_recipient": to_recipient}
+            if not to_recipient:
+                return {**report, "status": "failed", "error": "Missing 'to_recipient'."}
+            try:
+                subject = subject_template.substitute(fields)
+                body_html = body_html_template.substitute(
+                    {key: html.escape(str(value)) for key, value in fields.items()}
+                )
+            except (KeyError, ValueError) as error:
+                return {
+                    **report,
+                    "status": "failed",
+                    "error": f"Template error, missing or invalid field: {error}",
+                }
+            try:
+                await self._asend_message(
+                    self._build_message(subject, body_html, [to_recipient]),
+                    max_retries=max_retries,
+                )
+            except Exception as error:
+                return {**report, "status": "failed", "error": str(error)}
+            return {**report, "status": "sent"}
+
+        results = await asyncio.gather(*[send(dict(each)) for each in recipients])
+        sent_count = sum(each["status"] == "sent" for each in results)
+        return {
+            "sent": sent_count,
+            "failed": len(results) - sent_count,
+            "results": results,
+        }
+
     async def asend_email_by_name(
         self, subject: str, body_html: str, to_recipient_by_name: str
     ) -> dict:
         """
         Asynchronously send an email with the specified subject, body,
-        and recipient specified by their name by searching in the user's contacts
-        and then in people if not found.
+        and recipient specified by their name.
+
+        The name is matched against the local recipient directory, built from
+        the user's contacts and people. When several recipients match about
+        equally well, no email is sent and the candidates are returned
+        instead. Names with no good match in the directory, which may be
+        stale, are looked up live in contacts and then in people.
 
         Args:
             subject (str): Subject of the email.
@@ -176,104 +742,617 @@ class MSEmailToolKit:
             to_recipient_by_name (str): Recipient name to look up.
 
         Returns:
-            dict: A dictionary with the status of the email sent operation.
+            dict: A dictionary with the status of the email sent operation, and
+            the candidate recipients when the name is ambiguous.
         """
-        to_recipient_email_address = ""
-
         name = to_recipient_by_name.strip()
+        candidates = await self.aresolve_recipients(name)
 
-        # First, search in contacts
+        strong_candidates = [
+            each for each in candidates if each["score"] >= RECIPIENT_ACCEPT_SCORE
+        ]
+        if strong_candidates:
+            best = strong_candidates[0]
+            contenders = [
+                each
+                for each in strong_candidates
+                if each["score"] >= best["score"] - RECIPIENT_AMBIGUITY_MARGIN
+            ]
+            if len(contenders) > 1:
+                return {
+                    "status": (
+                        f"The name '{name}' is ambiguous. No email was sent; "
+                        "retry with one of the candidate addresses."
+                    ),
+                    "candidates": [
+                        {"name": each["name"], "address": each["address"]}
+                        for each in contenders
+                    ],
+                }
+            return await self.asend_email(subject, body_html, best["address"])
+
+        to_recipient_email_address = await self._alookup_recipient_live(name)
+        if not to_recipient_email_address:
+            response = {
+                "status": f"No email address found for the name '{name}' in contacts or people."
+            }
+            if candidates:
+                # Weak directory matches, offered as suggestions only
+                response["candidates"] = [
+                    {"name": each["name"], "address": each["address"]}
+                    for each in candidates
+                ]
+            return response
+
+        # Send the email using the asend_email method
+        return await self.asend_email(subject, body_html, to_recipient_email_address)
+
+    async def aresolve_recipients(self, name: str, limit: int = 5) -> list:
+        """
+        Asynchronously find the recipients best matching a name.
+
+        The recipient directory is loaded on first use and refreshed in the
+        background once older than `RECIPIENT_DIRECTORY_TTL_SECONDS`.
+
+        Args:
+            name (str): The name, part of it, or an email address.
+            limit (int): Maximum number of candidates.
+
+        Returns:
+            list: Candidates with name, address, source and score, best first.
+        """
+        if not self.recipient_directory.is_loaded():
+            await self.arefresh_recipient_directory()
+        elif self.recipient_directory.is_stale(RECIPIENT_DIRECTORY_TTL_SECONDS) and (
+            self._recipient_refresh_task is None or self._recipient_refresh_task.done()
+        ):
+            self._recipient_refresh_task = asyncio.create_task(
+                self._arefresh_recipient_directory_in_background()
+            )
+        return self.recipient_directory.search(name, limit=limit)
+
+    async def arefresh_recipient_directory(self):
+        """
+        Asynchronously reload the recipient directory from contacts and people.
+        """
         from msgraph.generated.users.item.contacts.contacts_request_builder import (
             ContactsRequestBuilder,
         )
 
-        # Construct query parameters for the contacts search
+        recipients = []
+
         query_params = ContactsRequestBuilder.ContactsRequestBuilderGetQueryParameters(
-            filter=f"contains(displayName,'{name}') or contains(givenName,'{name}') or contains(surname,'{name}')",
-            select=["emailAddresses", "displayName"],
+            select=["displayName", "emailAddresses"],
+            top=500,
+        )
+        response = await self.ms_graph_client.me.contacts.get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        while response is not None:
+            for contact in response.value or []:
+                for email_address in contact.email_addresses or []:
+                    recipients.append(
+                        {
+                            "name": contact.display_name or email_address.name,
+                            "address": email_address.address,
+                            "source": "contacts",
+                        }
+                    )
+            if not response.odata_next_link:
+                break
+            response = await self.ms_graph_client.me.contacts.with_url(
+                response.odata_next_link
+            ).get()
+
+        query_params = PeopleRequestBuilder.PeopleRequestBuilderGetQueryParameters(
+            select=["displayName", "scoredEmailAddresses"],
+            top=100,
+        )
+        response = await self.ms_graph_client.me.people.get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        people_count = 0
+        while response is not None:
+            for person in response.value or []:
+                people_count += 1
+                for email_address in person.scored_email_addresses or []:
+                    recipients.append(
+                        {
+                            "name": person.display_name,
+                            "address": email_address.address,
+                            "source": "people",
+                        }
+                    )
+            if not response.odata_next_link or people_count >= RECIPIENT_DIRECTORY_MAX_PEOPLE:
+                break
+            response = await self.ms_graph_client.me.people.with_url(
+                response.odata_next_link
+            ).get()
+
+        self.recipient_directory.replace(recipients)
+
+    async def download_attachment(self, attachment_id, message_id):
+        """
+        Download the attachment content (PDF binary) from Microsoft Graph API.
+        """
+        # Use ms_graph_client to fetch the attachment content (binary)
+        attachment = (
+            await self.ms_graph_client.me.messages.by_message_id(message_id=message_id)
+            .attachments.by_attachment_id(attachment_id=attachment_id)
+            .get()
+        )
+        return attachment.content_bytes
+
+    def _build_message(self, subject, body_html, to_recipients):
+        """
+        Helper method to build an HTML email message.
+
+        Args:
+            subject (str): Subject of the email.
+            body_html (str): HTML content of the email body.
+            to_recipients (list): Recipient email addresses.
+
+        Returns:
+            Message: The message.
+        """
+        return Message(
+            subject=subject,
+            body=ItemBody(content=body_html, content_type=BodyType("html")),
+            to_recipients=[
+                Recipient(email_address=EmailAddress(address=each))
+                for each in to_recipients
+            ],
+        )
+
+    async def _asend_message(self, email_message, max_retries=3):
+        """
+        Helper method to send a message under the mailbox rate limiter.
+
+        Args:
+            email_message (Message): The message to send.
+            max_retries (int): Retries of a throttled send.
+        """
+        request_body = SendMailPostRequestBody(save_to_sent_items=True)
+        request_body.message = email_message
+        await self._asend_throttled(
+            lambda request_configuration: self.ms_graph_client.me.send_mail.post(
+                request_body, request_configuration=request_configuration
+            ),
+            max_retries=max_retries,
         )
 
-        # Set the request configuration with query parameters
+    async def _asend_throttled(self, send, max_retries=3):
+        """
+        Helper method to run a send request under the mailbox rate limiter.
+
+        Throttled sends (429) pause the limiter for the `Retry-After` delay,
+        with exponential backoff when the header is missing, and are retried.
+        Other errors are raised without retrying, since the message may have
+        been accepted; the retry middleware of the Graph client is disabled
+        for the request so that it does not resend on 503 or 504.
+
+        Args:
+            send (Callable): Receives the request configuration and returns
+            the awaitable send request, e.g. a `sendMail` or draft `send` post.
+            max_retries (int): Retries of a throttled send.
+        """
         request_configuration = RequestConfiguration(
-            query_parameters=query_params,
+            options=[RetryHandlerOption(should_retry=False)]
         )
+        for attempt in range(max_retries + 1):
+            async with self._send_rate_limiter:
+                try:
+                    await send(request_configuration)
+                    return
+                except APIError as error:
+                    if (
+                        error.response_status_code not in RETRYABLE_SEND_STATUS_CODES
+                        or attempt == max_retries
+                    ):
+                        raise
+                    self._send_rate_limiter.pause(
+                        retry_after_seconds(error.response_headers, default=2**attempt)
+                    )
+
+    async def _arefresh_recipient_directory_in_background(self):
+        """
+        Helper coroutine refreshing the recipient directory, logging failures
+        so that lookups keep using the previous directory.
+        """
+        try:
+            await self.arefresh_recipient_directory()
+        except Exception:
+            logger.exception("Refreshing the recipient directory failed.")
+
+    async def _alookup_recipient_live(self, name):
+        """
+        Helper method to look up the email address of a name in contacts and
+        then in people, for names missing from the recipient directory.
 
-        # Search contacts
+        Args:
+            name (str): The recipient name.
+
+        Returns:
+            str or None: The email address of the first match.
+        """
+        from msgraph.generated.users.item.contacts.contacts_request_builder import (
+            ContactsRequestBuilder,
+        )
+
+        escaped_name = name.replace("'", "''")
+        query_params = ContactsRequestBuilder.ContactsRequestBuilderGetQueryParameters(
+            filter=(
+                f"contains(displayName,'{escaped_name}') "
+                f"or contains(givenName,'{escaped_name}') "
+                f"or contains(surname,'{escaped_name}')"
+            ),
+            select=["emailAddresses", "displayName"],
+        )
         contacts = await self.ms_graph_client.me.contacts.get(
-            request_configuration=request_configuration
+            request_configuration=RequestConfiguration(query_parameters=query_params)
         )
+        for contact in (contacts.value if contacts else None) or []:
+            if contact.email_addresses:
+                return contact.email_addresses[0].address
 
-        # Check if any contact was found
-        if contacts and contacts.value and len(contacts.value) > 0:
-            contact = contacts.value[0]
-            # Get the email address
-            if contact.email_addresses and len(contact.email_addresses) > 0:
-                email_address = contact.email_addresses[0].address
-                to_recipient_email_address = email_address
-            else:
-                print(
-                    f"this is just a print. No email address found for '{name}' in contacts."
-                )
+        query_params = PeopleRequestBuilder.PeopleRequestBuilderGetQueryParameters(
+            search=f'"{name}"',
+        )
+        people = await self.ms_graph_client.me.people.get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        for person in (people.value if people else None) or []:
+            if person.scored_email_addresses:
+                return person.scored_email_addresses[0].address
+        return None
+
+    def _get_mail_store(self):
+        """
+        Helper method to open the local mail store on first use.
+        """
+        if self._mail_store is None:
+            self._mail_store = MailStore(self.mail_store_path)
+        return self._mail_store
+
+    async def _arun_mail_sync(self, folder_ids, interval_seconds):
+        """
+        Helper coroutine behind `start_mail_sync`.
+        """
+        while True:
+            try:
+                await self.arefresh_mail_folders(folder_ids)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Mail sync of folders %s failed.", folder_ids)
+            await asyncio.sleep(interval_seconds)
+
+    async def _arefresh_mail_folder(self, folder_id):
+        """
+        Helper method to run one delta sync round for a mail folder.
+        """
+        mail_store = self._get_mail_store()
+        delta_builder = self.ms_graph_client.me.mail_folders.by_mail_folder_id(
+            folder_id
+        ).messages.delta
+
+        delta_link = mail_store.get_delta_link(folder_id)
+        if delta_link:
+            response = await delta_builder.with_url(delta_link).get()
         else:
-            print(
-                f"this is just a print. No contact found for name '{name}' in contacts."
+            query_params = DeltaRequestBuilder.DeltaRequestBuilderGetQueryParameters(
+                select=MAIL_SYNC_FIELDS
             )
-
-        # If no email address found in contacts, search in 'people'
-        if not to_recipient_email_address:
-            # Import the necessary classes for people
-            from msgraph.generated.users.item.people.people_request_builder import (
-                PeopleRequestBuilder,
+            response = await delta_builder.get(
+                request_configuration=RequestConfiguration(query_parameters=query_params)
             )
 
-            # Construct query parameters for the people search
-            query_params = PeopleRequestBuilder.PeopleRequestBuilderGetQueryParameters(
-                search=f'"{name}"',
+        while response is not None:
+            changed_messages = []
+            removed_message_ids = []
+            for message in response.value or []:
+                if message.additional_data and "@removed" in message.additional_data:
+                    removed_message_ids.append(message.id)
+                else:
+                    changed_messages.append(message)
+
+            body_texts = await self._aconvert_bodies_to_text(changed_messages)
+            mail_store.upsert_messages(
+                folder_id,
+                [
+                    {
+                        "id": message.id,
+                        "change_key": message.change_key,
+                        "conversation_id": message.conversation_id,
+                        "subject": message.subject,
+                        "sender_address": (
+                            message.from_.email_address.address if message.from_ else None
+                        ),
+                        "sender_name": (
+                            message.from_.email_address.name if message.from_ else None
+                        ),
+                        "received_date_time": message.received_date_time,
+                        "is_read": message.is_read,
+                        "body_preview": message.body_preview,
+                        "body_text": body_text,
+                    }
+                    for message, body_text in zip(changed_messages, body_texts)
+                ],
             )
+            mail_store.delete_messages(removed_message_ids)
+
+            if response.odata_next_link:
+                response = await delta_builder.with_url(response.odata_next_link).get()
+                continue
+            if response.odata_delta_link:
+                mail_store.set_delta_link(folder_id, response.odata_delta_link)
+            break
+
+    async def _aiter_messages(
+        self, filter=None, page_size=50, folder_id=None, orderby=None
+    ):
+        """
+        Helper method to iterate over messages, following `@odata.nextLink`.
 
-            request_configuration = RequestConfiguration(
-                query_parameters=query_params,
+        Args:
+            filter (str, optional): OData filter of the messages.
+            page_size (int): Number of messages requested per page.
+            folder_id (str, optional): Mail folder ID or well-known name.
+            orderby (list, optional): OData ordering.
+
+        Yields:
+            Message: Messages with the `EMAIL_RECORD_FIELDS` selected.
+        """
+        if folder_id:
+            request_builder = self.ms_graph_client.me.mail_folders.by_mail_folder_id(
+                folder_id
+            ).messages
+            query_params = MailFolderMessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+                select=EMAIL_RECORD_FIELDS, top=page_size, filter=filter, orderby=orderby
+            )
+        else:
+            request_builder = self.ms_graph_client.me.messages
+            query_params = MessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+                select=EMAIL_RECORD_FIELDS, top=page_size, filter=filter, orderby=orderby
             )
+        request_config = RequestConfiguration(query_parameters=query_params)
+
+        messages = await request_builder.get(request_configuration=request_config)
+        while messages is not None:
+            for message in messages.value or []:
+                yield message
+            if not messages.odata_next_link:
+                return
+            messages = await request_builder.with_url(messages.odata_next_link).get()
+
+    async def _aresolve_mail_folder_ids(self, folder_names):
+        """
+        Helper method to map folder names to IDs usable in requests.
+
+        Well-known names are used as they are; other names are matched,
+        ignoring case, against the display names of the mailbox folders.
+
+        Args:
+            folder_names (Iterable[str]): Well-known or display folder names.
+
+        Returns:
+            tuple: A dict of folder name to ID, and the unresolved names.
+        """
+        folder_ids = {}
+        custom_names = []
+        for folder_name in folder_names:
+            if folder_name.lower().replace(" ", "") in WELL_KNOWN_MAIL_FOLDERS:
+                folder_ids[folder_name] = folder_name.lower().replace(" ", "")
+            else:
+                custom_names.append(folder_name)
+        if not custom_names:
+            return folder_ids, []
+
+        display_name_ids = {}
+        query_params = MailFoldersRequestBuilder.MailFoldersRequestBuilderGetQueryParameters(
+            select=["id", "displayName"], top=250
+        )
+        response = await self.ms_graph_client.me.mail_folders.get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        while response is not None:
+            for folder in response.value or []:
+                display_name_ids.setdefault((folder.display_name or "").lower(), folder.id)
+            if not response.odata_next_link:
+                break
+            response = await self.ms_graph_client.me.mail_folders.with_url(
+                response.odata_next_link
+            ).get()
+
+        unresolved_folders = []
+        for folder_name in custom_names:
+            folder_id = display_name_ids.get(folder_name.lower())
+            if folder_id:
+                folder_ids[folder_name] = folder_id
+            else:
+                unresolved_folders.append(folder_name)
+        return folder_ids, unresolved_folders
+
+    def _to_email_record(self, message):
+        """
+        Helper method to convert a message into a lightweight email record.
+
+        Args:
+            message (Message): A message with the `EMAIL_RECORD_FIELDS` selected.
 
-            # Search people (contacts, organization, etc.)
-            people = await self.ms_graph_client.me.people.get(
-                request_configuration=request_configuration
+        Returns:
+            dict: The email record.
+        """
+        sender = message.from_.email_address if message.from_ else None
+        received_date_time = None
+        if message.received_date_time:
+            received_date_time = message.received_date_time.astimezone(
+                pytz.timezone("Europe/Berlin")
+            ).strftime("%Y-%m-%d %H:%M:%S %Z%z")
+        return {
+            "id": message.id,
+            "from": f"{sender.address} - {sender.name}" if sender else "",
+            "subject": message.subject or "",
+            "received_date_time": received_date_time,
+            "body_preview": message.body_preview or "",
+            "is_read": message.is_read,
+            "conversation_id": message.conversation_id,
+        }
+
+    def _stored_message_to_email_record(self, stored_message):
+        """
+        Helper method to convert a mail store row into the email record
+        returned by `_to_email_record`.
+        """
+        received_date_time = None
+        if stored_message["received_date_time"]:
+            received_date_time = (
+                datetime.strptime(stored_message["received_date_time"], "%Y-%m-%dT%H:%M:%SZ")
+                .replace(tzinfo=pytz.utc)
+                .astimezone(pytz.timezone("Europe/Berlin"))
+                .strftime("%Y-%m-%d %H:%M:%S %Z%z")
             )
+        sender = ""
+        if stored_message["sender_address"] or stored_message["sender_name"]:
+            sender = f"{stored_message['sender_address']} - {stored_message['sender_name']}"
+        return {
+            "id": stored_message["id"],
+            "from": sender,
+            "subject": stored_message["subject"] or "",
+            "received_date_time": received_date_time,
+            "body_preview": stored_message["body_preview"] or "",
+            "is_read": None if stored_message["is_read"] is None else bool(stored_message["is_read"]),
+            "conversation_id": stored_message["conversation_id"],
+        }
 
-            # Check if any person was found
-            if people and people.value and len(people.value) > 0:
-                person = people.value[0]
-                # Get the email address
-                if (
-                    person.scored_email_addresses
-                    and len(person.scored_email_addresses) > 0
-                ):
-                    email_address = person.scored_email_addresses[0].address
-                    to_recipient_email_address = email_address
-                else:
-                    print(f"No email address found for '{name}' in people.")
+    async def _aconvert_bodies_to_text(self, messages):
+        """
+        Convert the bodies of messages to plain text.
+
+        Conversions are cached by message ID and changeKey, so polling the
+        same messages does not parse them again. Large batches of uncached
+        HTML bodies run on `html_parse_executor` when one is configured, one
+        job per body so that a pool converts them in parallel.
+
+        Args:
+            messages (list): The messages, with `body` and `change_key` selected.
+
+        Returns:
+            list: The plain text body of each message, in order.
+        """
+        body_texts = [None] * len(messages)
+        uncached_positions = []
+        for position, message in enumerate(messages):
+            body = message.body
+            if body is None or not body.content:
+                body_texts[position] = ""
+            elif body.content_type == BodyType.Text:
+                body_texts[position] = body.content
             else:
-                print(f"No person found for name '{name}' in people.")
+                cache_key = (message.id, message.change_key)
+                if message.change_key and cache_key in self._body_text_cache:
+                    self._body_text_cache.move_to_end(cache_key)
+                    body_texts[position] = self._body_text_cache[cache_key]
+                else:
+                    uncached_positions.append(position)
 
-        if not to_recipient_email_address:
-            return {
-                "status": f"No email address found for the name '{name}' in contacts or people."
-            }
+        html_documents = [messages[each].body.content for each in uncached_positions]
+        if (
+            self.html_parse_executor is not None
+            and len(html_documents) >= BODY_TEXT_EXECUTOR_THRESHOLD
+        ):
+            loop = asyncio.get_running_loop()
+            converted = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self.html_parse_executor, html_to_text, each)
+                    for each in html_documents
+                )
+            )
+        else:
+            converted = [html_to_text(each) for each in html_documents]
 
-        # Send the email using the asend_email method
-        return await self.asend_email(subject, body_html, to_recipient_email_address)
+        for position, text in zip(uncached_positions, converted):
+            body_texts[position] = text
+            message = messages[position]
+            if message.change_key:
+                self._body_text_cache[(message.id, message.change_key)] = text
+                if len(self._body_text_cache) > BODY_TEXT_CACHE_SIZE:
+                    self._body_text_cache.popitem(last=False)
+        return body_texts
 
-    async def download_attachment(self, attachment_id, message_id):
+    async def _adownload_attachments(self, attachments_to_download):
         """
-        Download the attachment content (PDF binary) from Microsoft Graph API.
+        Download the content of several attachments concurrently.
+
+        Args:
+            attachments_to_download (list): Tuples of the attachment info dict
+            to fill in, the attachment ID and the message ID.
         """
-        # Use ms_graph_client to fetch the attachment content (binary)
-        attachment = (
-            await self.ms_graph_client.me.messages.by_message_id(message_id=message_id)
-            .attachments.by_attachment_id(attachment_id=attachment_id)
-            .get()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ATTACHMENT_DOWNLOADS)
+
+        async def download(attachment_info, attachment_id, message_id):
+            async with semaphore:
+                attachment_info["file_bytes"] = await self.download_attachment(
+                    attachment_id, message_id
+                )
+
+        await asyncio.gather(
+            *[download(*each) for each in attachments_to_download]
         )
-        return attachment.content_bytes
+
+    async def _aextract_attachment_texts(self, attachment_infos, char_budget):
+        """
+        Add the extracted text of attachments to their info dicts.
+
+        Each document is extracted in its own `attachment_text_executor` job,
+        so a process pool parses them in parallel. Texts are cached by the
+        SHA-256 of the content, so the same file attached to several emails
+        or fetched again is parsed once. A document that cannot be parsed
+        gets an error message as its text.
+
+        Args:
+            attachment_infos (list): Attachment info dicts with `name` and
+            `file_bytes`; a `text` key is added to each.
+            char_budget (int): Maximum number of characters per attachment.
+        """
+        pending = {}
+        for attachment_info in attachment_infos:
+            content = attachment_info.get("file_bytes")
+            if not content or not is_supported_document(attachment_info["name"]):
+                attachment_info["text"] = None
+                continue
+            cache_key = (hashlib.sha256(content).hexdigest(), char_budget)
+            if cache_key in self._attachment_text_cache:
+                self._attachment_text_cache.move_to_end(cache_key)
+                attachment_info["text"] = self._attachment_text_cache[cache_key]
+            else:
+                pending.setdefault(cache_key, (attachment_info["name"], content, []))
+                pending[cache_key][2].append(attachment_info)
+
+        if not pending:
+            return
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.attachment_text_executor,
+                    extract_text_from_document,
+                    file_name,
+                    content,
+                    char_budget,
+                )
+                for file_name, content, _ in pending.values()
+            ),
+            return_exceptions=True,
+        )
+        for (cache_key, (file_name, _, infos)), text in zip(pending.items(), results):
+            if isinstance(text, Exception):
+                text = f"Failed to extract text from '{file_name}': {text}"
+            for attachment_info in infos:
+                attachment_info["text"] = text
+            self._attachment_text_cache[cache_key] = text
+            if len(self._attachment_text_cache) > ATTACHMENT_TEXT_CACHE_SIZE:
+                self._attachment_text_cache.popitem(last=False)
 
     def get_tools(self):
         """
@@ -0,0 +1,174 @@
+"""
+In-memory directory of email recipients with fuzzy name matching.
+
+Names and addresses are indexed by character trigrams, so a misspelled or
+partial name ("jon smth", "smith") still finds its recipient. A lookup only
+touches the entries sharing trigrams with the query and takes well under a
+millisecond for directories of a few thousand people.
+"""
+
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+
+
+def normalize_name(text: str) -> str:
+    """
+    Normalize a name for matching: accents removed, case folded and
+    whitespace collapsed.
+
+    Args:
+        text (str): A name or email address.
+
+    Returns:
+        str: The normalized text.
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    without_accents = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return " ".join(without_accents.casefold().split())
+
+
+def trigrams(text: str) -> set:
+    """
+    Character trigrams of a normalized text, padded so that word starts
+    and ends weigh in.
+
+    Args:
+        text (str): A normalized name.
+
+    Returns:
+        set: The trigrams of the text.
+    """
+    padded = f"  {text} "
+    return {padded[position : position + 3] for position in range(len(padded) - 2)}
+
+
+class RecipientDirectory:
+    """
+    Trigram index over recipients, keyed by email address.
+
+    Each recipient is searchable by display name and by the local part of
+    its address. Rebuilding swaps in a new index in one step, so searches
+    running during a refresh see either the old or the new entries.
+    """
+
+    def __init__(self):
+        self._entries: List[Dict[str, str]] = []
+        self._keys: List[tuple] = []
+        self._index: Dict[str, List[int]] = {}
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def replace(self, recipients: Iterable[Dict[str, str]]):
+        """
+        Replace the directory content.
+
+        Args:
+            recipients (Iterable[Dict[str, str]]): Dicts with `name`, `address`
+            and `source`. The first entry of an address wins, so pass the
+            most trusted source first.
+        """
+        entries = []
+        seen_addresses = set()
+        for recipient in recipients:
+            address = (recipient.get("address") or "").strip()
+            if not address or address.lower() in seen_addresses:
+                continue
+            seen_addresses.add(address.lower())
+            entries.append(
+                {
+                    "name": recipient.get("name") or "",
+                    "address": address,
+                    "source": recipient.get("source") or "",
+                }
+            )
+
+        keys = []
+        index = defaultdict(list)
+        for entry_position, entry in enumerate(entries):
+            local_part = entry["address"].split("@")[0].replace(".", " ")
+            for text in {normalize_name(entry["name"]), normalize_name(local_part)}:
+                if not text:
+                    continue
+                key_trigrams = trigrams(text)
+                key_position = len(keys)
+                keys.append((entry_position, text, len(key_trigrams)))
+                for each in key_trigrams:
+                    index[each].append(key_position)
+
+        self._entries, self._keys, self._index = entries, keys, dict(index)
+        self.loaded_at = time.monotonic()
+
+    def is_loaded(self) -> bool:
+        """
+        Whether the directory was filled at least once.
+        """
+        return self.loaded_at is not None
+
+    def is_stale(self, ttl_seconds: float) -> bool:
+        """
+        Whether the directory is older than `ttl_seconds`.
+        """
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > ttl_seconds
+
+    def search(self, name: str, limit: int = 5, min_score: float = 0.3) -> List[Dict]:
+        """
+        Find the recipients best matching a name.
+
+        The score is the Dice coefficient of the trigram sets of the query
+        and of the name or address, 1.0 for an exact match.
+
+        Args:
+            name (str): The name, part of it, or an email address.
+            limit (int): Maximum number of candidates.
+            min_score (float): Minimum score of a candidate.
+
+        Returns:
+            List[Dict]: Candidates with `name`, `address`, `source` and
+            `score`, best first.
+        """
+        query = normalize_name(name)
+        if not query:
+            return []
+        # Keep local references: a concurrent replace() swaps all three.
+        entries, keys, index = self._entries, self._keys, self._index
+
+        if "@" in query:
+            return [
+                {**entry, "score": 1.0}
+                for entry in entries
+                if entry["address"].lower() == query
+            ][:limit]
+
+        query_trigrams = trigrams(query)
+        shared_counts = Counter()
+        for each in query_trigrams:
+            shared_counts.update(index.get(each, ()))
+
+        best_scores = {}
+        for key_position, shared in shared_counts.items():
+            entry_position, text, trigram_count = keys[key_position]
+            if text == query:
+                score = 1.0
+            else:
+                score = 2 * shared / (len(query_trigrams) + trigram_count)
+            if score > best_scores.get(entry_position, 0.0):
+                best_scores[entry_position] = score
+
+        ranked = sorted(
+            (
+                (score, entry_position)
+                for entry_position, score in best_scores.items()
+                if score >= min_score
+            ),
+            reverse=True,
+        )
+        return [
+            {**entries[entry_position], "score": round(score, 3)}
+            for score, entry_position in ranked[:limit]
+        ]
@@ -10,7 +10,7 @@ Variables:
     method_mappings: A dictionary mapping method names to their descriptions and input schemas.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from textwrap import dedent
 
@@ -28,6 +28,31 @@ class GetEmailsInputSchema(BaseModel):
         3) Get emails sent by admin@recall.space
             -> from/emailAddress/address eq 'admin@recall.space'
         """))
+    preview_only: Optional[bool] = Field(
+        default=False,
+        description=(
+            "Return a short body preview instead of the full body. Use it to triage "
+            "emails, then read the relevant ones with aget_email_body."
+        ),
+    )
+    strip_quoted: Optional[bool] = Field(
+        default=False,
+        description="Remove quoted replies, forwarded headers and signatures from the bodies",
+    )
+    group_by_conversation: Optional[bool] = Field(
+        default=False,
+        description="Group the emails into conversations of deduplicated turns",
+    )
+    extract_attachment_text: Optional[bool] = Field(
+        default=False,
+        description="Whether to include the text of PDF, DOCX and XLSX attachments",
+    )
+    attachment_char_budget: Optional[int] = Field(
+        default=4000, description="Maximum number of characters of text per attachment"
+    )
+
+class GetEmailBodyInputSchema(BaseModel):
+    message_id: str = Field(..., description="ID of the email, as returned by aget_emails")
 
 class SendEmailInputSchema(BaseModel):
     subject: str = Field(..., description="Subject of the email")
@@ -36,6 +61,22 @@ class SendEmailInputSchema(BaseModel):
         ..., description="Recipient email addresses"
     )
 
+class SendEmailsInputSchema(BaseModel):
+    subject_template: str = Field(
+        ..., description="Subject template with placeholders like $name or ${invoice_number}"
+    )
+    body_html_template: str = Field(
+        ..., description="HTML body template with placeholders like $name or ${invoice_number}"
+    )
+    recipients: List[Dict[str, str]] = Field(
+        ...,
+        description=(
+            "One object per email: 'to_recipient' holds the email address, the other "
+            "keys fill the template placeholders. "
+            "For example: [{'to_recipient': 'a@b.com', 'name': 'Anna'}]"
+        ),
+    )
+
 class SendEmailByNameInputSchema(BaseModel):
     subject: str = Field(..., description="Subject of the email")
     body_html: str = Field(..., description="HTML content of the email body")
@@ -43,18 +84,79 @@ class SendEmailByNameInputSchema(BaseModel):
         ..., description="Recipient name."
     )
 
+class ResolveRecipientsInputSchema(BaseModel):
+    name: str = Field(..., description="Recipient name, part of it, or email address")
+    limit: Optional[int] = Field(default=5, description="Maximum number of candidates")
+
+class SearchMailFoldersInputSchema(BaseModel):
+    folder_names: Optional[List[str]] = Field(
+        default=["inbox", "archive"],
+        description=(
+            "Folders to search: well-known names such as inbox, archive, sentitems, "
+            "deleteditems, or the display names of custom folders"
+        ),
+    )
+    filter: Optional[str] = Field(
+        default=None,
+        description=dedent("""
+        OData filtering applied in every folder. For example:
+        1) Unread emails -> isRead eq false
+        2) Emails sent by admin@recall.space
+            -> from/emailAddress/address eq 'admin@recall.space'
+        """),
+    )
+    limit: Optional[int] = Field(default=20, description="Maximum number of emails in total")
+
+class QueryLocalEmailsInputSchema(BaseModel):
+    folder_id: Optional[str] = Field(
+        default="inbox", description="Mail folder ID or well-known name, e.g. 'inbox'"
+    )
+    unread: Optional[bool] = Field(
+        default=None, description="True for unread emails only, False for read emails only"
+    )
+    from_sender: Optional[str] = Field(
+        default="", description="Part of the sender's email address or name"
+    )
+    received_after: Optional[str] = Field(
+        default="", description="Only emails received on or after this ISO date, e.g. 2024-05-01"
+    )
+    received_before: Optional[str] = Field(
+        default="", description="Only emails received before this ISO date, e.g. 2024-06-01"
+    )
+    limit: Optional[int] = Field(default=20, description="Maximum number of emails")
+
 
 schema_mappings = {
     "aget_emails": {
         "description": "Retrieve a list emails.",
         "input_schema": GetEmailsInputSchema,
     },
+    "aget_email_body": {
+        "description": "Retrieve the full body of an email by its ID.",
+        "input_schema": GetEmailBodyInputSchema,
+    },
     "asend_email": {
         "description": "Send an email with the specified subject, body, and recipient.",
         "input_schema": SendEmailInputSchema,
     },
+    "asend_emails": {
+        "description": "Send one personalized email per recipient from a subject and body template (mail merge).",
+        "input_schema": SendEmailsInputSchema,
+    },
     "asend_email_by_name": {
         "description": "Send an email with the specified subject, body, and recipient's name.",
         "input_schema": SendEmailByNameInputSchema,
     },
+    "aresolve_recipients": {
+        "description": "Find the email addresses of people matching a name, best match first.",
+        "input_schema": ResolveRecipientsInputSchema,
+    },
+    "asearch_mail_folders": {
+        "description": "Search several mail folders at once, most recent emails first.",
+        "input_schema": SearchMailFoldersInputSchema,
+    },
+    "aquery_local_emails": {
+        "description": "Quickly find emails by read status, sender or date range, most recent first.",
+        "input_schema": QueryLocalEmailsInputSchema,
+    },
 }
\ No newline at end of file
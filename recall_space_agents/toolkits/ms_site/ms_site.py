@@ -9,16 +9,13 @@ Classes:
     Microsoft Graph API.
 """
 
-import io
-import openpyxl
 from agent_builder.builders.tool_builder import ToolBuilder
-from docx import Document
 from msgraph import GraphServiceClient
 from msgraph.generated.sites.sites_request_builder import SitesRequestBuilder
-from PyPDF2 import PdfReader
 
 from recall_space_agents.toolkits.ms_site.schema_mappings import \
     schema_mappings
+from recall_space_agents.utils import document_to_text
 
 
 class MSSiteToolKit:
@@ -299,12 +296,7 @@ class MSSiteToolKit:
         Returns:
             str: The extracted text content of the PDF.
         """
-        with io.BytesIO(binary_content) as f:
-            reader = PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-        return text
+        return document_to_text.extract_text_from_pdf(binary_content)
 
     def extract_text_from_docx(self, binary_content):
         """
@@ -316,10 +308,7 @@ class MSSiteToolKit:
         Returns:
             str: The extracted text content of the DOCX.
         """
-        with io.BytesIO(binary_content) as f:
-            document = Document(f)
-            text = "\n".join([para.text for para in document.paragraphs])
-        return text
+        return document_to_text.extract_text_from_docx(binary_content)
 
     def extract_text_from_xlsx(self, binary_content):
         """
@@ -331,17 +320,7 @@ class MSSiteToolKit:
         Returns:
             str: The extracted text content of the XLSX.
         """
-        with io.BytesIO(binary_content) as f:
-            workbook = openpyxl.load_workbook(f, data_only=True)
-            text = ""
-            for sheetname in workbook.sheetnames:
-                sheet = workbook[sheetname]
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = " ".join(
-                        [str(cell) if cell is not None else "" for cell in row]
-                    )
-                    text += f"{row_text}\n"
-        return text
+        return document_to_text.extract_text_from_xlsx(binary_content)
 
     def get_tools(self):
         """
@@ -0,0 +1,92 @@
+"""
+Conversion of workbook table snapshots to Apache Arrow.
+
+pyarrow is an optional dependency, installed with the 'analytics' extra:
+`pip install recall-space-agents[analytics]`.
+"""
+
+import datetime
+from typing import Any, List
+
+# Range of the int64 Arrow type; integral columns outside of it are float64.
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, raising a helpful error when it is not installed.
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError(
+            "Exporting tables to Arrow or Parquet requires pyarrow. "
+            "Install it with `pip install recall-space-agents[analytics]`."
+        ) from error
+    return pyarrow
+
+
+def infer_arrow_column(values: List[Any]):
+    """
+    Build an Arrow array from the values of one column, inferring its type.
+
+    Empty cells ("" or None) become nulls. A column of booleans becomes
+    bool, a column of integral numbers int64, a column of numbers float64
+    and a column of datetimes a timestamp. Integral numbers outside of the
+    int64 range make the column float64. Any other mix becomes string.
+
+    Args:
+        values (List[Any]): The cell values of the column.
+
+    Returns:
+        pyarrow.Array: The typed column.
+    """
+    pyarrow = _import_pyarrow()
+    cleaned = [None if value == "" else value for value in values]
+    present = [value for value in cleaned if value is not None]
+
+    if present and all(isinstance(value, bool) for value in present):
+        return pyarrow.array(cleaned, type=pyarrow.bool_())
+    if present and all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in present
+    ):
+        if all(
+            (isinstance(value, int) or value.is_integer())
+            and INT64_MIN <= value <= INT64_MAX
+            for value in present
+        ):
+            return pyarrow.array(
+                [None if value is None else int(value) for value in cleaned],
+                type=pyarrow.int64(),
+            )
+        return pyarrow.array(
+            [None if value is None else float(value) for value in cleaned],
+            type=pyarrow.float64(),
+        )
+    if present and all(isinstance(value, datetime.datetime) for value in present):
+        return pyarrow.array(cleaned, type=pyarrow.timestamp("us"))
+    return pyarrow.array(
+        [None if value is None else str(value) for value in cleaned],
+        type=pyarrow.string(),
+    )
+
+
+def table_snapshot_to_arrow(header: List[str], rows: List[List[Any]]):
+    """
+    Convert the header and rows of a table snapshot to an Arrow table.
+
+    Args:
+        header (List[str]): The column names.
+        rows (List[List[Any]]): The data rows.
+
+    Returns:
+        pyarrow.Table: The table, with one inferred type per column.
+    """
+    pyarrow = _import_pyarrow()
+    columns = [
+        infer_arrow_column([row[position] for row in rows])
+        for position in range(len(header))
+    ]
+    return pyarrow.Table.from_arrays(columns, names=[str(each) for each in header])
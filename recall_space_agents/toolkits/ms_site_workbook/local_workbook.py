@@ -0,0 +1,197 @@
+"""
+Read-only access to worksheets and tables of a locally stored .xlsx file.
+
+openpyxl does not expose table definitions in read-only mode, so they are
+read directly from the package parts (workbook, relationships and table
+XML). Cell values are then streamed with openpyxl in read-only mode, which
+keeps memory bounded and is much faster than the Excel REST API for
+read-heavy queries.
+"""
+
+import posixpath
+import zipfile
+from typing import Any, Dict, List, Tuple
+from xml.etree import ElementTree
+
+import openpyxl
+
+from recall_space_agents.toolkits.ms_site_workbook.write_queue import (
+    CELL_ADDRESS_PATTERN, column_letters_to_index)
+
+SPREADSHEET_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+
+
+def _relationships_path(part_path: str) -> str:
+    """Return the path of the relationships part of a package part."""
+    directory, file_name = posixpath.split(part_path)
+    return posixpath.join(directory, "_rels", f"{file_name}.rels")
+
+
+def _resolve_target(part_path: str, target: str) -> str:
+    """Resolve a relationship target relative to its source part."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_path), target))
+
+
+def _read_relationships(archive: zipfile.ZipFile, part_path: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Read the relationships of a package part.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: Relationship type and resolved target
+        path, keyed by relationship ID.
+    """
+    rels_path = _relationships_path(part_path)
+    if rels_path not in archive.namelist():
+        return {}
+    root = ElementTree.fromstring(archive.read(rels_path))
+    relationships = {}
+    for each in root.findall(f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+        if each.get("TargetMode") == "External":
+            continue
+        relationships[each.get("Id")] = (
+            each.get("Type", ""),
+            _resolve_target(part_path, each.get("Target", "")),
+        )
+    return relationships
+
+
+def _parse_range_reference(reference: str) -> Tuple[int, int, int, int]:
+    """
+    Parse an A1 range reference such as 'A1:D20'.
+
+    Returns:
+        Tuple[int, int, int, int]: First row, first column, last row and
+        last column, all one-based.
+    """
+    start, _, end = reference.replace("$", "").partition(":")
+    end = end or start
+    start_match = CELL_ADDRESS_PATTERN.match(start)
+    end_match = CELL_ADDRESS_PATTERN.match(end)
+    if start_match is None or end_match is None:
+        raise ValueError(f"Unsupported range reference '{reference}'.")
+    return (
+        int(start_match.group(2)),
+        column_letters_to_index(start_match.group(1)),
+        int(end_match.group(2)),
+        column_letters_to_index(end_match.group(1)),
+    )
+
+
+class LocalWorkbook:
+    """
+    Table definitions and values of a local .xlsx file.
+
+    Args:
+        path (str): Path of the .xlsx file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.worksheet_names: List[str] = []
+        # Table definitions keyed by worksheet name, then by table name.
+        self._tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._read_table_definitions()
+
+    def _read_table_definitions(self):
+        workbook_part = "xl/workbook.xml"
+        with zipfile.ZipFile(self.path) as archive:
+            workbook_root = ElementTree.fromstring(archive.read(workbook_part))
+            workbook_relationships = _read_relationships(archive, workbook_part)
+            sheets = workbook_root.find(f"{{{SPREADSHEET_NAMESPACE}}}sheets")
+            for sheet in sheets if sheets is not None else []:
+                sheet_name = sheet.get("name")
+                self.worksheet_names.append(sheet_name)
+                self._tables[sheet_name] = {}
+                relationship_id = sheet.get(f"{{{RELATIONSHIPS_NAMESPACE}}}id")
+                if relationship_id not in workbook_relationships:
+                    continue
+                _, sheet_part = workbook_relationships[relationship_id]
+                for relationship_type, table_part in _read_relationships(
+                    archive, sheet_part
+                ).values():
+                    if not relationship_type.endswith("/table"):
+                        continue
+                    table_root = ElementTree.fromstring(archive.read(table_part))
+                    table_name = table_root.get("displayName") or table_root.get("name")
+                    self._tables[sheet_name][table_name] = {
+                        "ref": table_root.get("ref"),
+                        "header_row_count": int(table_root.get("headerRowCount", "1")),
+                        "totals_row_count": int(table_root.get("totalsRowCount", "0")),
+                        "columns": [
+                            each.get("name")
+                            for each in table_root.iter(
+                                f"{{{SPREADSHEET_NAMESPACE}}}tableColumn"
+                            )
+                        ],
+                    }
+
+    def list_tables(self, worksheet_name: str) -> List[str]:
+        """
+        List the names of the tables of a worksheet.
+
+        Args:
+            worksheet_name (str): The name of the worksheet.
+
+        Returns:
+            List[str]: The table names.
+        """
+        if worksheet_name not in self._tables:
+            raise ValueError(f"Worksheet '{worksheet_name}' not found in workbook.")
+        return list(self._tables[worksheet_name])
+
+    def read_table(
+        self, worksheet_name: str, table_name: str
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """
+        Read the header and the data rows of a table.
+
+        Args:
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+
+        Returns:
+            Tuple[List[str], List[List[Any]]]: The column names and the data
+            rows, without the header and totals rows. Empty cells are "".
+        """
+        tables = self._tables.get(worksheet_name)
+        if tables is None:
+            raise ValueError(f"Worksheet '{worksheet_name}' not found in workbook.")
+        table = tables.get(table_name)
+        if table is None:
+            raise ValueError(
+                f"Table '{table_name}' not found in worksheet '{worksheet_name}'."
+            )
+
+        first_row, first_column, last_row, last_column = _parse_range_reference(
+            table["ref"]
+        )
+        first_data_row = first_row + table["header_row_count"]
+        last_data_row = last_row - table["totals_row_count"]
+
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[worksheet_name]
+            rows = []
+            if last_data_row >= first_data_row:
+                # Empty cells are returned as "" to match the Excel REST API.
+                rows = [
+                    ["" if value is None else value for value in row]
+                    for row in worksheet.iter_rows(
+                        min_row=first_data_row,
+                        max_row=last_data_row,
+                        min_col=first_column,
+                        max_col=last_column,
+                        values_only=True,
+                    )
+                ]
+        finally:
+            workbook.close()
+        return list(table["columns"]), rows
@@ -1,20 +1,290 @@
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Any, Dict, List
 
 import pandas as pd
 
 from recall_space_agents.toolkits.ms_site.ms_site import MSSiteToolKit
+from recall_space_agents.toolkits.ms_site_workbook.arrow_export import (
+    _import_pyarrow, table_snapshot_to_arrow)
+from recall_space_agents.toolkits.ms_site_workbook.local_workbook import \
+    LocalWorkbook
 from recall_space_agents.toolkits.ms_site_workbook.schema_mappings import \
     schema_mappings
+from recall_space_agents.toolkits.ms_site_workbook.table_index import \
+    TableHashIndex
+from recall_space_agents.toolkits.ms_site_workbook.write_queue import (
+    CELL_ADDRESS_PATTERN, WorkbookWriteQueue)
 from recall_space_agents.utils.dataframe_to_markdown import \
     dataframe_to_markdown
+from recall_space_agents.utils.table_renderer import render_table_rows
+
+
+logger = logging.getLogger(__name__)
+
+# Backends used to read worksheets and tables.
+READ_BACKEND_GRAPH = "graph"
+READ_BACKEND_LOCAL = "local"
+READ_BACKENDS = (READ_BACKEND_GRAPH, READ_BACKEND_LOCAL)
+# Prefix of the private temporary directory holding local workbook copies.
+LOCAL_WORKBOOK_DIRECTORY_PREFIX = "recall_space_agents_workbooks_"
+
+# Output formats of the filtered table data.
+FILTERED_OUTPUT_COLUMNAR = "columnar"
+FILTERED_OUTPUT_MARKDOWN = "markdown"
+FILTERED_OUTPUT_CSV = "csv"
+FILTERED_OUTPUT_CELLS = "cells"
+FILTERED_OUTPUT_FORMATS = (
+    FILTERED_OUTPUT_COLUMNAR,
+    FILTERED_OUTPUT_MARKDOWN,
+    FILTERED_OUTPUT_CSV,
+    FILTERED_OUTPUT_CELLS,
+)
+FILTERED_OUTPUT_PAGE_SIZE = 200
+# Default budgets of table text returned by the tools; rows beyond them are
+# left out and reported.
+TABLE_OUTPUT_MAX_ROWS = 500
+TABLE_OUTPUT_MAX_CHARS = 40_000
+
+# Microsoft Graph rejects request bodies above 4 MB; stay well below it.
+MAX_ROWS_PAYLOAD_BYTES = 1_000_000
+MAX_ROWS_PER_REQUEST = 1_000
+# Write-behind thresholds of the per-workbook cell write queues.
+WRITE_QUEUE_MAX_PENDING_CELLS = 200
+WRITE_QUEUE_FLUSH_DELAY_SECONDS = 0.5
+# Workbook session IDs of the bulk writes active in the current context,
+# keyed by (drive_id, file_id). Scoped to the caller's task, so concurrent
+# conversations sharing a toolkit never join each other's sessions.
+_bulk_write_session_ids: ContextVar[Dict[tuple, str]] = ContextVar(
+    "bulk_write_session_ids", default={}
+)
+# Status codes Graph uses to signal throttling or transient unavailability.
+RETRYABLE_STATUS_CODES = (429, 503, 504)
+# A 503 or 504 can come back after Graph applied a POST, such as a row
+# append, so POSTs are only retried when throttled.
+NON_IDEMPOTENT_RETRYABLE_STATUS_CODES = (429,)
+
+
+def _chunk_rows_by_payload_size(
+    rows_values: List[List[Any]],
+    max_payload_bytes: int = MAX_ROWS_PAYLOAD_BYTES,
+    max_rows_per_chunk: int = MAX_ROWS_PER_REQUEST,
+):
+    """
+    Split rows into chunks whose JSON payload stays below a size bound.
+
+    Args:
+        rows_values (List[List[Any]]): The rows to split.
+        max_payload_bytes (int): Upper bound of the serialized size of a chunk.
+        max_rows_per_chunk (int): Upper bound of the number of rows in a chunk.
+
+    Returns:
+        List[List[List[Any]]]: The chunks, in the original row order.
+    """
+    chunks = []
+    current_chunk = []
+    current_size = 0
+    for row in rows_values:
+        # +1 accounts for the comma separating the rows in the array.
+        row_size = len(json.dumps(row, default=str).encode("utf-8")) + 1
+        if current_chunk and (
+            current_size + row_size > max_payload_bytes
+            or len(current_chunk) >= max_rows_per_chunk
+        ):
+            chunks.append(current_chunk)
+            current_chunk = []
+            current_size = 0
+        current_chunk.append(row)
+        current_size += row_size
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+async def _await_cell_writes(cell_futures: list):
+    """
+    Wait for queued cell writes and raise the first error, if any.
+
+    Every future is awaited, so the errors of the others are retrieved too.
+    """
+    results = await asyncio.gather(*cell_futures, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def _split_cell_address(address: str):
+    """
+    Split a cell address such as 'Sheet1!B12' into its column and row.
+
+    Args:
+        address (str): The cell address, with or without worksheet prefix.
+
+    Returns:
+        tuple: The column letters and the row number.
+    """
+    cell = address.rsplit("!", 1)[-1]
+    match = CELL_ADDRESS_PATTERN.match(cell)
+    if match is None:
+        raise ValueError(f"Unsupported cell address '{address}'.")
+    return match.group(1).upper(), int(match.group(2))
+
+
+def _format_visible_view(
+    row_addresses: List[List[str]],
+    row_values: List[List[Any]],
+    output_format: str = FILTERED_OUTPUT_COLUMNAR,
+    offset: int = 0,
+    limit: int = FILTERED_OUTPUT_PAGE_SIZE,
+    max_chars: int = None,
+):
+    """
+    Format the visible view of a table, header row included.
+
+    Args:
+        row_addresses (List[List[str]]): Cell addresses, one list per row.
+        row_values (List[List[Any]]): Cell values, one list per row.
+        output_format (str): 'columnar', 'markdown', 'csv' or 'cells'.
+        offset (int): Number of visible data rows to skip.
+        limit (int): Maximum number of data rows to return.
+        max_chars (int, optional): Maximum number of characters of the
+        'markdown' and 'csv' tables; the page ends at the last row that
+        fits, and `next_offset` continues from there.
+
+    Returns:
+        str: The formatted view.
+    """
+    if output_format not in FILTERED_OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format '{output_format}', expected one of "
+            f"{FILTERED_OUTPUT_FORMATS}."
+        )
+    general_range = f"{row_addresses[0][0]}:{row_addresses[-1][-1]}"
+
+    if output_format == FILTERED_OUTPUT_CELLS:
+        # Map cell addresses to their corresponding values
+        cell_data = {}
+        for addresses, values in zip(row_addresses, row_values):
+            for address, value in zip(addresses, values):
+                cell_data[address] = value
+        response_dict = {"range": general_range, "cell_data": cell_data}
+        return json.dumps(response_dict, indent=4)
+
+    header = row_values[0]
+    column_letters = [_split_cell_address(each)[0] for each in row_addresses[0]]
+    total_rows = len(row_values) - 1
+    page_values = row_values[1:][offset : offset + limit]
+    page_addresses = row_addresses[1:][offset : offset + limit]
+    # Filtered views skip hidden rows, so each row carries its sheet row number.
+    row_numbers = [_split_cell_address(each[0])[1] for each in page_addresses]
+    next_offset = offset + len(page_values)
+    has_more = next_offset < total_rows
+
+    if output_format == FILTERED_OUTPUT_COLUMNAR:
+        response_dict = {
+            "range": general_range,
+            "header": header,
+            "columns": column_letters,
+            "row_numbers": row_numbers,
+            "rows": page_values,
+            "total_rows": total_rows,
+            "offset": offset,
+        }
+        if has_more:
+            response_dict["next_offset"] = next_offset
+        return json.dumps(response_dict, separators=(",", ":"), default=str)
+
+    lines, rendered_rows = render_table_rows(
+        header=["row", *header],
+        columns=[row_numbers]
+        + [[values[position] for values in page_values] for position in range(len(header))],
+        table_format="csv" if output_format == FILTERED_OUTPUT_CSV else "markdown",
+        max_chars=max_chars,
+    )
+    next_offset = offset + rendered_rows
+    has_more = next_offset < total_rows
+
+    summary = (
+        f"range: {general_range}; columns: {','.join(column_letters)}; "
+        f"rows {offset + 1}-{next_offset} of {total_rows}"
+    )
+    if has_more:
+        summary += f"; next_offset: {next_offset}"
+    return summary + "\n" + "\n".join(lines)
 
 
 class MSSiteWorkbookToolKit(MSSiteToolKit):
-    def __init__(self, credentials):
+    def __init__(
+        self,
+        credentials,
+        read_backend: str = READ_BACKEND_GRAPH,
+        max_output_rows: int = TABLE_OUTPUT_MAX_ROWS,
+        max_output_chars: int = TABLE_OUTPUT_MAX_CHARS,
+    ):
+        """
+        Initialize the MSSiteWorkbookToolKit.
+
+        Args:
+            credentials: The credentials required to authenticate with
+            the Microsoft Graph API.
+            read_backend (str): Default backend of the read methods. 'graph'
+            queries the Excel REST API; 'local' downloads the workbook once
+            and parses it locally, see `alist_worksheets_in_workbook`.
+            max_output_rows (int): Maximum number of rows of the tables
+            returned as text; None for no limit.
+            max_output_chars (int): Maximum number of characters of the
+            tables returned as text; None for no limit.
+        """
+        if read_backend not in READ_BACKENDS:
+            raise ValueError(
+                f"Unknown read backend '{read_backend}', expected one of {READ_BACKENDS}."
+            )
         self.credentials = credentials
         super().__init__(credentials)
         self.schema_mappings = schema_mappings
+        self.read_backend = read_backend
+        self.max_output_rows = max_output_rows
+        self.max_output_chars = max_output_chars
+        # Local copies of workbooks, keyed by (drive_id, file_id), as
+        # (cTag, LocalWorkbook).
+        self._local_workbooks = {}
+        # Number of readers of each local copy path, and replaced copies to
+        # delete once their last reader is done.
+        self._local_workbook_readers = {}
+        self._retired_local_workbook_paths = set()
+        # Private directory of the local copies, created on first download and
+        # removed by `close`, or when the toolkit is garbage collected or the
+        # interpreter exits.
+        self._local_workbook_directory = None
+        self._local_workbook_directory_finalizer = None
+        # Hash indexes of table snapshots, keyed by
+        # (drive_id, file_id, table_id, key_columns).
+        self._table_indexes = {}
+        # Serialized cell write queues, keyed by (drive_id, file_id,
+        # session_id): cells queued inside a bulk write are only ever flushed
+        # in its workbook session, and other cells never are.
+        self._write_queues = {}
+
+    def close(self):
+        """
+        Delete the local workbook copies and their directory.
+
+        The copies are downloaded again when a 'local' read needs them.
+        """
+        if self._local_workbook_directory_finalizer is not None:
+            self._local_workbook_directory_finalizer()
+        self._local_workbook_directory = None
+        self._local_workbook_directory_finalizer = None
+        self._local_workbooks.clear()
+        self._retired_local_workbook_paths.clear()
 
     async def alist_files_and_folders_in_path(
         self, site_display_name: str, folder_path: str
@@ -66,14 +336,20 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         return item_names
 
     async def alist_worksheets_in_workbook(
-        self, site_display_name: str, file_path: str
+        self, site_display_name: str, file_path: str, read_backend: str = None
     ):
         """
         List all worksheets in a workbook.
 
+        With the 'local' read backend the workbook is downloaded once, kept
+        as a local copy until its cTag changes, and parsed locally instead of
+        being queried through the Excel REST API.
+
         Args:
             site_display_name (str): The display name of the SharePoint site.
             file_path (str): The path to the file within the site.
+            read_backend (str): 'graph' or 'local'. Defaults to the toolkit's
+            read backend.
 
         Returns:
             worksheet names: A list of worksheets names.
@@ -88,6 +364,12 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         if not file_id:
             raise ValueError(f"File '{file_path}' not found in drive.")
 
+        if self._resolve_read_backend(read_backend) == READ_BACKEND_LOCAL:
+            async with self._aopen_local_workbook(
+                drive_id=drive_id, file_id=file_id
+            ) as local_workbook:
+                return list(local_workbook.worksheet_names)
+
         worksheets = (
             await self.ms_graph_client.drives.by_drive_id(drive_id)
             .items.by_drive_item_id(file_id)
@@ -97,7 +379,11 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         return worksheet_names
 
     async def alist_tables_in_worksheet(
-        self, site_display_name: str, file_path: str, worksheet_name: str
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        read_backend: str = None,
     ):
         """
         List all tables in a specified worksheet.
@@ -106,6 +392,8 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
             site_display_name (str): The display name of the SharePoint site.
             file_path (str): The path to the file within the site.
             worksheet_name (str): The name of the worksheet.
+            read_backend (str): 'graph' or 'local'. Defaults to the toolkit's
+            read backend.
 
         Returns:
             List[WorkbookTable]: A list of tables in the worksheet.
@@ -120,6 +408,12 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         if not file_id:
             raise ValueError(f"File '{file_path}' not found in drive.")
 
+        if self._resolve_read_backend(read_backend) == READ_BACKEND_LOCAL:
+            async with self._aopen_local_workbook(
+                drive_id=drive_id, file_id=file_id
+            ) as local_workbook:
+                return local_workbook.list_tables(worksheet_name)
+
         # Get the worksheet
         worksheets = (
             await self.ms_graph_client.drives.by_drive_id(drive_id)
@@ -149,6 +443,7 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         file_path: str,
         worksheet_name: str,
         table_name: str,
+        read_backend: str = None,
     ):
         """
         Get the content of a table by its name in a specified worksheet.
@@ -158,6 +453,8 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
             file_path (str): The path to the file within the site.
             worksheet_name (str): The name of the worksheet.
             table_name (str): The name of the table.
+            read_backend (str): 'graph' or 'local'. Defaults to the toolkit's
+            read backend.
 
         Returns:
             List[List[Any]]: The values in the table.
@@ -172,6 +469,23 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         if not file_id:
             raise ValueError(f"File '{file_path}' not found in drive.")
 
+        if self._resolve_read_backend(read_backend) == READ_BACKEND_LOCAL:
+            async with self._aopen_local_workbook(
+                drive_id=drive_id, file_id=file_id
+            ) as local_workbook:
+                header, rows = await asyncio.to_thread(
+                    local_workbook.read_table, worksheet_name, table_name
+                )
+            table_dict = {
+                column_name: [row[position] for row in rows]
+                for position, column_name in enumerate(header)
+            }
+            return dataframe_to_markdown(
+                pd.DataFrame(table_dict),
+                max_rows=self.max_output_rows,
+                max_chars=self.max_output_chars,
+            )
+
         # Get the worksheet
         worksheets = (
             await self.ms_graph_client.drives.by_drive_id(drive_id)
@@ -216,7 +530,11 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         for each in table_content:
             table_dict[each.additional_data['values'][0][0]]=[each[0] for each in each.additional_data['values'][1:]]
         table_dataframe = pd.DataFrame(table_dict)
-        table_markdown = dataframe_to_markdown(table_dataframe)
+        table_markdown = dataframe_to_markdown(
+            table_dataframe,
+            max_rows=self.max_output_rows,
+            max_chars=self.max_output_chars,
+        )
         return table_markdown
 
     async def aget_table_row_by_index(
@@ -293,6 +611,55 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         row_table_by_index = row.additional_data["values"][0]
         return row_table_by_index
 
+    async def alookup_table_rows_by_key(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+        key_columns: List[str],
+        key_values: List[Any],
+    ):
+        """
+        Find the rows of a table whose key columns match the given values.
+
+        The lookup is served from an in-memory hash index built on the key
+        columns. The index is rebuilt from a fresh table snapshot only when
+        the workbook's eTag has changed since it was built.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+            key_columns (List[str]): The names of the columns to match on.
+            key_values (List[Any]): One value per key column.
+
+        Returns:
+            str: A JSON list with the zero-based `row_index` and the `values`
+            of every matching row.
+        """
+        drive_id, file_id, _, table_id = await self._aget_table_ids(
+            site_display_name=site_display_name,
+            file_path=file_path,
+            worksheet_name=worksheet_name,
+            table_name=table_name,
+        )
+        index_key = (drive_id, file_id, table_id, tuple(key_columns))
+        e_tag = await self._aget_file_e_tag(drive_id=drive_id, file_id=file_id)
+        table_index = self._table_indexes.get(index_key)
+        if table_index is None or e_tag is None or table_index.e_tag != e_tag:
+            header, rows = await self._aget_table_snapshot(
+                drive_id=drive_id, file_id=file_id, table_id=table_id
+            )
+            table_index = TableHashIndex(
+                e_tag=e_tag, header=header, rows=rows, key_columns=key_columns
+            )
+            self._table_indexes[index_key] = table_index
+
+        matching_rows = table_index.lookup(key_values)
+        return json.dumps(matching_rows, default=str)
+
     async def aapply_filter_to_table(
         self,
         site_display_name: str,
@@ -301,6 +668,9 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         table_name: str,
         column_name: str,
         criteria: dict,
+        output_format: str = FILTERED_OUTPUT_COLUMNAR,
+        offset: int = 0,
+        limit: int = FILTERED_OUTPUT_PAGE_SIZE,
     ):
         """
         Apply a filter to a table column.
@@ -312,6 +682,10 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
             table_name (str): The name of the table.
             column_name (str): The name of the column to filter.
             criteria (dict): The filter criteria as a dictionary.
+            output_format (str): Format of the filtered data, see
+            `aget_filtered_table_data`.
+            offset (int): Number of visible data rows to skip.
+            limit (int): Maximum number of data rows to return.
 
         Examples:
             Filtering by a single value:
@@ -432,7 +806,10 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
             site_display_name=site_display_name,
             file_path=file_path,
             worksheet_name=worksheet_name,
-            table_name=table_name)
+            table_name=table_name,
+            output_format=output_format,
+            offset=offset,
+            limit=limit)
         #clean filters
         await self.ms_graph_client.drives.by_drive_id(
             drive_id).items.by_drive_item_id(
@@ -447,18 +824,29 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         file_path: str,
         worksheet_name: str,
         table_name: str,
+        output_format: str = FILTERED_OUTPUT_COLUMNAR,
+        offset: int = 0,
+        limit: int = FILTERED_OUTPUT_PAGE_SIZE,
     ):
         """
         Get the data of the table's visible range after applying a filter.
 
+        The 'columnar' format returns the range, the header, the column
+        letters, the sheet row number of each visible row and the rows as
+        arrays. 'markdown' and 'csv' return the same page as a text block.
+        'cells' maps every cell address to its value and ignores paging.
+
         Args:
             site_display_name (str): The display name of the SharePoint site.
             file_path (str): The path to the file within the site.
             worksheet_name (str): The name of the worksheet.
             table_name (str): The name of the table.
+            output_format (str): 'columnar', 'markdown', 'csv' or 'cells'.
+            offset (int): Number of visible data rows to skip.
+            limit (int): Maximum number of data rows to return.
 
         Returns:
-            Dict: A dictionary containing the filtered data and the range.
+            str: The filtered data in the requested format.
         """
         # Get IDs as before
         site_id = await self.get_site_id(display_name=site_display_name)
@@ -510,22 +898,14 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         ]
         filtered_view_row_values = rows_in_table_view.additional_data["values"]
 
-        # Map cell addresses to their corresponding values
-        cell_data = {}
-        for row_addresses, row_values in zip(
-            filtered_view_row_addresses, filtered_view_row_values
-        ):
-            for address, value in zip(row_addresses, row_values):
-                cell_data[address] = value
-
-        # Determine the general range of the response table (e.g., 'A1:R4')
-        start_cell = filtered_view_row_addresses[0][0]
-        end_cell = filtered_view_row_addresses[-1][-1]
-        general_range = f"{start_cell}:{end_cell}"
-        response_dict = {"range": general_range, "cell_data": cell_data}
-        # Convert the dictionary to a JSON string
-        response_string = json.dumps(response_dict, indent=4)
-
+        response_string = _format_visible_view(
+            row_addresses=filtered_view_row_addresses,
+            row_values=filtered_view_row_values,
+            output_format=output_format,
+            offset=offset,
+            limit=limit,
+            max_chars=self.max_output_chars,
+        )
         return response_string
 
     async def aupdate_cells_values(
@@ -538,6 +918,10 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         """
         Update the values of multiple specific cells.
 
+        The updates go through the workbook's write queue, so they are
+        serialized with concurrent writes to the same workbook and adjacent
+        cells are written as ranges.
+
         Args:
             site_display_name (str): The display name of the SharePoint site.
             file_path (str): The path to the file within the site.
@@ -547,58 +931,89 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
         Returns:
             None
         """
-        import aiohttp
+        drive_id, file_id = await self._aget_file_ids(
+            site_display_name=site_display_name, file_path=file_path
+        )
+        worksheet_id = await self._aget_worksheet_id(
+            drive_id=drive_id, file_id=file_id, worksheet_name=worksheet_name
+        )
 
-        # Get IDs as before
-        site_id = await self.get_site_id(display_name=site_display_name)
-        drive_id = await self.get_drive_id(site_id=site_id)
-        file_id = await self.get_file_id_by_path(drive_id=drive_id, file_path=file_path)
+        write_queue = self._get_write_queue(drive_id=drive_id, file_id=file_id)
+        cell_futures = [
+            write_queue.enqueue(
+                worksheet_id, cell_update["cell_address"], cell_update["cell_value"]
+            )
+            for cell_update in cells_to_update
+        ]
+        await write_queue.acommit()
+        await _await_cell_writes(cell_futures)
+        return "Cells were successfully updated"
 
-        # Get worksheet ID
-        worksheets = (
-            await self.ms_graph_client.drives.by_drive_id(drive_id)
-            .items.by_drive_item_id(file_id)
-            .workbook.worksheets.get()
-        )
+    async def aenqueue_cells_values(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        cells_to_update: List[Dict[str, Any]],
+    ):
+        """
+        Queue cell updates for a write-behind flush.
 
-        worksheet_id = None
-        for ws in worksheets.value:
-            if ws.name == worksheet_name:
-                worksheet_id = ws.id
-                break
-        if not worksheet_id:
-            raise ValueError(f"Worksheet '{worksheet_name}' not found in workbook.")
+        The updates are buffered in the workbook's write queue and merged
+        with other pending updates. The queue is flushed when enough cells
+        are pending, after a short delay, or on `acommit_workbook_writes`.
 
-        # Prepare headers for API requests
-        access_token = self.credentials.get_token(*self.required_scopes_as_user)
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Content-Type": "application/json",
-        }
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            cells_to_update (List[Dict[str, Any]]): A list of dictionaries with 'cell_address' and 'cell_value'.
 
-        # Update each cell individually
-        async with aiohttp.ClientSession() as session:
-            for cell_update in cells_to_update:
-                cell_address = cell_update["cell_address"]
-                new_value = cell_update["cell_value"]
+        Returns:
+            asyncio.Future: Resolves once all the updates have been written,
+            or raises the first error that made one of them fail.
+        """
+        drive_id, file_id = await self._aget_file_ids(
+            site_display_name=site_display_name, file_path=file_path
+        )
+        worksheet_id = await self._aget_worksheet_id(
+            drive_id=drive_id, file_id=file_id, worksheet_name=worksheet_name
+        )
+        write_queue = self._get_write_queue(drive_id=drive_id, file_id=file_id)
+        return asyncio.ensure_future(
+            _await_cell_writes(
+                [
+                    write_queue.enqueue(
+                        worksheet_id, cell_update["cell_address"], cell_update["cell_value"]
+                    )
+                    for cell_update in cells_to_update
+                ]
+            )
+        )
 
-                url = (
-                    f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/"
-                    f"workbook/worksheets/{worksheet_id}/range(address='{cell_address}')"
-                )
+    async def acommit_workbook_writes(self, site_display_name: str, file_path: str):
+        """
+        Flush the pending cell updates of a workbook.
 
-                payload = {"values": [[new_value]]}
+        Inside `abulk_write` the updates queued in its session are flushed,
+        otherwise those queued outside any bulk write.
 
-                # Send the PATCH request to update the cell value
-                async with session.patch(
-                    url, headers=headers, json=payload
-                ) as response:
-                    if response.status not in (200, 204):
-                        text = await response.text()
-                        raise Exception(
-                            f"Failed to update cell {cell_address}: {response.status}, {text}"
-                        )
-        return "Cells were successfully updated"
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+
+        Returns:
+            str: Confirmation message.
+        """
+        drive_id, file_id = await self._aget_file_ids(
+            site_display_name=site_display_name, file_path=file_path
+        )
+        write_queue = self._write_queues.get(
+            (drive_id, file_id, self._get_bulk_write_session_id(drive_id, file_id))
+        )
+        if write_queue is not None:
+            await write_queue.acommit()
+        return "Pending writes were committed"
 
     async def aadd_row_to_table(
         self,
@@ -665,6 +1080,8 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
             "Authorization": f"Bearer {access_token.token}",
             "Content-Type": "application/json",
         }
+        # Join the workbook session of an active bulk write, if any
+        headers.update(self._get_bulk_write_session_headers(drive_id, file_id))
 
         url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/workbook/tables/{table_id}/rows"
 
@@ -679,3 +1096,866 @@ class MSSiteWorkbookToolKit(MSSiteToolKit):
                     )
         return 'the row has been successfully added'
 
+    async def aadd_rows_to_table(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+        rows_values: List[List[Any]],
+        max_payload_bytes: int = MAX_ROWS_PAYLOAD_BYTES,
+        max_rows_per_chunk: int = MAX_ROWS_PER_REQUEST,
+        manual_calculation: bool = False,
+    ):
+        """
+        Add many rows to a table.
+
+        The IDs are resolved once, the rows are split into chunks bounded by
+        request size, and all chunks are sent over a single workbook session.
+        Throttled requests are retried after the delay advertised by Graph.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+            rows_values (List[List[Any]]): The rows to add, one list of values per row.
+            max_payload_bytes (int): Upper bound of the request body size per chunk.
+            max_rows_per_chunk (int): Upper bound of the number of rows per chunk.
+            manual_calculation (bool): Whether to switch the workbook to manual
+            calculation while the rows are written, see `abulk_write`.
+
+        Returns:
+            str: Confirmation message with the number of rows written.
+        """
+        if not rows_values:
+            return "0 rows have been added"
+
+        drive_id, file_id, _, table_id = await self._aget_table_ids(
+            site_display_name=site_display_name,
+            file_path=file_path,
+            worksheet_name=worksheet_name,
+            table_name=table_name,
+        )
+        if manual_calculation:
+            async with self._abulk_write_by_ids(drive_id=drive_id, file_id=file_id):
+                rows_written = await self._aappend_rows(
+                    drive_id=drive_id,
+                    file_id=file_id,
+                    table_id=table_id,
+                    rows_values=rows_values,
+                    max_payload_bytes=max_payload_bytes,
+                    max_rows_per_chunk=max_rows_per_chunk,
+                )
+        else:
+            rows_written = await self._aappend_rows(
+                drive_id=drive_id,
+                file_id=file_id,
+                table_id=table_id,
+                rows_values=rows_values,
+                max_payload_bytes=max_payload_bytes,
+                max_rows_per_chunk=max_rows_per_chunk,
+            )
+        return f"{rows_written} rows have been successfully added"
+
+    async def aget_table_as_arrow(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+        read_backend: str = None,
+    ):
+        """
+        Get a snapshot of a table as an Arrow table.
+
+        The type of each column is inferred from its values, and empty cells
+        become nulls. Arrow tables can be handed to pandas, polars or DuckDB
+        without copying their buffers. Not exposed as an agent tool.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+            read_backend (str): 'graph' or 'local'. Defaults to the toolkit's
+            read backend.
+
+        Returns:
+            pyarrow.Table: The table snapshot.
+        """
+        header, rows = await self._aread_table(
+            site_display_name=site_display_name,
+            file_path=file_path,
+            worksheet_name=worksheet_name,
+            table_name=table_name,
+            read_backend=read_backend,
+        )
+        return await asyncio.to_thread(table_snapshot_to_arrow, header, rows)
+
+    async def aexport_table_to_parquet(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+        destination_path: str,
+        read_backend: str = None,
+    ):
+        """
+        Write a snapshot of a table to a Parquet file.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+            destination_path (str): The local path of the Parquet file.
+            read_backend (str): 'graph' or 'local'. Defaults to the toolkit's
+            read backend.
+
+        Returns:
+            str: The path of the written file.
+        """
+        arrow_table = await self.aget_table_as_arrow(
+            site_display_name=site_display_name,
+            file_path=file_path,
+            worksheet_name=worksheet_name,
+            table_name=table_name,
+            read_backend=read_backend,
+        )
+        _import_pyarrow()
+        import pyarrow.parquet
+
+        await asyncio.to_thread(pyarrow.parquet.write_table, arrow_table, destination_path)
+        return destination_path
+
+    async def aexport_table_to_arrow_ipc(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+        destination_path: str,
+        read_backend: str = None,
+    ):
+        """
+        Write a snapshot of a table to an Arrow IPC (Feather v2) file.
+
+        Other processes can memory-map the file with
+        `pyarrow.ipc.open_file(pyarrow.memory_map(path))` and share its
+        buffers without copying them.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+            destination_path (str): The local path of the Arrow file.
+            read_backend (str): 'graph' or 'local'. Defaults to the toolkit's
+            read backend.
+
+        Returns:
+            str: The path of the written file.
+        """
+        arrow_table = await self.aget_table_as_arrow(
+            site_display_name=site_display_name,
+            file_path=file_path,
+            worksheet_name=worksheet_name,
+            table_name=table_name,
+            read_backend=read_backend,
+        )
+        pyarrow = _import_pyarrow()
+
+        def write_ipc_file():
+            with pyarrow.OSFile(destination_path, "wb") as sink:
+                with pyarrow.ipc.new_file(sink, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+
+        await asyncio.to_thread(write_ipc_file)
+        return destination_path
+
+    @asynccontextmanager
+    async def abulk_write(self, site_display_name: str, file_path: str):
+        """
+        Context for bulk writes to a workbook with recalculation deferred.
+
+        On entry the workbook's calculation mode is switched to manual inside
+        a persistent workbook session. Writes made through
+        `aupdate_cells_values`, `aadd_row_to_table` and `aadd_rows_to_table`
+        by the calling task, or tasks it starts, while the context is active
+        join that session; other callers of the toolkit are not affected.
+        Cell writes queued in the session are committed before the context
+        exits; cells queued by other callers are left to their own flushes.
+        On a successful exit one full recalculation is triggered. The original
+        calculation mode is then restored, even if a write failed, and the
+        session is closed.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+
+        Example:
+            async with tool_kit.abulk_write("Recall Space GmbH", "/ERP.xlsx"):
+                await tool_kit.aupdate_cells_values(...)
+                await tool_kit.aadd_rows_to_table(...)
+        """
+        drive_id, file_id = await self._aget_file_ids(
+            site_display_name=site_display_name, file_path=file_path
+        )
+        async with self._abulk_write_by_ids(drive_id=drive_id, file_id=file_id):
+            yield
+
+    async def _aappend_rows(
+        self,
+        drive_id: str,
+        file_id: str,
+        table_id: str,
+        rows_values: List[List[Any]],
+        max_payload_bytes: int,
+        max_rows_per_chunk: int,
+    ):
+        """
+        Helper method to append rows to a table in size-bounded chunks.
+
+        The chunks are sent over the session of an active bulk write, or over
+        a workbook session opened and closed for this call.
+
+        Returns:
+            int: The number of rows written.
+        """
+        import aiohttp
+
+        headers = self._get_request_headers()
+        url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/workbook/tables/{table_id}/rows"
+
+        rows_written = 0
+        async with aiohttp.ClientSession() as session:
+            bulk_write_headers = self._get_bulk_write_session_headers(drive_id, file_id)
+            if bulk_write_headers:
+                session_headers = {**headers, **bulk_write_headers}
+            else:
+                session_headers = await self._acreate_workbook_session(
+                    session=session, drive_id=drive_id, file_id=file_id, headers=headers
+                )
+            try:
+                for chunk in _chunk_rows_by_payload_size(
+                    rows_values,
+                    max_payload_bytes=max_payload_bytes,
+                    max_rows_per_chunk=max_rows_per_chunk,
+                ):
+                    status, text = await self._arequest_with_retry(
+                        session=session,
+                        method="POST",
+                        url=url,
+                        headers=session_headers,
+                        payload={"values": chunk},
+                    )
+                    if status not in (200, 201, 204):
+                        raise Exception(
+                            f"Failed to add rows to table after {rows_written} rows "
+                            f"were written: {status}, {text}"
+                        )
+                    rows_written += len(chunk)
+            finally:
+                if not bulk_write_headers:
+                    await self._aclose_workbook_session(
+                        session=session,
+                        drive_id=drive_id,
+                        file_id=file_id,
+                        headers=session_headers,
+                    )
+        return rows_written
+
+    @asynccontextmanager
+    async def _abulk_write_by_ids(self, drive_id: str, file_id: str):
+        """
+        Helper context manager behind `abulk_write`, working on resolved IDs.
+
+        Nested bulk writes on the same file in the same context reuse the
+        outer context.
+        """
+        import aiohttp
+
+        active_session_ids = _bulk_write_session_ids.get()
+        if (drive_id, file_id) in active_session_ids:
+            yield
+            return
+
+        workbook_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/workbook"
+        headers = self._get_request_headers()
+        async with aiohttp.ClientSession() as session:
+            session_headers = await self._acreate_workbook_session(
+                session=session, drive_id=drive_id, file_id=file_id, headers=headers
+            )
+            original_calculation_mode = None
+            try:
+                status, text = await self._arequest_with_retry(
+                    session=session,
+                    method="GET",
+                    url=f"{workbook_url}/application",
+                    headers=session_headers,
+                )
+                if status == 200:
+                    original_calculation_mode = json.loads(text).get("calculationMode")
+                if original_calculation_mode and original_calculation_mode != "Manual":
+                    status, text = await self._arequest_with_retry(
+                        session=session,
+                        method="PATCH",
+                        url=f"{workbook_url}/application",
+                        headers=session_headers,
+                        payload={"calculationMode": "Manual"},
+                    )
+                    if status not in (200, 204):
+                        logger.warning(
+                            "Could not switch workbook to manual calculation: %s, %s",
+                            status,
+                            text,
+                        )
+                        original_calculation_mode = None
+
+                token = _bulk_write_session_ids.set(
+                    {
+                        **active_session_ids,
+                        (drive_id, file_id): session_headers["workbook-session-id"],
+                    }
+                )
+                try:
+                    yield
+                finally:
+                    _bulk_write_session_ids.reset(token)
+                    # Flush the cells queued in this session, and only those,
+                    # while the session is still open and calculation manual
+                    write_queue = self._write_queues.pop(
+                        (drive_id, file_id, session_headers["workbook-session-id"]), None
+                    )
+                    if write_queue is not None:
+                        await write_queue.acommit()
+
+                status, text = await self._arequest_with_retry(
+                    session=session,
+                    method="POST",
+                    url=f"{workbook_url}/application/calculate",
+                    headers=session_headers,
+                    payload={"calculationType": "Full"},
+                )
+                if status not in (200, 204):
+                    raise Exception(f"Failed to recalculate workbook: {status}, {text}")
+            finally:
+                if original_calculation_mode and original_calculation_mode != "Manual":
+                    await self._arequest_with_retry(
+                        session=session,
+                        method="PATCH",
+                        url=f"{workbook_url}/application",
+                        headers=session_headers,
+                        payload={"calculationMode": original_calculation_mode},
+                    )
+                await self._aclose_workbook_session(
+                    session=session,
+                    drive_id=drive_id,
+                    file_id=file_id,
+                    headers=session_headers,
+                )
+
+    def _get_bulk_write_session_id(self, drive_id: str, file_id: str):
+        """
+        Helper method to get the workbook session ID of a bulk write active
+        in the current context.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+
+        Returns:
+            str: The workbook session ID, or None when no bulk write is active
+            for the file.
+        """
+        return _bulk_write_session_ids.get().get((drive_id, file_id))
+
+    def _get_bulk_write_session_headers(self, drive_id: str, file_id: str):
+        """
+        Helper method to get the headers joining a bulk write active in the
+        current context.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+
+        Returns:
+            dict: The workbook session header, or an empty dict when no bulk
+            write is active for the file.
+        """
+        session_id = self._get_bulk_write_session_id(drive_id, file_id)
+        if session_id is None:
+            return {}
+        return {"workbook-session-id": session_id}
+
+    async def _aget_file_ids(self, site_display_name: str, file_path: str):
+        """
+        Helper method to resolve the drive ID and file ID of a workbook.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+
+        Returns:
+            tuple: The drive ID and file ID.
+        """
+        site_id = await self.get_site_id(display_name=site_display_name)
+        if not site_id:
+            raise ValueError(f"Site '{site_display_name}' not found.")
+        drive_id = await self.get_drive_id(site_id=site_id)
+        if not drive_id:
+            raise ValueError(f"Drive not found for site '{site_display_name}'.")
+        file_id = await self.get_file_id_by_path(drive_id=drive_id, file_path=file_path)
+        if not file_id:
+            raise ValueError(f"File '{file_path}' not found in drive.")
+        return drive_id, file_id
+
+    async def _aget_worksheet_id(
+        self, drive_id: str, file_id: str, worksheet_name: str
+    ):
+        """
+        Helper method to get the ID of a worksheet by its name.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+            worksheet_name (str): The name of the worksheet.
+
+        Returns:
+            str: The worksheet ID.
+        """
+        worksheets = (
+            await self.ms_graph_client.drives.by_drive_id(drive_id)
+            .items.by_drive_item_id(file_id)
+            .workbook.worksheets.get()
+        )
+        for ws in worksheets.value:
+            if ws.name == worksheet_name:
+                return ws.id
+        raise ValueError(f"Worksheet '{worksheet_name}' not found in workbook.")
+
+    def _get_write_queue(self, drive_id: str, file_id: str):
+        """
+        Helper method to get, or create, the cell write queue of a workbook
+        for the bulk write active in the current context, if any.
+
+        The session is bound to the queue when it is created, so its cells
+        are flushed in that session whichever task triggers the flush.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+
+        Returns:
+            WorkbookWriteQueue: The write queue of the workbook and session.
+        """
+        session_id = self._get_bulk_write_session_id(drive_id, file_id)
+        write_queue = self._write_queues.get((drive_id, file_id, session_id))
+        if write_queue is None:
+
+            async def write_ranges(range_writes):
+                return await self._awrite_ranges(
+                    drive_id=drive_id,
+                    file_id=file_id,
+                    range_writes=range_writes,
+                    session_id=session_id,
+                )
+
+            write_queue = WorkbookWriteQueue(
+                write_ranges=write_ranges,
+                max_pending_cells=WRITE_QUEUE_MAX_PENDING_CELLS,
+                flush_delay=WRITE_QUEUE_FLUSH_DELAY_SECONDS,
+            )
+            self._write_queues[(drive_id, file_id, session_id)] = write_queue
+        return write_queue
+
+    async def _awrite_ranges(
+        self, drive_id: str, file_id: str, range_writes, session_id: str = None
+    ):
+        """
+        Helper method to write a batch of ranges of a workbook.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+            range_writes (list): `(worksheet_id, address, values)` tuples.
+            session_id (str, optional): The workbook session to write in.
+
+        Returns:
+            list: One exception, or None on success, per range write.
+        """
+        import aiohttp
+
+        headers = self._get_request_headers()
+        if session_id is not None:
+            headers["workbook-session-id"] = session_id
+
+        errors = []
+        async with aiohttp.ClientSession() as session:
+            for worksheet_id, address, values in range_writes:
+                url = (
+                    f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/"
+                    f"workbook/worksheets/{worksheet_id}/range(address='{address}')"
+                )
+                status, text = await self._arequest_with_retry(
+                    session=session,
+                    method="PATCH",
+                    url=url,
+                    headers=headers,
+                    payload={"values": values},
+                )
+                if status in (200, 204):
+                    errors.append(None)
+                else:
+                    errors.append(
+                        Exception(f"Failed to update cells {address}: {status}, {text}")
+                    )
+        return errors
+
+    async def _aget_table_ids(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+    ):
+        """
+        Helper method to resolve the IDs needed to address a table.
+
+        Args:
+            site_display_name (str): The display name of the SharePoint site.
+            file_path (str): The path to the file within the site.
+            worksheet_name (str): The name of the worksheet.
+            table_name (str): The name of the table.
+
+        Returns:
+            tuple: The drive ID, file ID, worksheet ID and table ID.
+        """
+        drive_id, file_id = await self._aget_file_ids(
+            site_display_name=site_display_name, file_path=file_path
+        )
+        worksheet_id = await self._aget_worksheet_id(
+            drive_id=drive_id, file_id=file_id, worksheet_name=worksheet_name
+        )
+
+        tables = (
+            await self.ms_graph_client.drives.by_drive_id(drive_id)
+            .items.by_drive_item_id(file_id)
+            .workbook.worksheets.by_workbook_worksheet_id(worksheet_id)
+            .tables.get()
+        )
+        table_id = None
+        for table in tables.value:
+            if table.name == table_name:
+                table_id = table.id
+                break
+        if not table_id:
+            raise ValueError(
+                f"Table '{table_name}' not found in worksheet '{worksheet_name}'."
+            )
+        return drive_id, file_id, worksheet_id, table_id
+
+    async def _aread_table(
+        self,
+        site_display_name: str,
+        file_path: str,
+        worksheet_name: str,
+        table_name: str,
+        read_backend: str = None,
+    ):
+        """
+        Helper method to read the header and data rows of a table with the
+        selected read backend.
+
+        Returns:
+            tuple: The list of column names and the list of data rows.
+        """
+        if self._resolve_read_backend(read_backend) == READ_BACKEND_LOCAL:
+            drive_id, file_id = await self._aget_file_ids(
+                site_display_name=site_display_name, file_path=file_path
+            )
+            async with self._aopen_local_workbook(
+                drive_id=drive_id, file_id=file_id
+            ) as local_workbook:
+                return await asyncio.to_thread(
+                    local_workbook.read_table, worksheet_name, table_name
+                )
+
+        drive_id, file_id, _, table_id = await self._aget_table_ids(
+            site_display_name=site_display_name,
+            file_path=file_path,
+            worksheet_name=worksheet_name,
+            table_name=table_name,
+        )
+        return await self._aget_table_snapshot(
+            drive_id=drive_id, file_id=file_id, table_id=table_id
+        )
+
+    async def _aget_file_e_tag(self, drive_id: str, file_id: str):
+        """
+        Helper method to get the current eTag of a workbook file.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+
+        Returns:
+            str or None: The eTag of the file.
+        """
+        drive_item = (
+            await self.ms_graph_client.drives.by_drive_id(drive_id)
+            .items.by_drive_item_id(file_id)
+            .get()
+        )
+        return drive_item.e_tag
+
+    async def _aget_table_snapshot(self, drive_id: str, file_id: str, table_id: str):
+        """
+        Helper method to read the header and the data rows of a table.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+            table_id (str): The ID of the table.
+
+        Returns:
+            tuple: The list of column names and the list of data rows.
+        """
+        table_columns = (
+            await self.ms_graph_client.drives.by_drive_id(drive_id)
+            .items.by_drive_item_id(file_id)
+            .workbook.tables.by_workbook_table_id(table_id)
+            .columns.get()
+        )
+        header = []
+        columns_values = []
+        for each in table_columns.value:
+            column_values = each.additional_data["values"]
+            header.append(column_values[0][0])
+            columns_values.append([cell[0] for cell in column_values[1:]])
+        rows = [list(row) for row in zip(*columns_values)]
+        return header, rows
+
+    def _resolve_read_backend(self, read_backend: str = None):
+        """
+        Helper method to pick the read backend of a call.
+
+        Args:
+            read_backend (str): The backend requested for the call, if any.
+
+        Returns:
+            str: The backend to use.
+        """
+        read_backend = read_backend or self.read_backend
+        if read_backend not in READ_BACKENDS:
+            raise ValueError(
+                f"Unknown read backend '{read_backend}', expected one of {READ_BACKENDS}."
+            )
+        return read_backend
+
+    @asynccontextmanager
+    async def _aopen_local_workbook(self, drive_id: str, file_id: str):
+        """
+        Helper context manager yielding the local copy of a workbook.
+
+        The workbook is downloaded again only when its cTag, which changes
+        with the file content, differs from the one of the local copy. Each
+        version is written to its own file, named after the file ID and
+        cTag, through a temporary file and an atomic rename, so a refresh
+        never touches a copy another thread is reading. A replaced copy is
+        deleted once no reader is inside this context for it anymore. The
+        copies live in a directory created with `tempfile.mkdtemp`, readable
+        only by the current user.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+
+        Yields:
+            LocalWorkbook: The parsed local copy of the workbook.
+        """
+        local_workbook = await self._aget_local_workbook(drive_id, file_id)
+        path = local_workbook.path
+        self._local_workbook_readers[path] = self._local_workbook_readers.get(path, 0) + 1
+        try:
+            yield local_workbook
+        finally:
+            self._local_workbook_readers[path] -= 1
+            if not self._local_workbook_readers[path]:
+                del self._local_workbook_readers[path]
+                if path in self._retired_local_workbook_paths:
+                    self._retired_local_workbook_paths.discard(path)
+                    self._remove_local_workbook_file(path)
+
+    async def _aget_local_workbook(self, drive_id: str, file_id: str):
+        """
+        Helper method to get, or refresh, the local copy of a workbook.
+
+        Readers go through `_aopen_local_workbook`, which keeps the copy on
+        disk while they use it.
+
+        Args:
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+
+        Returns:
+            LocalWorkbook: The parsed local copy of the workbook.
+        """
+        drive_item = (
+            await self.ms_graph_client.drives.by_drive_id(drive_id)
+            .items.by_drive_item_id(file_id)
+            .get()
+        )
+        cached = self._local_workbooks.get((drive_id, file_id))
+        if cached is not None and drive_item.c_tag and cached[0] == drive_item.c_tag:
+            return cached[1]
+
+        file_content = await self.get_file_content(drive_id, file_id)
+        if self._local_workbook_directory is None:
+            self._local_workbook_directory = tempfile.mkdtemp(
+                prefix=LOCAL_WORKBOOK_DIRECTORY_PREFIX
+            )
+            self._local_workbook_directory_finalizer = weakref.finalize(
+                self, shutil.rmtree, self._local_workbook_directory, ignore_errors=True
+            )
+        version = hashlib.sha256(
+            drive_item.c_tag.encode("utf-8") if drive_item.c_tag else file_content
+        ).hexdigest()[:16]
+        local_path = os.path.join(
+            self._local_workbook_directory, f"{file_id}_{version}.xlsx"
+        )
+
+        def write_and_parse():
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=self._local_workbook_directory, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(file_descriptor, "wb") as local_file:
+                    local_file.write(file_content)
+                os.replace(temporary_path, local_path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+            return LocalWorkbook(local_path)
+
+        local_workbook = await asyncio.to_thread(write_and_parse)
+        replaced = self._local_workbooks.get((drive_id, file_id))
+        self._local_workbooks[(drive_id, file_id)] = (drive_item.c_tag, local_workbook)
+        if replaced is not None and replaced[1].path != local_path:
+            if self._local_workbook_readers.get(replaced[1].path):
+                self._retired_local_workbook_paths.add(replaced[1].path)
+            else:
+                self._remove_local_workbook_file(replaced[1].path)
+        return local_workbook
+
+    def _remove_local_workbook_file(self, path: str):
+        """Helper method to delete a replaced local workbook copy."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def _get_request_headers(self):
+        """
+        Helper method to build the headers for raw Graph API requests.
+
+        Returns:
+            dict: The authorization and content type headers.
+        """
+        access_token = self.credentials.get_token(*self.required_scopes_as_user)
+        return {
+            "Authorization": f"Bearer {access_token.token}",
+            "Content-Type": "application/json",
+        }
+
+    async def _arequest_with_retry(
+        self, session, method: str, url: str, headers: dict, payload=None, max_retries=5
+    ):
+        """
+        Helper method to send a request, retrying when Graph throttles it.
+
+        GET and PATCH requests are also retried on 503 and 504; POST requests
+        are not idempotent and are only retried on 429. The delay between
+        attempts honors the `Retry-After` header and falls back to
+        exponential backoff when the header is missing.
+
+        Args:
+            session (aiohttp.ClientSession): The session to send the request with.
+            method (str): The HTTP method.
+            url (str): The request URL.
+            headers (dict): The request headers.
+            payload (Any): The JSON body of the request, if any.
+            max_retries (int): The maximum number of retries.
+
+        Returns:
+            tuple: The status code and the text of the last response.
+        """
+        retryable_status_codes = (
+            NON_IDEMPOTENT_RETRYABLE_STATUS_CODES
+            if method.upper() == "POST"
+            else RETRYABLE_STATUS_CODES
+        )
+        for attempt in range(max_retries + 1):
+            async with session.request(
+                method, url, headers=headers, json=payload
+            ) as response:
+                text = await response.text()
+                if (
+                    response.status not in retryable_status_codes
+                    or attempt == max_retries
+                ):
+                    return response.status, text
+                retry_after = response.headers.get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = 2**attempt
+            await asyncio.sleep(delay)
+
+    async def _acreate_workbook_session(
+        self, session, drive_id: str, file_id: str, headers: dict
+    ):
+        """
+        Helper method to open a persistent workbook session.
+
+        Args:
+            session (aiohttp.ClientSession): The HTTP session to use.
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+            headers (dict): The request headers.
+
+        Returns:
+            dict: A copy of the headers carrying the workbook session ID.
+        """
+        url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/workbook/createSession"
+        status, text = await self._arequest_with_retry(
+            session=session,
+            method="POST",
+            url=url,
+            headers=headers,
+            payload={"persistChanges": True},
+        )
+        if status not in (200, 201):
+            raise Exception(f"Failed to create workbook session: {status}, {text}")
+        session_headers = dict(headers)
+        session_headers["workbook-session-id"] = json.loads(text)["id"]
+        return session_headers
+
+    async def _aclose_workbook_session(
+        self, session, drive_id: str, file_id: str, headers: dict
+    ):
+        """
+        Helper method to close a workbook session.
+
+        Args:
+            session (aiohttp.ClientSession): The HTTP session to use.
+            drive_id (str): The ID of the drive.
+            file_id (str): The ID of the file.
+            headers (dict): The request headers carrying the workbook session ID.
+        """
+        url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/workbook/closeSession"
+        await self._arequest_with_retry(
+            session=session, method="POST", url=url, headers=headers
+        )
@@ -81,6 +81,41 @@ class GetTableRowByIndexSchema(BaseModel):
         """)
     )
 
+class LookupTableRowsByKeySchema(BaseModel):
+    site_display_name: str = Field(
+        ...,
+        description="Display name of the SharePoint site."
+    )
+    file_path: str = Field(
+        ...,
+        description=dedent("""
+            Path to the Excel workbook file within the site's drive.
+            For example: '/Documents/Folder1/workbook.xlsx'.
+        """)
+    )
+    worksheet_name: str = Field(
+        ...,
+        description="Name of the worksheet within the Excel workbook."
+    )
+    table_name: str = Field(
+        ...,
+        description="Name of the table within the worksheet."
+    )
+    key_columns: List[str] = Field(
+        ...,
+        description=dedent("""
+            Names of the table columns to match on.
+            For example: ['PO Number'] or ['Customer ID', 'Year'].
+        """)
+    )
+    key_values: List[Any] = Field(
+        ...,
+        description=dedent("""
+            Values to look up, one per key column and in the same order.
+            For example: ['PO-1001'] or ['C-42', 2024].
+        """)
+    )
+
 class ListFilesAndFoldersSchema(BaseModel):
     site_display_name: str = Field(
         ...,
@@ -153,6 +188,25 @@ class ApplyFilterToTableSchema(BaseModel):
                 }
             """)
     )
+    output_format: str = Field(
+        default="columnar",
+        description=dedent("""
+            Format of the filtered rows:
+            - 'columnar': JSON with the header, the column letters, the sheet row
+              number of each row and the rows as arrays. Cell addresses are
+              column letter + row number (e.g. column 'B' of row 7 is 'B7').
+            - 'markdown' or 'csv': the same rows as a text block.
+            - 'cells': every cell address mapped to its value. Verbose, avoid it.
+            """)
+    )
+    offset: int = Field(
+        default=0,
+        description="Number of filtered rows to skip. Use 'next_offset' of a previous call to get the next page."
+    )
+    limit: int = Field(
+        default=200,
+        description="Maximum number of filtered rows to return."
+    )
 
 
 class UpdateCellsValuesSchema(BaseModel):
@@ -220,6 +274,38 @@ class AddRowToTableSchema(BaseModel):
             """)
     )
 
+class AddRowsToTableSchema(BaseModel):
+    site_display_name: str = Field(
+        ...,
+        description="Display name of the SharePoint site."
+    )
+    file_path: str = Field(
+        ...,
+        description="Path to the file within the site's drive. For example: '/Folder1/file.xlsx'."
+    )
+    worksheet_name: str = Field(
+        ...,
+        description="The name of the worksheet."
+    )
+    table_name: str = Field(
+        ...,
+        description="The name of the table within the worksheet."
+    )
+    rows_values: List[List[Any]] = Field(
+        ...,
+        description=dedent("""\
+            The rows to add to the table, one list of values per row.
+
+            Each row must provide the values corresponding to the columns in the table.
+
+            Example:
+                rows_values = [
+                    ["Value1", "Value2", 123, "Value4"],
+                    ["Value5", "Value6", 456, "Value8"]
+                ]
+            """)
+    )
+
 schema_mappings = {
     "alist_worksheets_in_workbook": {
         "description": dedent("""
@@ -253,6 +339,15 @@ schema_mappings = {
         """),
         "input_schema": GetTableRowByIndexSchema,
     },
+    "alookup_table_rows_by_key": {
+        "description": dedent("""
+            Find the rows of a table in an Excel workbook whose key columns match given values,
+            for example the row of a purchase order number or a customer ID.
+            Returns the matching rows with their zero-based row index, so they can be
+            targeted directly by follow-up updates.
+        """),
+        "input_schema": LookupTableRowsByKeySchema,
+    },
     "alist_files_and_folders_in_path": {
         "description": dedent("""
             List the names of files and folders within a given path inside a SharePoint site's drive.
@@ -278,4 +373,11 @@ schema_mappings = {
             """),
         "input_schema": AddRowToTableSchema,
     },
+    "aadd_rows_to_table": {
+        "description": dedent("""
+            This tool adds many rows with specified values to a table within a workbook in one call.
+            Prefer it over adding rows one at a time.
+            """),
+        "input_schema": AddRowsToTableSchema,
+    },
 }
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+In-memory hash index over the rows of a workbook table snapshot.
+
+The index maps the values of one or more key columns to the zero-based
+data row indices holding them, so a row can be located without scanning
+or re-downloading the whole table. Each index remembers the eTag of the
+workbook it was built from; callers compare it with the current eTag to
+decide whether the index is still valid.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def normalize_key_value(value: Any) -> str:
+    """
+    Normalize a cell value so that equal looking keys hash equally.
+
+    Excel returns numbers as floats (e.g. ``1001.0``) while callers usually
+    pass them as ints or strings, so integral floats are rendered without
+    their decimal part and every value is compared as a stripped string.
+
+    Args:
+        value (Any): The cell or lookup value.
+
+    Returns:
+        str: The normalized key.
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+class TableHashIndex:
+    """
+    Hash index of a table snapshot on a set of key columns.
+
+    Attributes:
+        e_tag (str): eTag of the workbook the snapshot was taken from.
+        header (List[str]): Column names of the table.
+        rows (List[List[Any]]): Data rows of the table, without the header.
+        key_columns (Tuple[str, ...]): Columns the index is built on.
+    """
+
+    def __init__(
+        self,
+        e_tag: Optional[str],
+        header: List[str],
+        rows: List[List[Any]],
+        key_columns: List[str],
+    ):
+        missing_columns = [each for each in key_columns if each not in header]
+        if missing_columns:
+            raise ValueError(
+                f"Key columns {missing_columns} not found in table columns {header}."
+            )
+        self.e_tag = e_tag
+        self.header = header
+        self.rows = rows
+        self.key_columns = tuple(key_columns)
+        self._key_positions = [header.index(each) for each in key_columns]
+        self._index: Dict[Tuple[str, ...], List[int]] = {}
+        for row_index, row in enumerate(rows):
+            key = tuple(
+                normalize_key_value(row[position]) for position in self._key_positions
+            )
+            self._index.setdefault(key, []).append(row_index)
+
+    def lookup(self, key_values: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Find the rows whose key columns match the given values.
+
+        Args:
+            key_values (List[Any]): One value per key column, in the same
+            order as `key_columns`.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per matching row with its
+            zero-based `row_index` and its `values` keyed by column name.
+        """
+        if len(key_values) != len(self.key_columns):
+            raise ValueError(
+                f"Expected {len(self.key_columns)} key values for columns "
+                f"{list(self.key_columns)}, got {len(key_values)}."
+            )
+        key = tuple(normalize_key_value(each) for each in key_values)
+        return [
+            {
+                "row_index": row_index,
+                "values": dict(zip(self.header, self.rows[row_index])),
+            }
+            for row_index in self._index.get(key, [])
+        ]
@@ -0,0 +1,233 @@
+"""
+Serialized write-behind queue for the cells of one workbook.
+
+Cell updates are buffered and flushed one batch at a time, so concurrent
+writers to the same workbook never race with each other. Before a flush,
+pending updates of adjacent cells are coalesced into rectangular range
+writes, turning many single-cell requests into a few range requests.
+A flush happens when the buffer reaches a size threshold, after a delay,
+or on an explicit commit.
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+CELL_ADDRESS_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3})\$?([1-9][0-9]*)$")
+
+
+def column_letters_to_index(column_letters: str) -> int:
+    """
+    Convert Excel column letters to a one-based column index (A -> 1).
+    """
+    index = 0
+    for letter in column_letters.upper():
+        index = index * 26 + (ord(letter) - ord("A") + 1)
+    return index
+
+
+def column_index_to_letters(column_index: int) -> str:
+    """
+    Convert a one-based column index to Excel column letters (1 -> A).
+    """
+    letters = ""
+    while column_index > 0:
+        column_index, remainder = divmod(column_index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def coalesce_cell_updates(
+    cell_updates: Dict[str, Any]
+) -> List[Tuple[str, List[List[Any]], List[str]]]:
+    """
+    Merge single-cell updates into rectangular range writes.
+
+    Cells on the same row with consecutive columns are merged into row runs,
+    then runs spanning the same columns on consecutive rows are stacked into
+    rectangles. Addresses that are not plain A1 cell references are written
+    on their own.
+
+    Args:
+        cell_updates (Dict[str, Any]): New values keyed by cell address.
+
+    Returns:
+        List[Tuple[str, List[List[Any]], List[str]]]: One entry per range
+        write with its address, its values and the cell addresses it covers.
+    """
+    range_writes = []
+    cells = {}
+    for address, value in cell_updates.items():
+        match = CELL_ADDRESS_PATTERN.match(address)
+        if match is None:
+            range_writes.append((address, [[value]], [address]))
+            continue
+        column_index = column_letters_to_index(match.group(1))
+        row_index = int(match.group(2))
+        cells[(row_index, column_index)] = (value, address)
+
+    # Row runs: (row, first column, last column, values, addresses)
+    row_runs = []
+    for row_index, column_index in sorted(cells):
+        value, address = cells[(row_index, column_index)]
+        if row_runs:
+            last_row, first_column, last_column, values, addresses = row_runs[-1]
+            if last_row == row_index and last_column == column_index - 1:
+                values.append(value)
+                addresses.append(address)
+                row_runs[-1] = (last_row, first_column, column_index, values, addresses)
+                continue
+        row_runs.append((row_index, column_index, column_index, [value], [address]))
+
+    # Rectangles: (first row, last row, first column, last column, values, addresses)
+    rectangles = []
+    for row_index, first_column, last_column, values, addresses in sorted(
+        row_runs, key=lambda run: (run[1], run[2], run[0])
+    ):
+        if rectangles:
+            top_row, bottom_row, rect_first, rect_last, rect_values, rect_addresses = (
+                rectangles[-1]
+            )
+            if (
+                (rect_first, rect_last) == (first_column, last_column)
+                and bottom_row == row_index - 1
+            ):
+                rect_values.append(values)
+                rect_addresses.extend(addresses)
+                rectangles[-1] = (
+                    top_row,
+                    row_index,
+                    rect_first,
+                    rect_last,
+                    rect_values,
+                    rect_addresses,
+                )
+                continue
+        rectangles.append(
+            (row_index, row_index, first_column, last_column, [values], list(addresses))
+        )
+
+    for top_row, bottom_row, first_column, last_column, values, addresses in rectangles:
+        start = f"{column_index_to_letters(first_column)}{top_row}"
+        end = f"{column_index_to_letters(last_column)}{bottom_row}"
+        address = start if start == end else f"{start}:{end}"
+        range_writes.append((address, values, addresses))
+    return range_writes
+
+
+class WorkbookWriteQueue:
+    """
+    Serialized write-behind queue for the cells of one workbook.
+
+    Args:
+        write_ranges (Callable): Coroutine function receiving a list of
+        `(worksheet_id, address, values)` range writes and returning one
+        exception, or None on success, per range write.
+        max_pending_cells (int): Number of pending cells that triggers a flush.
+        flush_delay (float): Seconds after the first pending update after
+        which a flush is triggered.
+    """
+
+    def __init__(
+        self,
+        write_ranges: Callable[
+            [List[Tuple[str, str, List[List[Any]]]]],
+            Awaitable[List[Optional[Exception]]],
+        ],
+        max_pending_cells: int = 200,
+        flush_delay: float = 0.5,
+    ):
+        self._write_ranges = write_ranges
+        self.max_pending_cells = max_pending_cells
+        self.flush_delay = flush_delay
+        # Pending values and waiting futures, keyed by worksheet ID and address.
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._waiters: Dict[Tuple[str, str], List[asyncio.Future]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer = None
+        self._background_flushes = set()
+
+    @property
+    def pending_cells(self) -> int:
+        """Number of cell updates waiting to be flushed."""
+        return sum(len(each) for each in self._pending.values())
+
+    def enqueue(
+        self, worksheet_id: str, cell_address: str, cell_value: Any
+    ) -> asyncio.Future:
+        """
+        Buffer a cell update.
+
+        A later update of the same cell replaces the pending value; both
+        callers are notified once the latest value has been written.
+
+        Args:
+            worksheet_id (str): The ID of the worksheet.
+            cell_address (str): The address of the cell, e.g. 'B2'.
+            cell_value (Any): The new value of the cell.
+
+        Returns:
+            asyncio.Future: Resolves once the update has been written, or
+            raises the error that made the write fail.
+        """
+        loop = asyncio.get_running_loop()
+        address = cell_address.replace("$", "").upper()
+        future = loop.create_future()
+        self._pending.setdefault(worksheet_id, {})[address] = cell_value
+        self._waiters.setdefault((worksheet_id, address), []).append(future)
+
+        if self.pending_cells >= self.max_pending_cells:
+            self._schedule_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_delay, self._schedule_flush)
+        return future
+
+    async def acommit(self):
+        """
+        Flush every pending update and wait until the flush has completed.
+
+        Flushes are serialized: a commit issued while another flush runs
+        waits for it, then flushes what has accumulated in the meantime.
+        """
+        async with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, {}
+            if not pending:
+                return
+
+            range_writes = []
+            covered_waiters = []
+            for worksheet_id, cell_updates in pending.items():
+                for address, values, addresses in coalesce_cell_updates(cell_updates):
+                    range_writes.append((worksheet_id, address, values))
+                    covered_waiters.append(
+                        [
+                            future
+                            for each_address in addresses
+                            for future in waiters.get((worksheet_id, each_address), [])
+                        ]
+                    )
+
+            try:
+                errors = await self._write_ranges(range_writes)
+            except Exception as error:
+                errors = [error] * len(range_writes)
+
+            for error, futures in zip(errors, covered_waiters):
+                for future in futures:
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(True)
+                    else:
+                        future.set_exception(error)
+
+    def _schedule_flush(self):
+        """Start a flush in the background, keeping a reference to its task."""
+        self._flush_timer = None
+        task = asyncio.ensure_future(self.acommit())
+        self._background_flushes.add(task)
+        task.add_done_callback(self._background_flushes.discard)
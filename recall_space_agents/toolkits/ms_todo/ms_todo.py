@@ -1,9 +1,16 @@
-from textwrap import dedent
+import asyncio
+import json
 from dataclasses import asdict
 from datetime import datetime, timedelta
+from functools import lru_cache
+from urllib.parse import quote
 
 from agent_builder.builders.tool_builder import ToolBuilder
 from dateutil.parser import isoparse
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+from kiota_serialization_json.json_parse_node import JsonParseNode
+from kiota_serialization_json.json_serialization_writer import JsonSerializationWriter
 from msgraph import GraphServiceClient
 from msgraph.generated.models.body_type import BodyType
 from msgraph.generated.models.date_time_time_zone import DateTimeTimeZone
@@ -12,18 +19,83 @@ from msgraph.generated.models.linked_resource import LinkedResource
 from msgraph.generated.models.task_status import TaskStatus
 from msgraph.generated.models.todo_task import TodoTask
 from msgraph.generated.models.todo_task_list import TodoTaskList
-from zoneinfo import ZoneInfo
+from msgraph.generated.users.item.todo.lists.item.tasks.tasks_request_builder import (
+    TasksRequestBuilder,
+)
+from msgraph.generated.users.item.todo.lists.lists_request_builder import (
+    ListsRequestBuilder,
+)
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from recall_space_agents.toolkits.ms_todo.schema_mappings import schema_mappings
+from recall_space_agents.toolkits.ms_todo.todo_store import TodoStore
+from recall_space_agents.utils.rate_limiter import retry_after_seconds
+from recall_space_agents.utils.table_renderer import render_table
+from recall_space_agents.utils.ttl_cache import TTLCache
+
+# Upper bound of per-list task requests running at the same time.
+MAX_CONCURRENT_LIST_REQUESTS = 8
+# Number of tasks or lists requested per page.
+DEFAULT_PAGE_SIZE = 100
+# Lifetime of the cached todo list and task title lookups.
+LOOKUP_CACHE_TTL_SECONDS = 300
+# Graph accepts at most 20 requests per JSON batch.
+MAX_BATCH_REQUESTS = 20
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+# Status codes of throttled or briefly unavailable requests, retried.
+RETRYABLE_STATUS_CODES = (429, 503, 504)
+# A POST answered with 503 or 504 may still have been applied, so only
+# throttled POSTs are sent again.
+NON_IDEMPOTENT_RETRYABLE_STATUS_CODES = (429,)
+# Age after which the local todo store is brought up to date before a query.
+TODO_STORE_MAX_STALENESS_SECONDS = 60
+# Due date periods answered by aquery_tasks_by_due_date.
+DUE_DATE_PERIODS = ("overdue", "today", "this_week", "custom")
+# Output formats of task listings.
+TASK_OUTPUT_FORMATS = ("markdown", "table", "json")
+# Columns of the table and JSON task listings.
+TASK_FIELDS = ("title", "due_date", "status", "completed_date", "body", "linked_resources")
+
+
+@lru_cache(maxsize=None)
+def _get_zone(time_zone: str) -> ZoneInfo:
+    """Return the ZoneInfo of a time zone name, built once per name."""
+    return ZoneInfo(time_zone)
+
+
+@lru_cache(maxsize=4096)
+def _parse_graph_date_time(date_time: str) -> datetime:
+    """Parse a Graph dateTime string; Graph sends 7 fractional digits, which
+    only `isoparse` reads before Python 3.11."""
+    try:
+        return datetime.fromisoformat(date_time)
+    except ValueError:
+        return isoparse(date_time)
 
 
 class MSTodoToolKit:
-    def __init__(self, credentials):
+    def __init__(
+        self,
+        credentials,
+        cache_ttl_seconds: float = LOOKUP_CACHE_TTL_SECONDS,
+        timezone: str = "Europe/Paris",
+    ):
         self.required_scopes_as_user = ["APIConnectors.Read.All", "Tasks.ReadWrite"]
         self.ms_graph_client = GraphServiceClient(
             credentials=credentials, scopes=self.required_scopes_as_user
         )
+        self.credentials = credentials
         self.schema_mappings = schema_mappings
+        # Time zone of displayed dates and of "today" in due date queries.
+        self.timezone = timezone
+        # Todo list display name -> todo list ID.
+        self._todo_list_ids = TTLCache(ttl_seconds=cache_ttl_seconds)
+        # Todo list ID -> {task title: [task IDs]}, open tasks first.
+        self._task_ids_by_title = TTLCache(ttl_seconds=cache_ttl_seconds)
+        # Tasks of all lists indexed by due date, filled by arefresh_todo_tasks.
+        self.todo_store = TodoStore(
+            lambda task: self._get_due_date_in_timezone(task, _get_zone("UTC"))
+        )
 
     async def acreate_todo_list(self, display_name: str) -> dict:
         check = await self._aget_todo_list_id_by_display_name(display_name)
@@ -34,6 +106,8 @@ class MSTodoToolKit:
             todo_task_list_response = await self.ms_graph_client.me.todo.lists.post(
                 todo_task_list
             )
+            self._todo_list_ids.set(display_name, todo_task_list_response.id)
+            self._task_ids_by_title.set(todo_task_list_response.id, {})
             return asdict(todo_task_list_response)
         else:
             return f"the todo list with display name: {display_name} already exist."
@@ -49,20 +123,18 @@ class MSTodoToolKit:
             todo_list_id != "" or todo_list_display_name != ""
         ), "Must provide 'todo_list_id' or 'todo_list_display_name'."
 
-        # If 'todo_list_id' is not provided, get it via display name
-        if todo_list_id == "":
-            todo_list_id = await self._aget_todo_list_id_by_display_name(
-                todo_list_display_name
-            )
-            if not todo_list_id:
-                raise ValueError(
-                    f"Todo list with display name '{todo_list_display_name}' not found."
-                )
+        async def delete_todo_list(todo_list_id, _):
+            await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
+                todo_list_id
+            ).delete()
 
-        # Proceed to delete the to-do list
-        await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
-            todo_list_id
-        ).delete()
+        # Proceed to delete the to-do list, resolving its display name if needed
+        todo_list_id, _, _ = await self._awith_resolved_ids(
+            delete_todo_list, todo_list_id, todo_list_display_name
+        )
+        self._todo_list_ids.clear()
+        self._task_ids_by_title.delete(todo_list_id)
+        self.todo_store.remove_list(todo_list_id)
         return {"status": "Todo list deleted successfully."}
 
     async def acreate_task(
@@ -80,11 +152,709 @@ class MSTodoToolKit:
             todo_list_id != "" or todo_list_display_name != ""
         ), "must provide todo_list_id or todo_list_display_name"
 
+        todo_task = self._build_todo_task(
+            title=title,
+            html_content=html_content,
+            linked_resource_list=linked_resource_list,
+            due_date=due_date,
+            due_date_reminder=due_date_reminder,
+            categories_list=categories_list,
+        )
+
+        async def create_task(todo_list_id, _):
+            return await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
+                todo_list_id
+            ).tasks.post(todo_task)
+
+        todo_list_id, _, todo_task_response = await self._awith_resolved_ids(
+            create_task, todo_list_id, todo_list_display_name
+        )
+        task_ids_by_title = self._task_ids_by_title.get(todo_list_id)
+        if task_ids_by_title is not None:
+            task_ids_by_title.setdefault(title, []).insert(0, todo_task_response.id)
+        if todo_list_id in self.todo_store.list_names:
+            self.todo_store.upsert(todo_list_id, todo_task_response)
+
+        formatted_task = self._format_task(todo_task_response)
+        return formatted_task
+
+    async def adelete_task(
+        self,
+        task_id: str = "",
+        task_title: str = "",
+        todo_list_display_name: str = "",
+        todo_list_id: str = "",
+    ) -> dict:
+        # Ensure that either todo_list_id or todo_list_display_name is provided
+        assert (
+            todo_list_id != "" or todo_list_display_name != ""
+        ), "Must provide 'todo_list_id' or 'todo_list_display_name'."
+
+        # Ensure that either task_id or task_title is provided
+        assert (
+            task_id != "" or task_title != ""
+        ), "Must provide 'task_id' or 'task_title'."
+
+        async def delete_task(todo_list_id, task_id):
+            await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
+                todo_list_id
+            ).tasks.by_todo_task_id(task_id).delete()
+
+        # Proceed to delete the task, resolving the list and task names if needed
+        todo_list_id, task_id, _ = await self._awith_resolved_ids(
+            delete_task, todo_list_id, todo_list_display_name, task_id, task_title
+        )
+        self._forget_task_id(todo_list_id, task_id)
+        self.todo_store.remove(task_id)
+        return {"status": "Task deleted successfully."}
+
+    async def acomplete_task(
+        self,
+        task_id: str = "",
+        task_title: str = "",
+        todo_list_display_name: str = "",
+        todo_list_id: str = "",
+    ) -> str:
+        # Ensure that either 'todo_list_id' or 'todo_list_display_name' is provided
+        assert (
+            todo_list_id != "" or todo_list_display_name != ""
+        ), "Must provide 'todo_list_id' or 'todo_list_display_name'."
+
+        # Ensure that either 'task_id' or 'task_title' is provided
+        assert (
+            task_id != "" or task_title != ""
+        ), "Must provide 'task_id' or 'task_title'."
+
+        # Update the task status to 'completed'
+        todo_task_update = TodoTask(status=TaskStatus("completed"))
+
+        async def complete_task(todo_list_id, task_id):
+            return await (
+                self.ms_graph_client.me.todo.lists.by_todo_task_list_id(todo_list_id)
+                .tasks.by_todo_task_id(task_id)
+                .patch(todo_task_update)
+            )
+
+        # Proceed to update the task, resolving the list and task names if needed
+        todo_list_id, task_id, updated_task = await self._awith_resolved_ids(
+            complete_task, todo_list_id, todo_list_display_name, task_id, task_title
+        )
+        # Completed tasks move behind open tasks of the same title
+        task_ids_by_title = self._forget_task_id(todo_list_id, task_id)
+        if task_ids_by_title is not None:
+            task_ids_by_title.setdefault(updated_task.title or task_title, []).append(task_id)
+        if todo_list_id in self.todo_store.list_names:
+            self.todo_store.upsert(todo_list_id, updated_task)
+
+        formatted_task = self._format_task(updated_task)
+        return formatted_task
+
+    async def acreate_tasks(
+        self,
+        tasks: list,
+        todo_list_display_name: str = "",
+        todo_list_id: str = "",
+    ) -> list:
+        """
+        Create several tasks through Graph JSON batches.
+
+        Args:
+            tasks (list): One dict per task with `title` and optionally
+            `html_content`, `linked_resource_list`, `due_date`,
+            `due_date_reminder`, `categories_list` and `todo_list_display_name`,
+            the latter overriding the list given for all tasks.
+            todo_list_display_name (str): Display name of the default todo list.
+            todo_list_id (str): ID of the default todo list.
+
+        Returns:
+            list: One result per task, in order, with its status and task ID.
+        """
+        results = [None] * len(tasks)
+        batch_requests = []
+        pending = []
+        for position, task_fields in enumerate(tasks):
+            title = task_fields.get("title", "")
+            item_list_display_name = task_fields.get("todo_list_display_name", "")
+            try:
+                list_id = await self._aresolve_todo_list_id(
+                    "" if item_list_display_name else todo_list_id,
+                    item_list_display_name or todo_list_display_name,
+                )
+                todo_task = self._build_todo_task(
+                    title=title,
+                    html_content=task_fields.get("html_content", ""),
+                    linked_resource_list=task_fields.get("linked_resource_list", []),
+                    due_date=task_fields.get("due_date", ""),
+                    due_date_reminder=task_fields.get("due_date_reminder", ""),
+                    categories_list=task_fields.get("categories_list", []),
+                )
+            except (ValueError, AssertionError) as error:
+                results[position] = {"title": title, "status": "failed", "error": str(error)}
+                continue
+            writer = JsonSerializationWriter()
+            writer.write_object_value(None, todo_task)
+            batch_requests.append(
+                {
+                    "method": "POST",
+                    "url": f"/me/todo/lists/{list_id}/tasks",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": json.loads(writer.get_serialized_content()),
+                }
+            )
+            pending.append((position, title, list_id))
+
+        responses = await self._abatch(batch_requests)
+        for (position, title, list_id), response in zip(pending, responses):
+            if response["status"] != 201:
+                results[position] = {
+                    "title": title,
+                    "status": "failed",
+                    "error": self._batch_error(response),
+                }
+                continue
+            created_task = JsonParseNode(response.get("body") or {}).get_object_value(TodoTask)
+            task_ids_by_title = self._task_ids_by_title.get(list_id)
+            if task_ids_by_title is not None:
+                task_ids_by_title.setdefault(title, []).insert(0, created_task.id)
+            if list_id in self.todo_store.list_names:
+                self.todo_store.upsert(list_id, created_task)
+            results[position] = {"title": title, "status": "created", "task_id": created_task.id}
+        return results
+
+    async def acomplete_tasks(
+        self,
+        task_titles: list = [],
+        task_ids: list = [],
+        todo_list_display_name: str = "",
+        todo_list_id: str = "",
+    ) -> list:
+        """
+        Mark several tasks of a todo list as completed through Graph JSON batches.
+
+        Args:
+            task_titles (list): Titles of the tasks to complete.
+            task_ids (list): IDs of the tasks to complete.
+            todo_list_display_name (str): Display name of the todo list.
+            todo_list_id (str): ID of the todo list.
+
+        Returns:
+            list: One result per task, titles first, in order.
+        """
+        todo_list_id = await self._aresolve_todo_list_id(
+            todo_list_id, todo_list_display_name
+        )
+        results, targets = await self._aresolve_task_targets(
+            todo_list_id, task_titles, task_ids
+        )
+        responses = await self._abatch(
+            [
+                {
+                    "method": "PATCH",
+                    "url": f"/me/todo/lists/{todo_list_id}/tasks/{task_id}",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {"status": "completed"},
+                }
+                for _, _, task_id in targets
+            ]
+        )
+        for (position, task, task_id), response in zip(targets, responses):
+            if response["status"] != 200:
+                results[position] = {
+                    "task": task,
+                    "status": "failed",
+                    "error": self._batch_error(response),
+                }
+                continue
+            updated_task = JsonParseNode(response.get("body") or {}).get_object_value(TodoTask)
+            task_ids_by_title = self._forget_task_id(todo_list_id, task_id)
+            if task_ids_by_title is not None:
+                task_ids_by_title.setdefault(updated_task.title or task, []).append(task_id)
+            if todo_list_id in self.todo_store.list_names:
+                self.todo_store.upsert(todo_list_id, updated_task)
+            results[position] = {"task": task, "status": "completed", "task_id": task_id}
+        return results
+
+    async def adelete_tasks(
+        self,
+        task_titles: list = [],
+        task_ids: list = [],
+        todo_list_display_name: str = "",
+        todo_list_id: str = "",
+    ) -> list:
+        """
+        Delete several tasks of a todo list through Graph JSON batches.
+
+        Args:
+            task_titles (list): Titles of the tasks to delete.
+            task_ids (list): IDs of the tasks to delete.
+            todo_list_display_name (str): Display name of the todo list.
+            todo_list_id (str): ID of the todo list.
+
+        Returns:
+            list: One result per task, titles first, in order.
+        """
+        todo_list_id = await self._aresolve_todo_list_id(
+            todo_list_id, todo_list_display_name
+        )
+        results, targets = await self._aresolve_task_targets(
+            todo_list_id, task_titles, task_ids
+        )
+        responses = await self._abatch(
+            [
+                {
+                    "method": "DELETE",
+                    "url": f"/me/todo/lists/{todo_list_id}/tasks/{task_id}",
+                }
+                for _, _, task_id in targets
+            ]
+        )
+        for (position, task, task_id), response in zip(targets, responses):
+            if response["status"] != 204:
+                results[position] = {
+                    "task": task,
+                    "status": "failed",
+                    "error": self._batch_error(response),
+                }
+                continue
+            self._forget_task_id(todo_list_id, task_id)
+            self.todo_store.remove(task_id)
+            results[position] = {"task": task, "status": "deleted", "task_id": task_id}
+        return results
+
+    async def alist_tasks_due_today(
+        self, include_completed: bool = False, output_format: str = "markdown"
+    ) -> str:
+        """
+        List the tasks of all todo lists that are due today in the toolkit's
+        time zone, formatted as 'markdown', 'table' or 'json'.
+
+        The due date window and, unless `include_completed` is True, the
+        status are filtered by Graph, and the lists are queried through JSON
+        batches of 20 lists, so 40 lists take the lists request and two
+        batch requests. Due dates are stored with their own time zone, so the
+        server window is a day wider on each side and the exact day is
+        checked locally.
+        """
+        cet_tz = _get_zone(self.timezone)
+        today = datetime.now(cet_tz).date()
+
+        window_start = (today - timedelta(days=1)).isoformat()
+        window_end = (today + timedelta(days=2)).isoformat()
+        task_filter = (
+            f"dueDateTime/dateTime ge '{window_start}T00:00:00' "
+            f"and dueDateTime/dateTime lt '{window_end}T00:00:00'"
+        )
+        if not include_completed:
+            task_filter += " and status ne 'completed'"
+
+        # Get all todo lists, then their tasks due around today in batches
+        todo_list_ids = [
+            todo_list.id async for todo_list in self._aiter_todo_lists(select=["id"])
+        ]
+        responses = await self._abatch(
+            [
+                {
+                    "method": "GET",
+                    "url": (
+                        f"/me/todo/lists/{todo_list_id}/tasks"
+                        f"?$filter={quote(task_filter)}&$top={DEFAULT_PAGE_SIZE}"
+                    ),
+                }
+                for todo_list_id in todo_list_ids
+            ]
+        )
+        due_today = []
+        for todo_list_id, response in zip(todo_list_ids, responses):
+            if response["status"] != 200:
+                raise Exception(
+                    f"Failed to get tasks of todo list {todo_list_id}: "
+                    f"{self._batch_error(response)}"
+                )
+            async for task in self._aiter_batch_tasks(todo_list_id, response.get("body")):
+                due_date_cet = self._get_due_date_in_timezone(task, cet_tz)
+                # Compare the date part only
+                if due_date_cet is not None and due_date_cet.date() == today:
+                    due_today.append(task)
+        return self._format_tasks(due_today, output_format)
+
+    async def aquery_tasks_by_due_date(
+        self,
+        period: str = "today",
+        start_date: str = "",
+        end_date: str = "",
+        todo_list_display_name: str = "",
+        include_completed: bool = False,
+        max_staleness_seconds: float = TODO_STORE_MAX_STALENESS_SECONDS,
+        output_format: str = "markdown",
+    ) -> str:
+        """
+        List tasks by due date range from the local todo store.
+
+        The store is brought up to date through delta queries when its last
+        sync is older than `max_staleness_seconds`; otherwise no request is
+        sent to Graph. Days are calendar days in the toolkit's time zone.
+
+        Args:
+            period (str): 'overdue' (due before today), 'today', 'this_week'
+            (Monday to Sunday) or 'custom' for the range given by `start_date`
+            and `end_date`.
+            start_date (str): First due day of a custom range, 'YYYY-MM-DD'.
+            end_date (str): Last due day of a custom range, 'YYYY-MM-DD'.
+            todo_list_display_name (str): Restrict to one todo list.
+            include_completed (bool): Whether to include completed tasks.
+            max_staleness_seconds (float): Maximum age of the local store.
+            output_format (str): 'markdown', 'table' or 'json'.
+
+        Returns:
+            str: The matching tasks, ordered by due date.
+        """
+        if period not in DUE_DATE_PERIODS:
+            raise ValueError(f"Unknown period '{period}', expected one of {DUE_DATE_PERIODS}.")
+        cet_tz = _get_zone(self.timezone)
+        now = datetime.now(cet_tz)
+        today_start = datetime.combine(now.date(), datetime.min.time(), tzinfo=cet_tz)
+
+        if period == "overdue":
+            start, end = None, today_start
+        elif period == "today":
+            start, end = today_start, today_start + timedelta(days=1)
+        elif period == "this_week":
+            start = today_start - timedelta(days=now.weekday())
+            end = start + timedelta(days=7)
+        else:
+            try:
+                start = end = None
+                if start_date:
+                    start = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=cet_tz)
+                if end_date:
+                    end = datetime.strptime(end_date, "%Y-%m-%d").replace(
+                        tzinfo=cet_tz
+                    ) + timedelta(days=1)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid date format. Expected 'YYYY-MM-DD', got '{start_date}' and '{end_date}'"
+                )
+
+        if not self.todo_store.is_fresh(max_staleness_seconds):
+            await self.arefresh_todo_tasks()
+
+        todo_list_id = None
+        if todo_list_display_name:
+            todo_list_id = next(
+                (
+                    list_id
+                    for list_id, display_name in self.todo_store.list_names.items()
+                    if display_name == todo_list_display_name
+                ),
+                None,
+            )
+            if todo_list_id is None:
+                raise ValueError(
+                    f"Todo list with display name '{todo_list_display_name}' not found."
+                )
+
+        matches = self.todo_store.query_due(
+            start, end, todo_list_id=todo_list_id, include_completed=include_completed
+        )
+        return self._format_tasks([task for _, task in matches], output_format)
+
+    async def arefresh_todo_tasks(self):
+        """
+        Bring the local todo store up to date through tasks delta queries.
+
+        The first sync of a list downloads all its tasks; later syncs only
+        fetch what changed since the saved delta link. Lists deleted since
+        the last sync are dropped from the store.
+        """
+        todo_lists = [
+            todo_list
+            async for todo_list in self._aiter_todo_lists(select=["id", "displayName"])
+        ]
+        current_list_ids = {todo_list.id for todo_list in todo_lists}
+        for todo_list_id in list(self.todo_store.list_names):
+            if todo_list_id not in current_list_ids:
+                self.todo_store.remove_list(todo_list_id)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LIST_REQUESTS)
+
+        async def sync_list(todo_list):
+            async with semaphore:
+                try:
+                    await self._arefresh_todo_list(todo_list.id)
+                except APIError as error:
+                    # An expired delta link is answered with 410 Gone: resync fully.
+                    if error.response_status_code != 410:
+                        raise
+                    self.todo_store.remove_list(todo_list.id)
+                    await self._arefresh_todo_list(todo_list.id)
+            self.todo_store.list_names[todo_list.id] = todo_list.display_name
+
+        await asyncio.gather(*[sync_list(todo_list) for todo_list in todo_lists])
+        self.todo_store.mark_synced()
+
+    async def alist_tasks_in_todo_list(
+        self, todo_list_display_name: str, output_format: str = "markdown"
+    ) -> str:
+        # Get the todo list ID from the display name
+        todo_list_id = await self._aget_todo_list_id_by_display_name(todo_list_display_name)
+
+        if not todo_list_id:
+            raise ValueError(f"Todo list with display name '{todo_list_display_name}' not found.")
+
+        # Build a nicely formatted string containing task details
+        tasks = [task async for task in self._aiter_tasks(todo_list_id)]
+        return self._format_tasks(tasks, output_format)
+
+    async def _aget_task_id_by_title(self, todo_list_id: str, task_title: str) -> str:
+        """
+        Return the ID of a task by title, preferring open tasks.
+
+        Titles are served from a per-list cache; a title missing from the
+        cache reloads the list once, so tasks created elsewhere are found.
+        """
+        task_ids_by_title = self._task_ids_by_title.get(todo_list_id)
+        if task_ids_by_title is None or not task_ids_by_title.get(task_title):
+            task_ids_by_title = await self._aload_task_ids_by_title(todo_list_id)
+        task_ids = task_ids_by_title.get(task_title)
+        return task_ids[0] if task_ids else None
+
+    async def _aget_todo_list_id_by_display_name(self, display_name) -> str:
+        """
+        Return the ID of a todo list by display name, or None.
+
+        Display names are served from a cache; a name missing from the cache
+        reloads all lists once.
+        """
+        todo_task_list_id = self._todo_list_ids.get(display_name)
+        if todo_task_list_id is not None:
+            return todo_task_list_id
+
+        todo_task_lists = [
+            task_list
+            async for task_list in self._aiter_todo_lists(select=["id", "displayName"])
+        ]
+        for task_list in reversed(todo_task_lists):
+            # Reversed so that the first list of a duplicated name wins
+            self._todo_list_ids.set(task_list.display_name, task_list.id)
+        return self._todo_list_ids.get(display_name)
+
+    async def _aload_task_ids_by_title(self, todo_list_id: str) -> dict:
+        """Load and cache the task IDs of a list by title, open tasks first."""
+        task_ids_by_title = {}
+        completed_task_ids_by_title = {}
+        async for task in self._aiter_tasks(
+            todo_list_id, select=["id", "title", "status"]
+        ):
+            if task.status == TaskStatus.Completed:
+                completed_task_ids_by_title.setdefault(task.title, []).append(task.id)
+            else:
+                task_ids_by_title.setdefault(task.title, []).append(task.id)
+        for title, task_ids in completed_task_ids_by_title.items():
+            task_ids_by_title.setdefault(title, []).extend(task_ids)
+        self._task_ids_by_title.set(todo_list_id, task_ids_by_title)
+        return task_ids_by_title
+
+    async def _aresolve_todo_list_id(
+        self, todo_list_id: str = "", todo_list_display_name: str = ""
+    ) -> str:
+        """Return the given todo list ID, or look it up by display name."""
+        assert (
+            todo_list_id != "" or todo_list_display_name != ""
+        ), "Must provide 'todo_list_id' or 'todo_list_display_name'."
         if todo_list_id == "":
             todo_list_id = await self._aget_todo_list_id_by_display_name(
                 todo_list_display_name
             )
+            if not todo_list_id:
+                raise ValueError(
+                    f"Todo list with display name '{todo_list_display_name}' not found."
+                )
+        return todo_list_id
+
+    async def _awith_resolved_ids(
+        self,
+        operation,
+        todo_list_id: str = "",
+        todo_list_display_name: str = "",
+        task_id: str = "",
+        task_title: str = "",
+    ) -> tuple:
+        """
+        Resolve a todo list, and a task when one is given, then run an
+        operation on their IDs.
+
+        Names are resolved through the lookup caches. A list or task deleted
+        or renamed in the To Do app keeps its stale cached ID, which Graph
+        answers with 404: the cache entries are then dropped, the names are
+        looked up again and the operation is retried once.
+
+        Args:
+            operation (Callable[[str, str], Awaitable]): Called with the todo
+            list ID and the task ID, None when no task is given.
+            todo_list_id (str): ID of the todo list.
+            todo_list_display_name (str): Display name of the todo list.
+            task_id (str): ID of the task.
+            task_title (str): Title of the task.
+
+        Returns:
+            tuple: The todo list ID, the task ID and the result of `operation`.
+        """
+        with_task = task_id != "" or task_title != ""
+        resolved_by_name = todo_list_id == "" or (with_task and task_id == "")
+        stale_ids, stale_error = None, None
+        for _ in range(2):
+            resolved_list_id = await self._aresolve_todo_list_id(
+                todo_list_id, todo_list_display_name
+            )
+            resolved_task_id = task_id or None
+            if with_task and task_id == "":
+                resolved_task_id = await self._aget_task_id_by_title(
+                    resolved_list_id, task_title
+                )
+                if not resolved_task_id:
+                    raise ValueError(
+                        f"Task with title '{task_title}' not found in todo list."
+                    )
+            if (resolved_list_id, resolved_task_id) == stale_ids:
+                # The lookup found the same IDs again: they do not exist
+                raise stale_error
+            try:
+                result = await operation(resolved_list_id, resolved_task_id)
+                return resolved_list_id, resolved_task_id, result
+            except APIError as error:
+                if error.response_status_code != 404 or not resolved_by_name or stale_ids:
+                    raise
+                stale_ids, stale_error = (resolved_list_id, resolved_task_id), error
+            # The cached IDs may be stale: look the names up again
+            if todo_list_id == "":
+                self._todo_list_ids.delete(todo_list_display_name)
+            if with_task and task_id == "":
+                self._task_ids_by_title.delete(resolved_list_id)
+
+    async def _aresolve_task_targets(
+        self, todo_list_id: str, task_titles: list, task_ids: list
+    ) -> tuple:
+        """
+        Resolve task titles to IDs for a bulk operation.
+
+        Returns:
+            tuple: The results list, pre-filled with failures for unknown
+            titles, and (position, task title or ID, task ID) targets.
+        """
+        requested = list(task_titles) + list(task_ids)
+        results = [None] * len(requested)
+        targets = []
+        for position, task_title in enumerate(task_titles):
+            task_id = await self._aget_task_id_by_title(todo_list_id, task_title)
+            if task_id:
+                targets.append((position, task_title, task_id))
+            else:
+                results[position] = {
+                    "task": task_title,
+                    "status": "failed",
+                    "error": f"Task with title '{task_title}' not found in todo list.",
+                }
+        for position, task_id in enumerate(task_ids, start=len(task_titles)):
+            targets.append((position, task_id, task_id))
+        return results, targets
+
+    async def _abatch(self, requests: list, max_retries: int = 3) -> list:
+        """
+        Send requests through Graph JSON batches of up to 20 requests.
+
+        Requests throttled inside a batch are sent again after the largest
+        `Retry-After` delay of the batch; POST requests are only sent again
+        when throttled with 429. A request missing from the batch reply is
+        reported as failed with status 0.
+
+        Args:
+            requests (list): Dicts with `method`, relative `url` and optionally
+            `headers` and `body`.
+            max_retries (int): Retries of throttled requests.
+
+        Returns:
+            list: One dict per request, in order, with `status`, `headers`
+            and `body`.
+        """
+        import aiohttp
+
+        responses = [None] * len(requests)
+        if not requests:
+            return responses
+        access_token = self.credentials.get_token(*self.required_scopes_as_user)
+        headers = {
+            "Authorization": f"Bearer {access_token.token}",
+            "Content-Type": "application/json",
+        }
+
+        async with aiohttp.ClientSession() as session:
+            for chunk_start in range(0, len(requests), MAX_BATCH_REQUESTS):
+                pending = list(
+                    range(chunk_start, min(chunk_start + MAX_BATCH_REQUESTS, len(requests)))
+                )
+                for attempt in range(max_retries + 1):
+                    payload = {
+                        "requests": [
+                            {"id": str(position), **requests[position]}
+                            for position in pending
+                        ]
+                    }
+                    async with session.post(
+                        GRAPH_BATCH_URL, headers=headers, json=payload
+                    ) as response:
+                        if response.status != 200:
+                            text = await response.text()
+                            raise Exception(
+                                f"Failed to send batch: {response.status}, {text}"
+                            )
+                        batch_response = await response.json()
+
+                    throttled = []
+                    delay = 0.0
+                    for each in batch_response.get("responses", []):
+                        position = int(each["id"])
+                        responses[position] = each
+                        retryable_status_codes = (
+                            NON_IDEMPOTENT_RETRYABLE_STATUS_CODES
+                            if requests[position]["method"].upper() == "POST"
+                            else RETRYABLE_STATUS_CODES
+                        )
+                        if each.get("status") in retryable_status_codes:
+                            throttled.append(position)
+                            delay = max(
+                                delay,
+                                retry_after_seconds(each.get("headers"), default=2**attempt),
+                            )
+                    if not throttled or attempt == max_retries:
+                        break
+                    pending = throttled
+                    await asyncio.sleep(delay)
 
+        for position, response in enumerate(responses):
+            if response is None:
+                responses[position] = {
+                    "status": 0,
+                    "headers": {},
+                    "body": {"error": {"message": "No response in batch reply."}},
+                }
+        return responses
+
+    def _batch_error(self, response: dict) -> str:
+        """Describe a failed batch response."""
+        body = response.get("body") or {}
+        message = body.get("error", {}).get("message") if isinstance(body, dict) else body
+        return f"{response.get('status')}, {message}"
+
+    def _build_todo_task(
+        self,
+        title: str,
+        html_content: str = "",
+        linked_resource_list: list = [],
+        due_date: str = "",
+        due_date_reminder: str = "",
+        categories_list: list = [],
+    ) -> TodoTask:
+        """Build the TodoTask sent to create a task."""
         todo_task = TodoTask()
         todo_task.title = title
 
@@ -137,186 +907,169 @@ class MSTodoToolKit:
 
         if len(categories_list) > 0:
             todo_task.categories = categories_list
-        todo_task_response = (
-            await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
-                todo_list_id
-            ).tasks.post(todo_task)
-        )
-
-        formatted_task = self._format_task(todo_task_response)
-        return formatted_task
+        return todo_task
 
-    async def adelete_task(
+    async def _aiter_tasks(
         self,
-        task_id: str = "",
-        task_title: str = "",
-        todo_list_display_name: str = "",
-        todo_list_id: str = "",
-    ) -> dict:
-        # Ensure that either todo_list_id or todo_list_display_name is provided
-        assert (
-            todo_list_id != "" or todo_list_display_name != ""
-        ), "Must provide 'todo_list_id' or 'todo_list_display_name'."
-
-        # Ensure that either task_id or task_title is provided
-        assert (
-            task_id != "" or task_title != ""
-        ), "Must provide 'task_id' or 'task_title'."
-
-        # If todo_list_id is not provided, get it via display name
-        if todo_list_id == "":
-            todo_list_id = await self._aget_todo_list_id_by_display_name(
-                todo_list_display_name
-            )
-            if not todo_list_id:
-                raise ValueError(
-                    f"Todo list with display name '{todo_list_display_name}' not found."
-                )
+        todo_list_id: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        select: list = None,
+        filter: str = None,
+    ):
+        """
+        Iterate over all tasks of a list, following `@odata.nextLink`.
 
-        # If task_id is not provided, get it via task title
-        if task_id == "":
-            task_id = await self._aget_task_id_by_title(todo_list_id, task_title)
-            if not task_id:
-                raise ValueError(
-                    f"Task with title '{task_title}' not found in todo list."
-                )
+        Args:
+            todo_list_id (str): The ID of the todo list.
+            page_size (int): Number of tasks requested per page.
+            select (list, optional): Task properties to return, all when omitted.
+            filter (str, optional): OData filter of the tasks.
 
-        # Proceed to delete the task
-        await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
+        Yields:
+            TodoTask: The tasks, page by page.
+        """
+        tasks_builder = self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
             todo_list_id
-        ).tasks.by_todo_task_id(task_id).delete()
-        return {"status": "Task deleted successfully."}
+        ).tasks
+        query_params = TasksRequestBuilder.TasksRequestBuilderGetQueryParameters(
+            top=page_size, select=select, filter=filter
+        )
+        tasks_response = await tasks_builder.get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        while tasks_response is not None:
+            for task in tasks_response.value or []:
+                yield task
+            if not tasks_response.odata_next_link:
+                return
+            tasks_response = await tasks_builder.with_url(
+                tasks_response.odata_next_link
+            ).get()
 
-    async def acomplete_task(
-        self,
-        task_id: str = "",
-        task_title: str = "",
-        todo_list_display_name: str = "",
-        todo_list_id: str = "",
-    ) -> str:
-        # Ensure that either 'todo_list_id' or 'todo_list_display_name' is provided
-        assert (
-            todo_list_id != "" or todo_list_display_name != ""
-        ), "Must provide 'todo_list_id' or 'todo_list_display_name'."
+    async def _aiter_batch_tasks(self, todo_list_id: str, body: dict):
+        """
+        Iterate over the tasks of a batched tasks response, requesting the
+        following pages, if any, directly.
 
-        # Ensure that either 'task_id' or 'task_title' is provided
-        assert (
-            task_id != "" or task_title != ""
-        ), "Must provide 'task_id' or 'task_title'."
+        Args:
+            todo_list_id (str): The ID of the todo list.
+            body (dict): The body of the batch response.
 
-        # If 'todo_list_id' is not provided, get it via display name
-        if todo_list_id == "":
-            todo_list_id = await self._aget_todo_list_id_by_display_name(
-                todo_list_display_name
-            )
-            if not todo_list_id:
-                raise ValueError(
-                    f"Todo list with display name '{todo_list_display_name}' not found."
-                )
+        Yields:
+            TodoTask: The tasks, page by page.
+        """
+        body = body or {}
+        for task in body.get("value") or []:
+            yield JsonParseNode(task).get_object_value(TodoTask)
+        next_link = body.get("@odata.nextLink")
+        if not next_link:
+            return
+        tasks_builder = self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
+            todo_list_id
+        ).tasks
+        tasks_response = await tasks_builder.with_url(next_link).get()
+        while tasks_response is not None:
+            for task in tasks_response.value or []:
+                yield task
+            if not tasks_response.odata_next_link:
+                return
+            tasks_response = await tasks_builder.with_url(
+                tasks_response.odata_next_link
+            ).get()
 
-        # If 'task_id' is not provided, get it via task title
-        if task_id == "":
-            task_id = await self._aget_task_id_by_title(todo_list_id, task_title)
-            if not task_id:
-                raise ValueError(
-                    f"Task with title '{task_title}' not found in todo list."
-                )
+    async def _aiter_todo_lists(self, page_size: int = DEFAULT_PAGE_SIZE, select: list = None):
+        """
+        Iterate over all todo lists, following `@odata.nextLink`.
 
-        # Update the task status to 'completed'
-        todo_task_update = TodoTask(status=TaskStatus("completed"))
+        Args:
+            page_size (int): Number of lists requested per page.
+            select (list, optional): List properties to return, all when omitted.
 
-        # Proceed to update the task
-        updated_task = (
-            await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(todo_list_id)
-            .tasks.by_todo_task_id(task_id)
-            .patch(todo_task_update)
+        Yields:
+            TodoTaskList: The todo lists, page by page.
+        """
+        lists_builder = self.ms_graph_client.me.todo.lists
+        query_params = ListsRequestBuilder.ListsRequestBuilderGetQueryParameters(
+            top=page_size, select=select
         )
+        lists_response = await lists_builder.get(
+            request_configuration=RequestConfiguration(query_parameters=query_params)
+        )
+        while lists_response is not None:
+            for todo_list in lists_response.value or []:
+                yield todo_list
+            if not lists_response.odata_next_link:
+                return
+            lists_response = await lists_builder.with_url(
+                lists_response.odata_next_link
+            ).get()
 
-        formatted_task = self._format_task(updated_task)
-        return formatted_task
-
-    async def alist_tasks_due_today(self) -> str:
-        formatted_tasks = ""
-        cet_tz = ZoneInfo('Europe/Paris')  # Change to your specific CET time zone if needed
-        today = datetime.now(cet_tz).date()
-
-        # Get all todo lists
-        todo_lists_response = await self.ms_graph_client.me.todo.lists.get()
-        for todo_list in todo_lists_response.value:
-            # Get tasks in each list
-            tasks_response = (
-                await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
-                    todo_list.id
-                ).tasks.get()
-            )
-            for task in tasks_response.value:
-                if task.due_date_time and task.due_date_time.date_time:
-                    due_date_time_str = task.due_date_time.date_time
-                    due_date_time_zone_str = task.due_date_time.time_zone or 'UTC'
-                    try:
-                        # Parse the date string
-                        due_date_naive = isoparse(due_date_time_str)
-
-                        # Attach timezone from the task's due date
-                        due_date_time_zone = ZoneInfo(due_date_time_zone_str)
-                        due_date = due_date_naive.replace(tzinfo=due_date_time_zone)
-
-                        # Convert due_date to CET
-                        due_date_cet = due_date.astimezone(cet_tz)
-                    except ValueError:
-                        # Handle parsing or time zone errors
-                        continue
-
-                    # Compare the date part only
-                    if due_date_cet.date() == today:
-                        formatted_task = self._format_task(task)
-                        formatted_tasks += formatted_task
-        return dedent(formatted_tasks)
-
-    async def alist_tasks_in_todo_list(self, todo_list_display_name: str) -> str:
-        # Get the todo list ID from the display name
-        todo_list_id = await self._aget_todo_list_id_by_display_name(todo_list_display_name)
-
-        if not todo_list_id:
-            raise ValueError(f"Todo list with display name '{todo_list_display_name}' not found.")
+    async def _arefresh_todo_list(self, todo_list_id: str):
+        """Apply the task changes of a list since its last delta link."""
+        delta_builder = self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
+            todo_list_id
+        ).tasks.delta
+        delta_link = self.todo_store.get_delta_link(todo_list_id)
+        if delta_link:
+            response = await delta_builder.with_url(delta_link).get()
+        else:
+            response = await delta_builder.get()
 
-        # Get the tasks in the specified todo list
-        tasks_response = await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(todo_list_id).tasks.get()
+        while response is not None:
+            for task in response.value or []:
+                if task.additional_data and "@removed" in task.additional_data:
+                    self.todo_store.remove(task.id)
+                else:
+                    self.todo_store.upsert(todo_list_id, task)
+            if response.odata_next_link:
+                response = await delta_builder.with_url(response.odata_next_link).get()
+                continue
+            self.todo_store.set_delta_link(todo_list_id, response.odata_delta_link)
+            break
 
-        tasks = tasks_response.value
+    def _forget_task_id(self, todo_list_id: str, task_id: str):
+        """
+        Remove a task ID from the title cache.
 
-        # Build a nicely formatted string containing task details
-        formatted_tasks = ""
-        for task in tasks:
-            formatted_task = self._format_task(task)
-            formatted_tasks += formatted_task
-        return dedent(formatted_tasks)
+        Returns the cached titles of the list the ID was removed from, or
+        None when it was not cached, so callers can re-add the ID without
+        reading an entry that may have expired meanwhile.
+        """
+        task_ids_by_title = self._task_ids_by_title.get(todo_list_id)
+        if task_ids_by_title is None:
+            return None
+        for title, task_ids in list(task_ids_by_title.items()):
+            if task_id in task_ids:
+                task_ids.remove(task_id)
+                if not task_ids:
+                    del task_ids_by_title[title]
+                return task_ids_by_title
+        return None
 
-    async def _aget_task_id_by_title(self, todo_list_id: str, task_title: str) -> str:
-        # Get the tasks in the specified todo list
-        tasks_response = await self.ms_graph_client.me.todo.lists.by_todo_task_list_id(
-            todo_list_id
-        ).tasks.get()
+    def _get_due_date_in_timezone(self, task: TodoTask, timezone: ZoneInfo):
+        """Return the due date of a task in the given time zone, or None."""
+        try:
+            return self._convert_date_time(task.due_date_time, timezone)
+        except ValueError:
+            # Handle parsing or time zone errors
+            return None
 
-        # Filter for the desired task title
-        task_id = next(
-            (task.id for task in tasks_response.value if task.title == task_title), None
-        )
-        return task_id
+    def _convert_date_time(self, date_time_time_zone, timezone: ZoneInfo):
+        """
+        Convert a Graph DateTimeTimeZone to an aware datetime in `timezone`.
 
-    async def _aget_todo_list_id_by_display_name(self, display_name) -> str:
-        todo_task_list_lists = await self.ms_graph_client.me.todo.lists.get()
-
-        # Filter for the desired display name
-        todo_task_list_id = next(
-            (
-                task_list.id
-                for task_list in todo_task_list_lists.value
-                if task_list.display_name == display_name
-            ),
-            None,
-        )
-        return todo_task_list_id
+        Returns None when no date is set and raises ValueError when the date
+        or its time zone cannot be read.
+        """
+        if not date_time_time_zone or not date_time_time_zone.date_time:
+            return None
+        try:
+            # Parse the date string and attach the time zone it was stored in
+            naive_date_time = _parse_graph_date_time(date_time_time_zone.date_time)
+            source_zone = _get_zone(date_time_time_zone.time_zone or 'UTC')
+        except (ValueError, ZoneInfoNotFoundError) as error:
+            raise ValueError(str(error))
+        return naive_date_time.replace(tzinfo=source_zone).astimezone(timezone)
 
     def get_tools(self):
         """
@@ -337,83 +1090,79 @@ class MSTodoToolKit:
             tools.append(tool_builder)
         return tools
 
-    def _format_task(self, task: TodoTask) -> str:
-        """Format a task object into a nicely formatted string with due date in CET."""
-        cet_tz = ZoneInfo('Europe/Paris')  # Central European Time
-
-        # Extract task properties, handling None values
-        title = task.title if task.title else 'No Title'
-        body_content = f"{task.body.content}" if task.body and task.body.content else 'No Content'
-
-        # Process due date to convert to CET
-        if task.due_date_time and task.due_date_time.date_time:
-            due_date_time_str = task.due_date_time.date_time
-            due_date_time_zone_str = task.due_date_time.time_zone or 'UTC'
-            try:
-                # Parse the date string
-                due_date_naive = isoparse(due_date_time_str)
-
-                # Attach timezone from the task's due date
-                due_date_time_zone = ZoneInfo(due_date_time_zone_str)
-                due_date = due_date_naive.replace(tzinfo=due_date_time_zone)
+    def _format_task(self, task: TodoTask, output_format: str = "markdown") -> str:
+        """Format a task as markdown, a one-row table or JSON, with dates in the toolkit's time zone."""
+        if output_format != "markdown":
+            return self._format_tasks([task], output_format)
+        fields = self._get_task_fields(task)
 
-                # Convert due_date to CET
-                due_date_cet = due_date.astimezone(cet_tz)
-                due_date_formatted = due_date_cet.strftime('%Y-%m-%d %H:%M:%S %Z')
-            except ValueError:
-                # Handle parsing or time zone errors
-                due_date_formatted = 'Invalid Due Date'
+        # Format attachments
+        if task.attachments:
+            attachments = ', '.join([attachment.name for attachment in task.attachments])
         else:
-            due_date_formatted = 'No Due Date'
+            attachments = 'No Attachments'
 
-        # Process completed date
-        if task.completed_date_time and task.completed_date_time.date_time:
-            completed_date_time_str = task.completed_date_time.date_time
-            completed_date_time_zone_str = task.completed_date_time.time_zone or 'UTC'
-            try:
-                # Parse the date string
-                completed_date_naive = isoparse(completed_date_time_str)
+        return (
+            f"\n# Title: {fields['title'] or 'No Title'}\n"
+            f"Due Date: {fields['due_date'] or 'No Due Date'}\n"
+            f"Completed Date: {fields['completed_date'] or 'Not Completed'}\n"
+            f"Status: {fields['status'] or 'No Status'}\n"
+            f"Body: \n```\n{fields['body'] or 'No Content'}\n```\n"
+            f"Attachments: {attachments}\n"
+            f"Linked Resources: {fields['linked_resources'] or 'No Linked Resources'}\n"
+            f"{'-'*40}\n"
+        )
 
-                # Attach timezone from the task's completed date
-                completed_date_time_zone = ZoneInfo(completed_date_time_zone_str)
-                completed_date = completed_date_naive.replace(tzinfo=completed_date_time_zone)
+    def _format_tasks(self, tasks: list, output_format: str = "markdown") -> str:
+        """
+        Format tasks for a listing.
 
-                # Convert completed_date to CET
-                completed_date_cet = completed_date.astimezone(cet_tz)
-                completed_date_formatted = completed_date_cet.strftime('%Y-%m-%d %H:%M:%S %Z')
-            except ValueError:
-                # Handle parsing or time zone errors
-                completed_date_formatted = 'Invalid Completed Date'
-        else:
-            completed_date_formatted = 'Not Completed'
+        'markdown' concatenates one block per task, 'table' renders one pipe
+        table row per task and 'json' a JSON array of task objects; the last
+        two use far fewer tokens.
+        """
+        if output_format not in TASK_OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format '{output_format}', expected one of {TASK_OUTPUT_FORMATS}."
+            )
+        if output_format == "markdown":
+            return "".join(self._format_task(task) for task in tasks)
 
-        status = task.status.value if task.status else 'No Status'
+        rows = [self._get_task_fields(task) for task in tasks]
+        if output_format == "json":
+            return json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+        # Task bodies are rendered in full, as in the other formats.
+        return render_table(
+            header=list(TASK_FIELDS),
+            columns=[[row[field] for row in rows] for field in TASK_FIELDS],
+            max_col_width=None,
+        )
 
-        # Format attachments
-        if task.attachments:
-            attachments = ', '.join([attachment.name for attachment in task.attachments])
-        else:
-            attachments = 'No Attachments'
+    def _get_task_fields(self, task: TodoTask) -> dict:
+        """Extract the displayed fields of a task, None when not set."""
+        timezone = _get_zone(self.timezone)
+        try:
+            due_date = self._convert_date_time(task.due_date_time, timezone)
+            due_date_formatted = due_date.strftime('%Y-%m-%d %H:%M:%S %Z') if due_date else None
+        except ValueError:
+            due_date_formatted = 'Invalid Due Date'
+        try:
+            completed_date = self._convert_date_time(task.completed_date_time, timezone)
+            completed_date_formatted = (
+                completed_date.strftime('%Y-%m-%d %H:%M:%S %Z') if completed_date else None
+            )
+        except ValueError:
+            completed_date_formatted = 'Invalid Completed Date'
 
-        # Format linked resources
-        if task.linked_resources:
-            linked_resources = ', '.join([resource.web_url for resource in task.linked_resources])
-        else:
-            linked_resources = 'No Linked Resources'
-
-        # Format the task details
-        formatted_task = dedent(f"""
-        # Title: {title}
-        Due Date: {due_date_formatted}
-        Completed Date: {completed_date_formatted}
-        Status: {status}
-        Body: 
-        ```
-        {body_content}
-        ```
-        Attachments: {attachments}
-        Linked Resources: {linked_resources}
-        {'-'*40}
-        """)
-
-        return formatted_task
\ No newline at end of file
+        return {
+            "title": task.title or None,
+            "due_date": due_date_formatted,
+            "status": task.status.value if task.status else None,
+            "completed_date": completed_date_formatted,
+            "body": task.body.content if task.body and task.body.content else None,
+            "linked_resources": (
+                ', '.join([resource.web_url for resource in task.linked_resources])
+                if task.linked_resources
+                else None
+            ),
+        }
@@ -8,7 +8,10 @@ Classes:
     CreateTaskInputSchema: Schema for creating a task.
     DeleteTaskInputSchema: Schema for deleting a task.
     CompleteTaskInputSchema: Schema for completing a task.
+    CreateTasksInputSchema: Schema for creating several tasks at once.
+    BulkTasksInputSchema: Schema for completing or deleting several tasks at once.
     ListTasksInTodoListInputSchema: Schema for listing tasks in a to-do list by display name.
+    QueryTasksByDueDateInputSchema: Schema for listing tasks by due date range.
 
 Variables:
     schema_mappings: A dictionary mapping method names to their descriptions and input schemas.
@@ -101,11 +104,82 @@ class CompleteTaskInputSchema(BaseModel):
         description="ID of the todo list containing the task. Required if 'todo_list_display_name' is not provided.",
     )
 
+class CreateTasksInputSchema(BaseModel):
+    tasks: list = Field(
+        ...,
+        description=(
+            "List of tasks to create. Each task is a dictionary with the key 'title' and "
+            "optionally 'html_content', 'due_date' and 'due_date_reminder' in 'YYYY-MM-DD' "
+            "format, 'categories_list', 'linked_resource_list' and 'todo_list_display_name' "
+            "to override the todo list of this task."
+        ),
+    )
+    todo_list_display_name: str = Field(
+        default="",
+        description="Display name of the todo list. Required if 'todo_list_id' is not provided."
+    )
+    todo_list_id: str = Field(
+        default="",
+        description="ID of the todo list. Required if 'todo_list_display_name' is not provided."
+    )
+
+
+class BulkTasksInputSchema(BaseModel):
+    task_titles: list = Field(
+        default_factory=list, description="Titles of the tasks."
+    )
+    task_ids: list = Field(
+        default_factory=list, description="IDs of the tasks."
+    )
+    todo_list_display_name: str = Field(
+        default="",
+        description="Display name of the todo list containing the tasks. Required if 'todo_list_id' is not provided.",
+    )
+    todo_list_id: str = Field(
+        default="",
+        description="ID of the todo list containing the tasks. Required if 'todo_list_display_name' is not provided.",
+    )
+
 class ListTasksDueToday(BaseModel):
-    pass  # No parameters needed
+    include_completed: bool = Field(
+        default=False, description="Whether to include tasks already completed."
+    )
+    output_format: str = Field(
+        default="markdown",
+        description="'markdown' for one block per task, or the more compact 'table' or 'json'.",
+    )
+
+class QueryTasksByDueDateInputSchema(BaseModel):
+    period: str = Field(
+        default="today",
+        description=(
+            "'overdue' (due before today), 'today', 'this_week' (Monday to Sunday), "
+            "or 'custom' for the range given by 'start_date' and 'end_date'."
+        ),
+    )
+    start_date: str = Field(
+        default="", description="First due day of a custom range in 'YYYY-MM-DD' format."
+    )
+    end_date: str = Field(
+        default="", description="Last due day of a custom range in 'YYYY-MM-DD' format."
+    )
+    todo_list_display_name: str = Field(
+        default="", description="Display name of a todo list to restrict the query to."
+    )
+    include_completed: bool = Field(
+        default=False, description="Whether to include tasks already completed."
+    )
+    output_format: str = Field(
+        default="markdown",
+        description="'markdown' for one block per task, or the more compact 'table' or 'json'.",
+    )
 
 class ListTasksInTodoListInputSchema(BaseModel):
     todo_list_display_name: str = Field(..., description="Display name of the to-do list")
+    output_format: str = Field(
+        default="markdown",
+        description="'markdown' for one block per task, or the more compact 'table' or 'json'.",
+    )
 
 schema_mappings = {
     "acreate_todo_list": {
@@ -128,10 +202,26 @@ schema_mappings = {
         "description": "Mark a task as completed by its ID or title.",
         "input_schema": CompleteTaskInputSchema,
     },
+    "acreate_tasks": {
+        "description": "Create several tasks at once and report the result of each.",
+        "input_schema": CreateTasksInputSchema,
+    },
+    "acomplete_tasks": {
+        "description": "Mark several tasks of a to-do list as completed by their IDs or titles and report the result of each.",
+        "input_schema": BulkTasksInputSchema,
+    },
+    "adelete_tasks": {
+        "description": "Delete several tasks of a to-do list by their IDs or titles and report the result of each.",
+        "input_schema": BulkTasksInputSchema,
+    },
     "alist_tasks_due_today": {
         "description": "List all tasks that are due today.",
         "input_schema": ListTasksDueToday,
     },
+    "aquery_tasks_by_due_date": {
+        "description": "List tasks that are overdue, due today, due this week or due in a date range, optionally in one to-do list.",
+        "input_schema": QueryTasksByDueDateInputSchema,
+    },
     "alist_tasks_in_todo_list": {
         "description": "List all tasks in a given to-do list by display name.",
         "input_schema": ListTasksInTodoListInputSchema,
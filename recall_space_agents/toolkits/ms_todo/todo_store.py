@@ -0,0 +1,149 @@
+"""
+In-memory store of todo tasks indexed by due date.
+
+The store is filled by the delta sync of `MSTodoToolKit` and keeps a list
+of (due timestamp, task ID) pairs sorted with `bisect`, so "overdue",
+"due today" or "due this week" questions are answered by two binary
+searches instead of a scan of every list.
+"""
+
+import bisect
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from msgraph.generated.models.task_status import TaskStatus
+from msgraph.generated.models.todo_task import TodoTask
+
+
+class TodoStore:
+    """
+    Tasks of all synced lists, with a sorted due date index and the delta
+    link of each list.
+
+    Args:
+        parse_due_date (Callable[[TodoTask], Optional[datetime]]): Returns the
+        timezone-aware due date of a task, or None when it has none.
+    """
+
+    def __init__(self, parse_due_date):
+        self._parse_due_date = parse_due_date
+        # Task ID -> (todo list ID, task).
+        self._tasks: Dict[str, Tuple[str, TodoTask]] = {}
+        # Sorted (due timestamp, task ID) pairs of tasks with a due date.
+        self._due_index: List[Tuple[float, str]] = []
+        self._due_timestamps: Dict[str, float] = {}
+        self._delta_links: Dict[str, str] = {}
+        self.list_names: Dict[str, str] = {}
+        self.synced_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def upsert(self, todo_list_id: str, task: TodoTask):
+        """
+        Insert or replace a task and its due date index entry.
+        """
+        self.remove(task.id)
+        self._tasks[task.id] = (todo_list_id, task)
+        due_date = self._parse_due_date(task)
+        if due_date is not None:
+            timestamp = due_date.timestamp()
+            self._due_timestamps[task.id] = timestamp
+            bisect.insort(self._due_index, (timestamp, task.id))
+
+    def remove(self, task_id: str):
+        """
+        Remove a task, if stored.
+        """
+        if self._tasks.pop(task_id, None) is None:
+            return
+        timestamp = self._due_timestamps.pop(task_id, None)
+        if timestamp is not None:
+            position = bisect.bisect_left(self._due_index, (timestamp, task_id))
+            if (
+                position < len(self._due_index)
+                and self._due_index[position] == (timestamp, task_id)
+            ):
+                del self._due_index[position]
+
+    def remove_list(self, todo_list_id: str):
+        """
+        Remove a todo list, its tasks and its delta link.
+        """
+        for task_id in [
+            task_id
+            for task_id, (list_id, _) in self._tasks.items()
+            if list_id == todo_list_id
+        ]:
+            self.remove(task_id)
+        self._delta_links.pop(todo_list_id, None)
+        self.list_names.pop(todo_list_id, None)
+
+    def get_delta_link(self, todo_list_id: str) -> Optional[str]:
+        """
+        Get the delta link saved by the last sync of a list.
+        """
+        return self._delta_links.get(todo_list_id)
+
+    def set_delta_link(self, todo_list_id: str, delta_link: Optional[str]):
+        """
+        Save, or with None forget, the delta link of a list.
+        """
+        if delta_link:
+            self._delta_links[todo_list_id] = delta_link
+        else:
+            self._delta_links.pop(todo_list_id, None)
+
+    def mark_synced(self):
+        """
+        Record that all lists were just synced.
+        """
+        self.synced_at = time.monotonic()
+
+    def is_fresh(self, max_staleness_seconds: float) -> bool:
+        """
+        Whether the last full sync is at most `max_staleness_seconds` old.
+        """
+        return (
+            self.synced_at is not None
+            and time.monotonic() - self.synced_at <= max_staleness_seconds
+        )
+
+    def query_due(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        todo_list_id: Optional[str] = None,
+        include_completed: bool = False,
+    ) -> List[Tuple[str, TodoTask]]:
+        """
+        Return tasks due in [start, end), ordered by due date.
+
+        Args:
+            start (datetime, optional): Inclusive, timezone-aware lower bound;
+            unbounded when omitted.
+            end (datetime, optional): Exclusive, timezone-aware upper bound;
+            unbounded when omitted.
+            todo_list_id (str, optional): Restrict to one list.
+            include_completed (bool): Whether to keep completed tasks.
+
+        Returns:
+            List[Tuple[str, TodoTask]]: The todo list ID and task of each match.
+        """
+        low = 0
+        if start is not None:
+            low = bisect.bisect_left(self._due_index, (start.timestamp(), ""))
+        high = len(self._due_index)
+        if end is not None:
+            high = bisect.bisect_left(self._due_index, (end.timestamp(), ""))
+
+        matches = []
+        for _, task_id in self._due_index[low:high]:
+            list_id, task = self._tasks[task_id]
+            if todo_list_id is not None and list_id != todo_list_id:
+                continue
+            if not include_completed and task.status == TaskStatus.Completed:
+                continue
+            matches.append((list_id, task))
+        return matches
@@ -2,11 +2,20 @@
     Helper script to format pandas dataframe to markdown
 """
 
+from typing import Optional
+
 import pandas
-from tabulate import tabulate
+
+from recall_space_agents.utils.table_renderer import render_table
 
 
-def dataframe_to_markdown(data: pandas.DataFrame):
+def dataframe_to_markdown(
+    data: pandas.DataFrame,
+    max_rows: Optional[int] = None,
+    max_col_width: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    table_format: str = "markdown",
+):
     """
     Process a pandas dataframe into markdown.
 
@@ -14,22 +23,28 @@ def dataframe_to_markdown(data: pandas.DataFrame):
     ----------
     data :  pandas.DataFrame
         Dataframe to be formatted.
+    max_rows : int, optional
+        Maximum number of rows to render; a summary line counts the rest.
+    max_col_width : int, optional
+        Maximum number of characters of a cell; longer cells are truncated.
+        By default cells are rendered in full.
+    max_chars : int, optional
+        Maximum number of characters of the table.
+    table_format : str
+        'markdown' for a pipe table or 'csv'.
 
     Returns
     -------
     str
         markdown string format of dataframe.
     """
-    try:
-        markdown_table = tabulate(
-            data, headers="keys", tablefmt="grid", showindex=False, maxcolwidths=60
-        )
-    except Exception as error:
-        markdown_table = tabulate(
-            data,
-            headers="keys",
-            tablefmt="grid",
-            showindex=False,
-        )
+    markdown_table = render_table(
+        header=list(data.columns),
+        columns=[data.iloc[:, position].tolist() for position in range(data.shape[1])],
+        table_format=table_format,
+        max_rows=max_rows,
+        max_col_width=max_col_width,
+        max_chars=max_chars,
+    )
     markdown_table = f"\n {markdown_table} \n"
-    return markdown_table
\ No newline at end of file
+    return markdown_table
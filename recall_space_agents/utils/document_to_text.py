@@ -0,0 +1,129 @@
+"""
+    Helper script to extract text from PDF, DOCX and XLSX documents
+"""
+
+import io
+from typing import Optional
+
+import openpyxl
+from docx import Document
+from PyPDF2 import PdfReader
+
+SUPPORTED_DOCUMENT_EXTENSIONS = (".pdf", ".docx", ".xlsx")
+
+
+def extract_text_from_pdf(binary_content: bytes) -> str:
+    """
+    Extract text from a PDF file.
+
+    Parameters
+    ----------
+    binary_content : bytes
+        The binary content of the PDF file.
+
+    Returns
+    -------
+    str
+        The extracted text content of the PDF.
+    """
+    with io.BytesIO(binary_content) as f:
+        reader = PdfReader(f)
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text()
+    return text
+
+
+def extract_text_from_docx(binary_content: bytes) -> str:
+    """
+    Extract text from a DOCX file.
+
+    Parameters
+    ----------
+    binary_content : bytes
+        The binary content of the DOCX file.
+
+    Returns
+    -------
+    str
+        The extracted text content of the DOCX.
+    """
+    with io.BytesIO(binary_content) as f:
+        document = Document(f)
+        text = "\n".join([para.text for para in document.paragraphs])
+    return text
+
+
+def extract_text_from_xlsx(binary_content: bytes) -> str:
+    """
+    Extract text from an XLSX file.
+
+    Parameters
+    ----------
+    binary_content : bytes
+        The binary content of the XLSX file.
+
+    Returns
+    -------
+    str
+        The extracted text content of the XLSX, one line per row.
+    """
+    with io.BytesIO(binary_content) as f:
+        # Not read-only: read-only mode trusts the stored sheet dimensions,
+        # which can be wrong and truncate rows.
+        workbook = openpyxl.load_workbook(f, data_only=True)
+        text = ""
+        for sheetname in workbook.sheetnames:
+            sheet = workbook[sheetname]
+            for row in sheet.iter_rows(values_only=True):
+                row_text = " ".join(
+                    [str(cell) if cell is not None else "" for cell in row]
+                )
+                text += f"{row_text}\n"
+        workbook.close()
+    return text
+
+
+def is_supported_document(file_name: str) -> bool:
+    """
+    Whether text can be extracted from a file, judged by its extension.
+    """
+    return bool(file_name) and file_name.lower().endswith(SUPPORTED_DOCUMENT_EXTENSIONS)
+
+
+def extract_text_from_document(
+    file_name: str, binary_content: bytes, max_chars: Optional[int] = None
+) -> Optional[str]:
+    """
+    Extract text from a document, choosing the extractor by file extension.
+
+    Parameters
+    ----------
+    file_name : str
+        Name of the file, used to detect its type.
+    binary_content : bytes
+        The binary content of the file.
+    max_chars : int, optional
+        Maximum number of characters returned; longer text is cut and ends
+        with a note stating how many characters were left out.
+
+    Returns
+    -------
+    str or None
+        The extracted text, or None when the file type is not supported.
+    """
+    lowered_name = (file_name or "").lower()
+    if lowered_name.endswith(".pdf"):
+        text = extract_text_from_pdf(binary_content)
+    elif lowered_name.endswith(".docx"):
+        text = extract_text_from_docx(binary_content)
+    elif lowered_name.endswith(".xlsx"):
+        text = extract_text_from_xlsx(binary_content)
+    else:
+        return None
+
+    if max_chars is not None and len(text) > max_chars:
+        omitted_chars = len(text) - max_chars
+        text = f"{text[:max_chars]}\n... [{omitted_chars} more characters omitted]"
+    return text
+
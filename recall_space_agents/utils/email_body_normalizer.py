@@ -0,0 +1,228 @@
+"""
+    Helper script to strip quoted replies, forwarded headers and signatures
+    from plain text email bodies
+"""
+
+import re
+from typing import Dict, List
+
+# Lines starting the quoted history of a reply; everything after is dropped.
+_QUOTE_START_PATTERNS = [
+    re.compile(r"^on\b.{0,200}\bwrote:\s*$", re.IGNORECASE),
+    re.compile(r"^am\b.{0,200}\bschrieb.{0,100}:\s*$", re.IGNORECASE),
+    re.compile(r"^le\b.{0,200}\ba écrit\s*:\s*$", re.IGNORECASE),
+    re.compile(r"^-{2,}\s*(original message|ursprüngliche nachricht)\s*-{2,}\s*$", re.IGNORECASE),
+    re.compile(r"^_{10,}\s*$"),
+]
+# Outlook quotes the previous message under a header block such as
+# "From: ... / Sent: ..."; a "From:" line followed closely by one of these
+# header lines starts the quoted history.
+_HEADER_FROM = re.compile(r"^\*?(from|von|de)\s*:\*?\s", re.IGNORECASE)
+_HEADER_FOLLOWING = re.compile(
+    r"^\*?(sent|date|to|subject|gesendet|datum|an|betreff|envoyé|objet)\s*:\*?\s",
+    re.IGNORECASE,
+)
+# Markers of a forwarded message; the marker and its header lines are
+# dropped but the forwarded text is kept.
+_FORWARD_MARKER = re.compile(
+    r"^(-{2,}\s*(forwarded message|weitergeleitete nachricht)\s*-{2,}"
+    r"|begin forwarded message:)\s*$",
+    re.IGNORECASE,
+)
+_FORWARD_HEADER = re.compile(
+    r"^\*?(from|date|sent|subject|to|cc|von|datum|gesendet|betreff|an)\s*:", re.IGNORECASE
+)
+# Lines starting a signature; everything after is dropped.
+_SIGNATURE_START_PATTERNS = [
+    re.compile(r"^--\s?$"),
+    re.compile(r"^(sent from my|sent from outlook|get outlook for|von meinem .{0,40} gesendet)", re.IGNORECASE),
+]
+# Closing formulas, only treated as a signature start near the end of a body.
+_CLOSING = re.compile(
+    r"^(best|kind|warm|many thanks and|with best)?\s*(regards|wishes)\b.{0,20}$"
+    r"|^(cheers|thanks|thank you|best|sincerely|yours sincerely)\s*[,!.]?\s*$"
+    r"|^(mit )?(freundlichen|besten|viele|beste|liebe) grüßen?\b.{0,20}$"
+    r"|^(lg|vg|mfg|cordialement)\s*[,!.]?\s*$",
+    re.IGNORECASE,
+)
+# Maximum number of lines after a closing formula for it to count as one.
+MAX_SIGNATURE_LINES = 10
+# Longest line accepted in a signature, e.g. a name, title or phone number.
+MAX_SIGNATURE_LINE_CHARS = 60
+# Sentences end with punctuation and have a few words; signature lines rarely.
+_SENTENCE = re.compile(r"^(\S+\s+){3,}.*[.?!:]$")
+
+
+def _find_quote_start(lines: List[str]) -> int:
+    """
+    Position of the first line of the quoted history, or len(lines).
+    """
+    for position, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith(">"):
+            return position
+        # "On <date>, <name> wrote:" is often wrapped over two lines.
+        joined = f"{stripped} {lines[position + 1].strip()}" if position + 1 < len(lines) else stripped
+        for pattern in _QUOTE_START_PATTERNS:
+            if pattern.match(stripped) or (
+                stripped.lower().startswith(("on ", "am ")) and pattern.match(joined)
+            ):
+                return position
+        if _HEADER_FROM.match(stripped) and any(
+            _HEADER_FOLLOWING.match(each.strip()) for each in lines[position + 1 : position + 5]
+        ):
+            return position
+    return len(lines)
+
+
+def _remove_forward_headers(lines: List[str]) -> List[str]:
+    """
+    Drop forward markers and the header lines following them.
+    """
+    kept = []
+    in_header = False
+    for line in lines:
+        stripped = line.strip()
+        if _FORWARD_MARKER.match(stripped):
+            in_header = True
+            continue
+        if in_header:
+            if _FORWARD_HEADER.match(stripped):
+                continue
+            if not stripped:
+                in_header = False
+                continue
+            in_header = False
+        kept.append(line)
+    return kept
+
+
+def _is_signature_line(line: str) -> bool:
+    """
+    Whether a line can belong to a signature: blank, or short and not a
+    sentence, like a name, a title, a company or a phone number.
+    """
+    stripped = line.strip()
+    return not stripped or (
+        len(stripped) <= MAX_SIGNATURE_LINE_CHARS and not _SENTENCE.match(stripped)
+    )
+
+
+def _find_signature_start(lines: List[str]) -> int:
+    """
+    Position of the first line of the signature, or len(lines).
+
+    A signature marker such as '--' starts the signature wherever it is. A
+    closing formula such as 'Best,' only does when every line after it is a
+    short signature line, so lines are scanned from the end and the scan
+    stops at the first line of body text; closings inside the body, e.g. a
+    'Thanks!' before a request, are kept.
+    """
+    signature_start = len(lines)
+    for position, line in enumerate(lines):
+        if any(pattern.match(line.strip()) for pattern in _SIGNATURE_START_PATTERNS):
+            signature_start = position
+            break
+
+    for position in range(len(lines) - 1, -1, -1):
+        stripped = lines[position].strip()
+        if _CLOSING.match(stripped) and len(lines) - position - 1 <= MAX_SIGNATURE_LINES:
+            signature_start = min(signature_start, position)
+        elif not _is_signature_line(stripped):
+            break
+    return signature_start
+
+
+def normalize_email_body(
+    text: str, strip_quoted: bool = True, strip_signature: bool = True
+) -> str:
+    """
+    Keep only the new content of a plain text email body.
+
+    Quoted replies ("On ... wrote:", "-----Original Message-----", Outlook
+    "From:/Sent:" blocks, "> " lines) and everything after them are
+    removed, forward markers and their headers are dropped, and trailing
+    signatures are cut. When nothing would remain, for instance a bare
+    forward, the body is returned unchanged.
+
+    Parameters
+    ----------
+    text : str
+        The plain text email body.
+    strip_quoted : bool
+        Whether to remove quoted replies and forward headers.
+    strip_signature : bool
+        Whether to remove the signature.
+
+    Returns
+    -------
+    str
+        The new content of the email.
+    """
+    if not text:
+        return ""
+    lines = text.split("\n")
+    if strip_quoted:
+        lines = _remove_forward_headers(lines)
+        lines = lines[: _find_quote_start(lines)]
+    if strip_signature:
+        lines = lines[: _find_signature_start(lines)]
+    normalized = "\n".join(lines).strip()
+    return normalized or text.strip()
+
+
+def group_emails_by_conversation(emails: List[Dict]) -> List[Dict]:
+    """
+    Collapse emails into conversations of deduplicated turns.
+
+    Parameters
+    ----------
+    emails : List[Dict]
+        Emails with `conversation_id`, `subject`, `from`,
+        `received_date_time` and `body` (or `body_preview`).
+
+    Returns
+    -------
+    List[Dict]
+        One dict per conversation with its ID, subject and turns, oldest
+        turn first. Conversations are ordered by latest activity first.
+        Turns repeating the sender and text of an earlier turn are dropped.
+    """
+    conversations: Dict[str, Dict] = {}
+    for email in emails:
+        conversation_id = email.get("conversation_id") or email.get("id")
+        conversation = conversations.setdefault(
+            conversation_id,
+            {"conversation_id": conversation_id, "subject": email.get("subject", ""), "turns": []},
+        )
+        conversation["turns"].append(
+            {
+                key: value
+                for key, value in email.items()
+                if key not in ("conversation_id", "subject")
+            }
+        )
+
+    grouped = []
+    for conversation in conversations.values():
+        turns = sorted(
+            conversation["turns"], key=lambda each: each.get("received_date_time") or ""
+        )
+        seen = set()
+        unique_turns = []
+        for turn in turns:
+            text = turn.get("body", turn.get("body_preview", ""))
+            fingerprint = (turn.get("from"), " ".join(text.split()).casefold())
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            unique_turns.append(turn)
+        conversation["turns"] = unique_turns
+        grouped.append(conversation)
+
+    grouped.sort(
+        key=lambda each: each["turns"][-1].get("received_date_time") or "", reverse=True
+    )
+    return grouped
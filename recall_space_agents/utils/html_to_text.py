@@ -0,0 +1,85 @@
+"""
+    Helper script to convert HTML, such as email bodies, to plain text
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List
+
+# Elements whose content is never shown to a reader.
+SKIPPED_TAGS = {"script", "style", "head", "title", "noscript", "template"}
+# Elements that start a new line in rendered text.
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "tbody", "tfoot", "thead", "tr", "ul",
+}
+CELL_TAGS = {"td", "th"}
+
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t\f\v\u00a0\u200b]+")
+_EXCESS_NEWLINES = re.compile(r"\n{3,}")
+
+
+class _TextExtractor(HTMLParser):
+    """
+    HTML parser collecting the visible text of a document.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag in CELL_TAGS:
+            self.parts.append("\t")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in ("br", "hr"):
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in BLOCK_TAGS and tag != "li":
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convert HTML to readable plain text.
+
+    Script, style and head blocks are dropped, block elements become line
+    breaks, runs of spaces are collapsed and at most one blank line is kept
+    between paragraphs.
+
+    Parameters
+    ----------
+    html : str
+        The HTML document or fragment.
+
+    Returns
+    -------
+    str
+        The visible text of the document.
+    """
+    if not html:
+        return ""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    text = "".join(extractor.parts).replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_HORIZONTAL_WHITESPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return _EXCESS_NEWLINES.sub("\n\n", "\n".join(lines)).strip()
+
@@ -0,0 +1,120 @@
+"""
+    Helper script to pace requests to throttled APIs such as Microsoft Graph
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def retry_after_seconds(
+    headers: Optional[Mapping[str, str]], default: float
+) -> float:
+    """
+    Read the delay requested by a `Retry-After` header.
+
+    Parameters
+    ----------
+    headers : Mapping[str, str], optional
+        Response headers; the lookup ignores case.
+    default : float
+        Delay returned when the header is missing or invalid.
+
+    Returns
+    -------
+    float
+        The delay in seconds, never negative.
+    """
+    value = None
+    for key, each in (headers or {}).items():
+        if key.lower() == "retry-after":
+            value = each[0] if isinstance(each, (list, tuple, set)) else each
+            break
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiting the rate and concurrency of requests.
+
+    Use it as `async with limiter:` around each request. When the server
+    throttles a request, call `pause` with the `Retry-After` delay: every
+    request waits for the pause to end, not only the throttled one.
+
+    Parameters
+    ----------
+    rate_per_second : float
+        Sustained number of requests per second.
+    max_concurrency : int
+        Maximum number of requests in flight.
+    burst : int, optional
+        Number of requests allowed at once after an idle period; defaults
+        to `max_concurrency`.
+    """
+
+    def __init__(
+        self, rate_per_second: float, max_concurrency: int = 4, burst: Optional[int] = None
+    ):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive.")
+        self.rate_per_second = rate_per_second
+        self.capacity = float(burst or max_concurrency)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """
+        Hold all requests for `seconds`, e.g. after a 429 response.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """
+        Wait for a concurrency slot and a token.
+        """
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._paused_until:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    self._tokens = min(
+                        self.capacity,
+                        self._tokens + (now - self._updated_at) * self.rate_per_second,
+                    )
+                    self._updated_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self):
+        """
+        Free the concurrency slot taken by `acquire`.
+        """
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.release()
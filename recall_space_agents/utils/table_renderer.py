@@ -0,0 +1,158 @@
+"""
+    Helper script to render tables as pipe-markdown or CSV under size budgets
+"""
+
+import csv
+import io
+import math
+from typing import Any, List, Optional, Tuple
+
+TABLE_FORMATS = ("markdown", "csv")
+
+
+def _cell_to_text(value: Any, max_col_width: Optional[int]) -> str:
+    """
+    Convert a cell value to text, truncated to the column width budget.
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    text = str(value)
+    if max_col_width is not None and len(text) > max_col_width:
+        text = text[: max(max_col_width - 1, 0)] + "…"
+    return text
+
+
+def _markdown_line(cells: List[str]) -> str:
+    """
+    Join cells into a pipe-markdown line, escaping what would break the table.
+    """
+    escaped = [
+        cell.replace("|", "\\|").replace("\r", " ").replace("\n", " ") for cell in cells
+    ]
+    return "| " + " | ".join(escaped) + " |"
+
+
+def _csv_line(cells: List[str]) -> str:
+    """
+    Join cells into a CSV line.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(cells)
+    return buffer.getvalue()
+
+
+def render_table_rows(
+    header: List[Any],
+    columns: List[List[Any]],
+    table_format: str = "markdown",
+    max_rows: Optional[int] = None,
+    max_col_width: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Tuple[List[str], int]:
+    """
+    Render column arrays as table lines, without the omitted rows summary.
+
+    Used by callers that report omitted rows themselves, for instance as
+    the offset of the next page.
+
+    Parameters
+    ----------
+    header : List[Any]
+        Column names.
+    columns : List[List[Any]]
+        Column values, one list per column, all of the same length.
+    table_format : str
+        'markdown' for a pipe table or 'csv'.
+    max_rows : int, optional
+        Maximum number of data rows to render.
+    max_col_width : int, optional
+        Maximum number of characters of a cell; longer cells are truncated.
+        By default cells are rendered in full.
+    max_chars : int, optional
+        Maximum number of characters of the rendered lines.
+
+    Returns
+    -------
+    Tuple[List[str], int]
+        The header and data lines, and the number of data rows rendered.
+    """
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(
+            f"Unknown table format '{table_format}', expected one of {TABLE_FORMATS}."
+        )
+    render_line = _markdown_line if table_format == "markdown" else _csv_line
+
+    total_rows = len(columns[0]) if columns else 0
+    row_limit = total_rows if max_rows is None else min(max_rows, total_rows)
+
+    header_cells = [_cell_to_text(each, max_col_width) for each in header]
+    lines = [render_line(header_cells)]
+    if table_format == "markdown":
+        lines.append("|" + "|".join("---" for _ in header_cells) + "|")
+    used_chars = sum(len(each) + 1 for each in lines)
+
+    rendered_rows = 0
+    for row in zip(*columns):
+        if rendered_rows >= row_limit:
+            break
+        line = render_line([_cell_to_text(each, max_col_width) for each in row])
+        if max_chars is not None and used_chars + len(line) + 1 > max_chars:
+            break
+        lines.append(line)
+        used_chars += len(line) + 1
+        rendered_rows += 1
+    return lines, rendered_rows
+
+
+def render_table(
+    header: List[Any],
+    columns: List[List[Any]],
+    table_format: str = "markdown",
+    max_rows: Optional[int] = None,
+    max_col_width: Optional[int] = None,
+    max_chars: Optional[int] = None,
+):
+    """
+    Render column arrays as a pipe-markdown or CSV table.
+
+    Rows are rendered one at a time, so budgets stop the work early instead
+    of trimming a fully rendered table. When rows are left out, a summary
+    line states how many.
+
+    Parameters
+    ----------
+    header : List[Any]
+        Column names.
+    columns : List[List[Any]]
+        Column values, one list per column, all of the same length.
+    table_format : str
+        'markdown' for a pipe table or 'csv'.
+    max_rows : int, optional
+        Maximum number of data rows to render.
+    max_col_width : int, optional
+        Maximum number of characters of a cell; longer cells are truncated.
+        By default cells are rendered in full.
+    max_chars : int, optional
+        Maximum number of characters of the rendered table, summary excluded.
+
+    Returns
+    -------
+    str
+        The rendered table.
+    """
+    lines, rendered_rows = render_table_rows(
+        header=header,
+        columns=columns,
+        table_format=table_format,
+        max_rows=max_rows,
+        max_col_width=max_col_width,
+        max_chars=max_chars,
+    )
+    total_rows = len(columns[0]) if columns else 0
+    omitted_rows = total_rows - rendered_rows
+    if omitted_rows > 0:
+        lines.append(
+            f"... {omitted_rows} more rows omitted "
+            f"(showing {rendered_rows} of {total_rows})"
+        )
+    return "\n".join(lines)
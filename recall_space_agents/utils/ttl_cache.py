@@ -0,0 +1,72 @@
+"""
+    Helper script with a small in-memory cache whose entries expire
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Mapping whose entries expire `ttl_seconds` after they were set.
+
+    The least recently set entry is evicted once `max_entries` is reached.
+
+    Parameters
+    ----------
+    ttl_seconds : float
+        Lifetime of an entry.
+    max_entries : int
+        Maximum number of entries kept.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value of a live entry, or `default`.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Set an entry, restarting its lifetime.
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> Optional[Any]:
+        """
+        Remove an entry, returning its value if it was live.
+        """
+        value = self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_MISSING = object()
@@ -12,7 +12,7 @@ setup(
     author="Recall Space",
     author_email="info@recall.space",
     license="Open source",
-    packages=find_namespace_packages(exclude=["tests"]),
+    packages=find_namespace_packages(exclude=["tests", "benchmarks"]),
     zip_safe=False,
     include_package_data=True,
     install_requires=[
@@ -35,10 +35,12 @@ setup(
     extras_require={
         "postgresql": ["psycopg[binary,pool]","langgraph-checkpoint-postgres"],
         "microsoft_graph": ["msgraph-sdk"],
+        "analytics": ["pyarrow"],
         "all": [
             "psycopg[binary,pool]",
             "langgraph-checkpoint-postgres ",
             "msgraph-sdk",
+            "pyarrow",
         ],
     },
     test_suite="tests",
@@ -0,0 +1,38 @@
+import unittest
+
+from recall_space_agents.utils.email_body_normalizer import normalize_email_body
+
+
+class TestNormalizeEmailBody(unittest.TestCase):
+    def test_closing_inside_body_is_kept(self):
+        text = (
+            "Hi Anna,\nThanks!\nCan you send PO 4711 by Friday?\n"
+            "We need 200 units.\n\nBest,\nBob"
+        )
+        self.assertEqual(
+            normalize_email_body(text),
+            "Hi Anna,\nThanks!\nCan you send PO 4711 by Friday?\nWe need 200 units.",
+        )
+
+    def test_closing_followed_by_signature_lines_is_cut(self):
+        text = (
+            "Please confirm the delivery date.\n\nBest regards,\nBob Miller\n"
+            "Purchasing Manager\nACME GmbH\nPhone: +49 30 1234567"
+        )
+        self.assertEqual(normalize_email_body(text), "Please confirm the delivery date.")
+
+    def test_closing_followed_by_body_text_is_kept(self):
+        text = "Thanks,\nthe invoice is attached and the total is due next week."
+        self.assertEqual(normalize_email_body(text), text)
+
+    def test_signature_marker_is_cut(self):
+        text = "Hi,\nsee attached.\n--\nBob\nSent from my iPhone"
+        self.assertEqual(normalize_email_body(text), "Hi,\nsee attached.")
+
+    def test_quoted_reply_is_cut(self):
+        text = "Works for me.\n\nOn Mon, 3 Jun 2024, Anna wrote:\n> Can we meet?"
+        self.assertEqual(normalize_email_body(text), "Works for me.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from recall_space_agents.utils.table_renderer import render_table, render_table_rows
+
+
+class TestRenderTable(unittest.TestCase):
+    def setUp(self):
+        self.header = ["id", "note"]
+        self.columns = [[1, 2, 3], ["a|b", "line\nbreak", None]]
+
+    def test_full_table(self):
+        self.assertEqual(
+            render_table(self.header, self.columns),
+            "| id | note |\n|---|---|\n| 1 | a\\|b |\n| 2 | line break |\n| 3 |  |",
+        )
+
+    def test_row_budget_reports_omitted_rows(self):
+        table = render_table(self.header, self.columns, max_rows=1)
+        self.assertTrue(table.endswith("... 2 more rows omitted (showing 1 of 3)"))
+
+    def test_char_budget_stops_at_last_fitting_row(self):
+        lines, rendered_rows = render_table_rows(
+            self.header, self.columns, table_format="csv", max_chars=15
+        )
+        self.assertEqual((lines, rendered_rows), (["id,note", "1,a|b"], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime, timezone
+
+from msgraph.generated.models.task_status import TaskStatus
+from msgraph.generated.models.todo_task import TodoTask
+
+from recall_space_agents.toolkits.ms_todo.todo_store import TodoStore
+
+
+def make_task(task_id, day=None, completed=False):
+    task = TodoTask(
+        id=task_id,
+        title=task_id,
+        status=TaskStatus.Completed if completed else TaskStatus.NotStarted,
+    )
+    task.due_day = day
+    return task
+
+
+def due_date(task):
+    if task.due_day is None:
+        return None
+    return datetime(2024, 6, task.due_day, 12, tzinfo=timezone.utc)
+
+
+def day_start(day):
+    return datetime(2024, 6, day, tzinfo=timezone.utc)
+
+
+def task_ids(matches):
+    return [task.id for _, task in matches]
+
+
+class TestTodoStore(unittest.TestCase):
+    def setUp(self):
+        self.store = TodoStore(due_date)
+        self.store.upsert("list-a", make_task("a3", 3))
+        self.store.upsert("list-a", make_task("a1", 1))
+        self.store.upsert("list-b", make_task("b2", 2))
+        self.store.upsert("list-b", make_task("b5", 5, completed=True))
+        self.store.upsert("list-b", make_task("b-none"))
+
+    def test_query_is_ordered_by_due_date(self):
+        self.assertEqual(task_ids(self.store.query_due()), ["a1", "b2", "a3"])
+
+    def test_query_range_is_half_open(self):
+        self.assertEqual(task_ids(self.store.query_due(day_start(2), day_start(3))), ["b2"])
+        self.assertEqual(task_ids(self.store.query_due(end=day_start(3))), ["a1", "b2"])
+        self.assertEqual(task_ids(self.store.query_due(start=day_start(3))), ["a3"])
+
+    def test_query_filters_list_and_completed(self):
+        self.assertEqual(task_ids(self.store.query_due(todo_list_id="list-b")), ["b2"])
+        self.assertEqual(
+            task_ids(self.store.query_due(todo_list_id="list-b", include_completed=True)),
+            ["b2", "b5"],
+        )
+
+    def test_upsert_moves_changed_due_date(self):
+        self.store.upsert("list-a", make_task("a1", 4))
+        self.assertEqual(task_ids(self.store.query_due()), ["b2", "a3", "a1"])
+        self.assertEqual(len(self.store), 5)
+
+    def test_remove(self):
+        self.store.remove("b2")
+        self.store.remove("unknown")
+        self.assertEqual(task_ids(self.store.query_due()), ["a1", "a3"])
+        self.assertEqual(len(self.store), 4)
+
+    def test_remove_list(self):
+        self.store.set_delta_link("list-b", "https://graph.microsoft.com/delta")
+        self.store.list_names["list-b"] = "Work"
+        self.store.remove_list("list-b")
+        self.assertEqual(task_ids(self.store.query_due(include_completed=True)), ["a1", "a3"])
+        self.assertEqual(len(self.store), 2)
+        self.assertIsNone(self.store.get_delta_link("list-b"))
+        self.assertNotIn("list-b", self.store.list_names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import asyncio
+import unittest
+
+from azure.identity import ClientSecretCredential
+
+from recall_space_agents.toolkits.ms_site_workbook.ms_site_workbook import (
+    MSSiteWorkbookToolKit, _bulk_write_session_ids)
+from recall_space_agents.toolkits.ms_site_workbook.write_queue import (
+    WorkbookWriteQueue, coalesce_cell_updates)
+
+
+class RecordingWriter:
+    """Range writer recording each flush, failing the listed addresses."""
+
+    def __init__(self, failing_addresses=(), delay=0.0):
+        self.flushes = []
+        self.failing_addresses = set(failing_addresses)
+        self.delay = delay
+
+    async def __call__(self, range_writes):
+        self.flushes.append(range_writes)
+        await asyncio.sleep(self.delay)
+        return [
+            Exception(f"Failed {address}") if address in self.failing_addresses else None
+            for _, address, _ in range_writes
+        ]
+
+
+class TestCoalesceCellUpdates(unittest.TestCase):
+    def test_block_of_cells_becomes_one_rectangle(self):
+        range_writes = coalesce_cell_updates(
+            {"B3": 4, "A2": 1, "B2": 2, "A3": 3}
+        )
+        self.assertEqual(
+            range_writes, [("A2:B3", [[1, 2], [3, 4]], ["A2", "B2", "A3", "B3"])]
+        )
+
+    def test_rows_of_different_widths_are_not_stacked(self):
+        range_writes = coalesce_cell_updates({"A1": 1, "B1": 2, "A2": 3, "D5": 4})
+        self.assertCountEqual(
+            [(address, values) for address, values, _ in range_writes],
+            [("A1:B1", [[1, 2]]), ("A2", [[3]]), ("D5", [[4]])],
+        )
+
+    def test_non_cell_addresses_are_written_alone(self):
+        range_writes = coalesce_cell_updates({"A1:B2": [[1]], "C1": 2})
+        self.assertEqual(
+            [address for address, _, _ in range_writes], ["A1:B2", "C1"]
+        )
+
+    def test_columns_beyond_z(self):
+        range_writes = coalesce_cell_updates({"Z1": 1, "AA1": 2, "AB1": 3})
+        self.assertEqual([address for address, _, _ in range_writes], ["Z1:AB1"])
+
+
+class TestWorkbookWriteQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_threshold_triggers_flush(self):
+        writer = RecordingWriter()
+        queue = WorkbookWriteQueue(writer, max_pending_cells=2, flush_delay=60)
+        futures = [queue.enqueue("sheet", "A1", 1), queue.enqueue("sheet", "A2", 2)]
+        await asyncio.wait_for(asyncio.gather(*futures), timeout=1)
+        self.assertEqual(writer.flushes, [[("sheet", "A1:A2", [[1], [2]])]])
+
+    async def test_delay_triggers_flush(self):
+        writer = RecordingWriter()
+        queue = WorkbookWriteQueue(writer, max_pending_cells=100, flush_delay=0.01)
+        future = queue.enqueue("sheet", "B2", "x")
+        self.assertEqual(writer.flushes, [])
+        await asyncio.wait_for(future, timeout=1)
+        self.assertEqual(writer.flushes, [[("sheet", "B2", [["x"]])]])
+
+    async def test_later_update_of_a_cell_wins(self):
+        writer = RecordingWriter()
+        queue = WorkbookWriteQueue(writer, max_pending_cells=100, flush_delay=60)
+        futures = [queue.enqueue("sheet", "$c$4", 1), queue.enqueue("sheet", "C4", 2)]
+        await queue.acommit()
+        await asyncio.gather(*futures)
+        self.assertEqual(writer.flushes, [[("sheet", "C4", [[2]])]])
+
+    async def test_commit_waits_for_running_flush(self):
+        writer = RecordingWriter(delay=0.05)
+        queue = WorkbookWriteQueue(writer, max_pending_cells=100, flush_delay=60)
+        queue.enqueue("sheet", "A1", 1)
+        first_commit = asyncio.ensure_future(queue.acommit())
+        await asyncio.sleep(0)
+        queue.enqueue("sheet", "A2", 2)
+        await queue.acommit()
+        self.assertTrue(first_commit.done())
+        self.assertEqual(
+            writer.flushes, [[("sheet", "A1", [[1]])], [("sheet", "A2", [[2]])]]
+        )
+
+    async def test_failed_range_fails_its_cells_only(self):
+        writer = RecordingWriter(failing_addresses={"D1"})
+        queue = WorkbookWriteQueue(writer, max_pending_cells=100, flush_delay=60)
+        written = queue.enqueue("sheet", "A1", 1)
+        failed = queue.enqueue("sheet", "D1", 2)
+        await queue.acommit()
+        self.assertTrue(await written)
+        with self.assertRaises(Exception):
+            await failed
+
+
+class TestToolkitWriteQueues(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.toolkit = MSSiteWorkbookToolKit(
+            ClientSecretCredential("tenant", "client", "secret")
+        )
+        self.requests = []
+
+        async def get_file_ids(site_display_name, file_path):
+            return "drive", "file"
+
+        async def get_worksheet_id(drive_id, file_id, worksheet_name):
+            return worksheet_name
+
+        async def request_with_retry(session, method, url, headers, payload=None):
+            self.requests.append(
+                (url.rsplit("/", 1)[-1], headers.get("workbook-session-id"))
+            )
+            await asyncio.sleep(0.01)
+            if method == "GET":
+                return 200, '{"calculationMode": "Automatic"}'
+            return 200, "{}"
+
+        async def create_workbook_session(session, drive_id, file_id, headers):
+            return {**headers, "workbook-session-id": "session"}
+
+        async def close_workbook_session(session, drive_id, file_id, headers):
+            self.requests.append(("close", headers.get("workbook-session-id")))
+
+        self.toolkit._aget_file_ids = get_file_ids
+        self.toolkit._aget_worksheet_id = get_worksheet_id
+        self.toolkit._arequest_with_retry = request_with_retry
+        self.toolkit._acreate_workbook_session = create_workbook_session
+        self.toolkit._aclose_workbook_session = close_workbook_session
+        self.toolkit._get_request_headers = lambda: {}
+
+    async def test_concurrent_contexts_flush_in_their_own_session(self):
+        bulk_write_done = asyncio.Event()
+
+        async def plain_writer():
+            writes = await self.toolkit.aenqueue_cells_values(
+                "Site", "/Book.xlsx", "sheet", [{"cell_address": "B1", "cell_value": 2}]
+            )
+            # The bulk writer commits while B1 is still pending
+            await bulk_write_done.wait()
+            await self.toolkit.acommit_workbook_writes("Site", "/Book.xlsx")
+            await writes
+
+        async def bulk_writer():
+            await asyncio.sleep(0)
+            _bulk_write_session_ids.set({("drive", "file"): "session"})
+            await self.toolkit.aupdate_cells_values(
+                "Site", "/Book.xlsx", "sheet", [{"cell_address": "A1", "cell_value": 1}]
+            )
+            bulk_write_done.set()
+
+        await asyncio.gather(plain_writer(), bulk_writer())
+        self.assertCountEqual(
+            self.requests,
+            [("range(address='A1')", "session"), ("range(address='B1')", None)],
+        )
+
+    async def test_bulk_write_commits_only_its_session_before_closing(self):
+        outside_writes = await self.toolkit.aenqueue_cells_values(
+            "Site", "/Book.xlsx", "sheet", [{"cell_address": "B1", "cell_value": 2}]
+        )
+        async with self.toolkit.abulk_write("Site", "/Book.xlsx"):
+            inside_writes = await self.toolkit.aenqueue_cells_values(
+                "Site", "/Book.xlsx", "sheet", [{"cell_address": "A1", "cell_value": 1}]
+            )
+        await inside_writes
+        self.assertEqual(
+            self.requests,
+            [
+                ("application", "session"),
+                ("application", "session"),
+                ("range(address='A1')", "session"),
+                ("calculate", "session"),
+                ("application", "session"),
+                ("close", "session"),
+            ],
+        )
+        self.assertFalse(outside_writes.done())
+        await self.toolkit.acommit_workbook_writes("Site", "/Book.xlsx")
+        await outside_writes
+        self.assertEqual(self.requests[-1], ("range(address='B1')", None))
+
+
+if __name__ == "__main__":
+    unittest.main()